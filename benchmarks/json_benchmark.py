@@ -0,0 +1,121 @@
+"""Compares decoding history data using json.loads with _parse_float (Decimal per float)
+with fusion_solar_py.json_decoder.loads and verifies that both return identical results.
+
+Usage: python benchmarks/json_benchmark.py [number of days]
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fusion_solar_py import json_decoder
+from fusion_solar_py.json_decoder import _parse_float, loads
+
+
+def _create_value(rand: random.Random, max_decimals: int):
+    """Creates a counterValue similar to the ones returned by FusionSolar"""
+    choice = rand.random()
+
+    if choice < 0.05:
+        return "-"
+    if choice < 0.1:
+        return rand.randint(0, 10000)
+    if max_decimals > 8 and choice < 0.11:
+        return 1.7976931348623157e308
+    if max_decimals > 8 and choice < 0.15:
+        # ties at the 9th decimal place
+        return float(f"{rand.uniform(0, 10):.8f}5")
+
+    return round(rand.uniform(-50, 5000), rand.randint(1, max_decimals))
+
+
+def _create_day(rand: random.Random, day: int, signal_ids: list, max_decimals: int) -> bytes:
+    """Creates a device-history-data response with 5 minute measurements"""
+    day_start = 1704067200 + day * 86400
+
+    return json.dumps({"success": True, "data": {
+        signal_id: {"pmDataList": [
+            {"counterId": int(signal_id), "counterValue": _create_value(rand, max_decimals), "startTime": day_start + index * 300}
+            for index in range(288)
+        ], "name": "Active power", "unit": "kW"}
+        for signal_id in signal_ids
+    }}).encode()
+
+
+def _same(expected, actual) -> bool:
+    """Compares two decoded documents (NaN is equal to NaN, floats must have the same type)"""
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and expected.keys() == actual.keys() and all(
+            _same(expected[key], actual[key]) for key in expected
+        )
+    if isinstance(expected, list):
+        return isinstance(actual, list) and len(expected) == len(actual) and all(
+            _same(value, other) for value, other in zip(expected, actual)
+        )
+    if isinstance(expected, float) and math.isnan(expected):
+        return isinstance(actual, float) and math.isnan(actual)
+
+    return type(expected) is type(actual) and expected == actual
+
+
+def _benchmark(name: str, decode, documents: list) -> tuple:
+    start = time.perf_counter()
+    results = [decode(document) for document in documents]
+    duration = time.perf_counter() - start
+
+    print(f"{name:<40} {duration * 1000 / len(documents):8.3f} ms / day")
+
+    return results, duration
+
+
+def _compare(n_days: int, max_decimals: int) -> tuple:
+    rand = random.Random(42)
+    documents = [_create_day(rand, day, ["30014", "30016", "30017"], max_decimals) for day in range(n_days)]
+
+    print(f"\n{n_days} days, 3 signals, 288 measurements per signal and day, up to {max_decimals} decimal places")
+
+    expected, baseline = _benchmark("json.loads(parse_float=_parse_float)", lambda d: json.loads(d, parse_float=_parse_float), documents)
+    actual, duration = _benchmark("json_decoder.loads", loads, documents)
+
+    identical = all(_same(e, a) for e, a in zip(expected, actual))
+    print(f"identical results: {identical}, speedup: {baseline / duration:.1f}x")
+
+    return expected, identical
+
+
+def main():
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+
+    # the sentinel warnings would dominate the runtime
+    logging.disable(logging.WARNING)
+
+    print(f"orjson: {json_decoder.orjson is not None}, numpy: {json_decoder.np is not None}")
+
+    # typical responses, no float needs to be rounded
+    _, identical = _compare(n_days, 3)
+    # every response contains floats that need to be rounded and MAX_JS_NUMBER
+    expected, identical_rounded = _compare(n_days, 12)
+    identical = identical and identical_rounded
+
+    if json_decoder.np is not None:
+        # np.round is only used to find the floats that need rounding. It may differ from round()
+        # (f.e. at ties), which does not change the results.
+        np = json_decoder.np
+        values = [value for document in expected for signal in document["data"].values()
+                  for point in signal["pmDataList"] for value in [point["counterValue"]] if isinstance(value, float)]
+        array = np.asarray(values)
+        differences = int(np.sum(np.round(array, 8) != np.asarray([round(value, 8) for value in values])))
+        print(f"np.round differs from round() for {differences} of {len(values)} floats")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compares decoding device-realtime-data responses by parsing and walking every response
+(as done by the consumers of get_real_time_data) with the schema based RealtimeDecoder and
+verifies that both return identical values. The decoder is measured with the content of the
+responses (as used by get_real_time_values) and with parsed responses. Reports the time and
+the memory per decoded response.
+
+Usage: python benchmarks/realtime_benchmark.py [number of responses]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fusion_solar_py.realtime import RealtimeDecoder
+
+
+def _create_payload(rand: random.Random, n_groups: int = 4, n_signals: int = 40) -> dict:
+    """Creates a response similar to the ones of an inverter"""
+    groups = []
+
+    for group in range(n_groups):
+        signals = []
+
+        for index in range(n_signals):
+            signal_id = 10000 + group * 100 + index
+            kind = index % 10
+
+            if kind == 0:
+                signals.append({"id": signal_id, "name": "SN", "unit": "", "value": f"HV{rand.randint(0, 10 ** 8)}", "realValue": None})
+                signals[-1]["realValue"] = signals[-1]["value"]
+            elif kind == 1:
+                code = str(rand.randint(0, 4))
+                signals.append({"id": signal_id, "name": "Status", "unit": "", "value": f"Status {code}", "realValue": code})
+            elif kind == 2 and rand.random() < 0.5:
+                signals.append({"id": signal_id, "name": "Voltage", "unit": "V", "value": "-", "realValue": "-"})
+            else:
+                value = f"{rand.uniform(-100, 1000):.3f}"
+                signals.append({"id": signal_id, "name": "Power", "unit": "kW", "value": value, "realValue": value})
+
+        groups.append({"name": f"Group {group}", "signals": signals})
+
+    return {"success": True, "data": groups}
+
+
+def _decode_walk(payload: dict) -> dict:
+    """Decodes a parsed response without a schema"""
+    values = {}
+
+    for group in payload["data"]:
+        for signal in group["signals"]:
+            value = signal["realValue"]
+
+            if value in ("-", "--", "", "N/A"):
+                values[signal["id"]] = None
+            else:
+                try:
+                    values[signal["id"]] = float(value)
+                except ValueError:
+                    values[signal["id"]] = value
+
+    return values
+
+
+def _benchmark(name: str, decode, payloads: list, repeat: int = 5):
+    """Returns the results and the fastest of multiple runs"""
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [decode(payload) for payload in payloads]
+        durations.append(time.perf_counter() - start)
+
+    duration = min(durations)
+    print(f"{name:<40} {duration * 1e6 / len(payloads):8.2f} us / response")
+
+    return results, duration
+
+
+def main():
+    n_payloads = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rand = random.Random(42)
+    payloads = [_create_payload(rand) for _ in range(n_payloads)]
+    contents = [json.dumps(payload).encode() for payload in payloads]
+
+    print(f"{n_payloads} responses, {sum(len(g['signals']) for g in payloads[0]['data'])} signals per response")
+
+    decoder = RealtimeDecoder()
+    expected, baseline = _benchmark("json.loads + walk", lambda content: _decode_walk(json.loads(content)), contents)
+    results, duration = _benchmark("decode(content, device_type)", lambda content: decoder.decode(content, "Inverter"), contents)
+    _, array_duration = _benchmark("decode_array(content, device_type)",
+                                   lambda content: decoder.decode_array(content, "Inverter"), contents)
+    _, untyped_duration = _benchmark("decode(content)", decoder.decode, contents)
+
+    print()
+    _, parsed_baseline = _benchmark("walk (parsed)", _decode_walk, payloads)
+    parsed_results, parsed_duration = _benchmark("decode(parsed, device_type)",
+                                                 lambda payload: decoder.decode(payload, "Inverter"), payloads)
+
+    identical = all(
+        values.get(signal_id, KeyError) == value
+        for result_list in (results, parsed_results)
+        for values, walked in zip(result_list, expected) for signal_id, value in walked.items()
+    )
+
+    print()
+    print(f"identical results: {identical}")
+    print(f"content: decode {baseline / duration:.2f}x, decode_array {baseline / array_duration:.2f}x, "
+          f"without device type {baseline / untyped_duration:.2f}x")
+    print(f"parsed responses: decode {parsed_baseline / parsed_duration:.2f}x")
+    print(f"memory per response: dict {sys.getsizeof(expected[0])} bytes, "
+          f"array {sys.getsizeof(results[0].values)} bytes + text dict {sys.getsizeof(results[0].text)} bytes")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
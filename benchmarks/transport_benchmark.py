@@ -0,0 +1,117 @@
+"""Compares the request latency of a reused connection pool with creating a new
+requests.Session for every login against a local HTTPS server.
+
+Usage: python benchmarks/transport_benchmark.py [number of requests]
+"""
+
+import datetime
+import ipaddress
+import os
+import ssl
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fusion_solar_py.transport import Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"code": 0, "payload": "1234"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _create_certificate(directory: str) -> tuple:
+    """Creates a self-signed certificate for 127.0.0.1"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_file = os.path.join(directory, "cert.pem")
+    key_file = os.path.join(directory, "key.pem")
+
+    with open(cert_file, "wb") as writer:
+        writer.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as writer:
+        writer.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()
+        ))
+
+    return cert_file, key_file
+
+
+def _benchmark(name: str, get_session, url: str, cert_file: str, n_requests: int):
+    start = time.perf_counter()
+
+    for _ in range(n_requests):
+        r = get_session().get(url, verify=cert_file)
+        r.raise_for_status()
+
+    duration = time.perf_counter() - start
+    print(f"{name:<40} {duration * 1000 / n_requests:8.3f} ms / request")
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_file, key_file = _create_certificate(directory)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        url = f"https://127.0.0.1:{server.server_address[1]}/rest/dpcloud/auth/v1/keep-alive"
+
+        # previous behaviour: every re-login created a new session, thus a new TLS handshake
+        _benchmark("new session per login", requests.Session, url, cert_file, n_requests)
+
+        # new behaviour: reset the cookies and headers but keep the connection pool
+        transport = Transport()
+
+        def reset_transport():
+            transport.reset()
+            return transport
+
+        _benchmark("Transport.reset per login", reset_transport, url, cert_file, n_requests)
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""asyncio interface to the fusion solar API"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import partial
+from typing import Any, AsyncIterator, Optional, Union
+
+import requests
+
+from .cache import ResponseCache
+from .client import BatteryStatus, FusionSolarClient, PowerStatus
+from .history_cache import HistoryCache
+from .history_planner import HistoryQueryResult
+from .interfaces import SessionStore
+from .keep_alive import keep_alive_task
+from .last_values import LastValueTable
+from .ratelimit import AdaptiveRateLimiter
+from .realtime import RealtimeDecoder, RealtimeValues
+from .snapshot import PlantSnapshot
+from .topology import TopologyIndex
+from .transport import TransportConfig
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# marks the end of an iterator processed in the worker pool
+_END_OF_ITERATOR = object()
+
+
+class AsyncFusionSolarClient:
+    """asyncio version of the FusionSolarClient
+
+    All calls are processed by a FusionSolarClient in a bounded pool of worker
+    threads. Therefore, URL building, response validation and the login / captcha
+    flow are identical to the synchronous client while many requests can be
+    awaited concurrently using `asyncio.gather`.
+    """
+
+    def __init__(self, client: FusionSolarClient, max_concurrency: int = 10) -> None:
+        """Wraps an existing FusionSolarClient. Use `AsyncFusionSolarClient.create`
+           to log in without blocking the event loop.
+        :param client: The (logged in) FusionSolarClient to use
+        :type client: FusionSolarClient
+        :param max_concurrency: Maximum number of requests processed at the same time.
+                                Should not exceed the client's connection pool size (TransportConfig.pool_maxsize).
+        :type max_concurrency: int
+        """
+        self._client = client
+        self._max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="fusion_solar"
+        )
+        self._keep_alive_task = None
+
+    @classmethod
+    async def create(
+        cls, username: str, password: str, huawei_subdomain: str = "region01eu5",
+        session: Optional[requests.Session] = None, captcha_model_path: Optional[str] = None,
+        captcha_device: Optional[Any] = ['CPUExecutionProvider'], liveness_ttl: float = 60,
+        transport_config: Optional[TransportConfig] = None,
+        session_store: Optional[Union[SessionStore, str]] = None, max_concurrent_requests: int = 4,
+        response_cache: Optional[ResponseCache] = None,
+        history_cache: Optional[Union[HistoryCache, str]] = None, topology_ttl: float = 3600,
+        rate_limiter: Optional[Union[AdaptiveRateLimiter, float]] = None, max_concurrency: int = 10
+    ) -> "AsyncFusionSolarClient":
+        """Creates a new AsyncFusionSolarClient. The parameters are identical to
+           the ones of FusionSolarClient. The login is run in a worker thread.
+        :param max_concurrency: Maximum number of requests processed at the same time. If no
+                                transport_config is set, the connection pool is sized accordingly.
+        :type max_concurrency: int
+        :return: The logged in client
+        :rtype: AsyncFusionSolarClient
+        """
+        if transport_config is None:
+            # make sure every worker can keep its connection open
+            transport_config = TransportConfig(pool_maxsize=max_concurrency)
+
+        loop = asyncio.get_running_loop()
+
+        client = await loop.run_in_executor(
+            None,
+            partial(
+                FusionSolarClient, username, password, huawei_subdomain=huawei_subdomain,
+                session=session, captcha_model_path=captcha_model_path,
+                captcha_device=captcha_device, liveness_ttl=liveness_ttl,
+                transport_config=transport_config, session_store=session_store,
+                max_concurrent_requests=max_concurrent_requests, response_cache=response_cache,
+                history_cache=history_cache, topology_ttl=topology_ttl, rate_limiter=rate_limiter
+            )
+        )
+
+        return cls(client, max_concurrency=max_concurrency)
+
+    async def __aenter__(self) -> "AsyncFusionSolarClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Shuts down the worker threads and closes all connections. This does not
+           log out.
+        """
+        await self.stop_keep_alive()
+
+        # wait for the running calls without blocking the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._client.close()
+
+    @property
+    def client(self) -> FusionSolarClient:
+        """The underlying synchronous client"""
+        return self._client
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The response cache (if set)"""
+        return self._client.response_cache
+
+    @property
+    def history_cache(self) -> Optional[HistoryCache]:
+        """The history cache (if set)"""
+        return self._client.history_cache
+
+    @property
+    def history_requests_saved(self) -> int:
+        """Number of history requests saved by merging signals in `query_history`"""
+        return self._client.history_requests_saved
+
+    @property
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        """The rate limiter (if set)"""
+        return self._client.rate_limiter
+
+    @property
+    def realtime_decoder(self) -> RealtimeDecoder:
+        """The decoder used by `get_real_time_values`"""
+        return self._client.realtime_decoder
+
+    @property
+    def liveness_checks_saved(self) -> int:
+        """Number of is-session-alive calls that were skipped"""
+        return self._client.liveness_checks_saved
+
+    def start_keep_alive(self, interval: float = 30):
+        """Starts a task that calls `keep_alive` every `interval` seconds. The call
+           is skipped if another request succeeded within the interval. Must be called
+           from within the event loop.
+
+        :param interval: Number of seconds between two keep-alive calls
+        :type interval: float
+        """
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+
+        self._keep_alive_task = asyncio.get_running_loop().create_task(keep_alive_task(self, interval))
+
+    async def stop_keep_alive(self):
+        """Stops the keep-alive task (if running)"""
+        if self._keep_alive_task is None:
+            return
+
+        self._keep_alive_task.cancel()
+        try:
+            await self._keep_alive_task
+        except asyncio.CancelledError:
+            pass
+        self._keep_alive_task = None
+
+    def seconds_since_alive(self) -> float:
+        """See FusionSolarClient.seconds_since_alive"""
+        return self._client.seconds_since_alive()
+
+    async def _run(self, func, *args, **kwargs):
+        """Runs the passed function of the synchronous client in the worker pool
+        """
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _iterate(self, iterator) -> AsyncIterator:
+        """Processes a (blocking) iterator of the synchronous client in the worker pool
+        """
+        while True:
+            item = await self._run(next, iterator, _END_OF_ITERATOR)
+
+            if item is _END_OF_ITERATOR:
+                return
+
+            yield item
+
+    async def log_out(self):
+        """Log out from the FusionSolarAPI"""
+        await self.stop_keep_alive()
+        return await self._run(self._client.log_out)
+
+    async def is_session_active(self) -> bool:
+        """See FusionSolarClient.is_session_active"""
+        return await self._run(self._client.is_session_active)
+
+    async def keep_alive(self) -> str:
+        """See FusionSolarClient.keep_alive"""
+        return await self._run(self._client.keep_alive)
+
+    async def get_power_status(self) -> PowerStatus:
+        """See FusionSolarClient.get_power_status"""
+        return await self._run(self._client.get_power_status)
+
+    async def get_current_plant_data(self, plant_id: str) -> dict:
+        """See FusionSolarClient.get_current_plant_data"""
+        return await self._run(self._client.get_current_plant_data, plant_id)
+
+    async def get_plant_ids(self) -> list:
+        """See FusionSolarClient.get_plant_ids"""
+        return await self._run(self._client.get_plant_ids)
+
+    async def get_station_list(self, page: int = 1, page_size: int = 10) -> list:
+        """See FusionSolarClient.get_station_list"""
+        return await self._run(self._client.get_station_list, page=page, page_size=page_size)
+
+    async def iter_station_list(self, page_size: int = 100) -> AsyncIterator[dict]:
+        """See FusionSolarClient.iter_station_list"""
+        async for station in self._iterate(self._client.iter_station_list(page_size=page_size)):
+            yield station
+
+    async def get_all_stations(self, page_size: int = 100) -> list:
+        """See FusionSolarClient.get_all_stations"""
+        return await self._run(self._client.get_all_stations, page_size=page_size)
+
+    async def get_device_ids(self, parent_dn: str = None) -> list:
+        """See FusionSolarClient.get_device_ids"""
+        return await self._run(self._client.get_device_ids, parent_dn=parent_dn)
+
+    async def get_historical_data(
+        self, signal_ids: list[str] = ['30014', '30016', '30017'], device_dn: str = None,
+        date: datetime = None
+    ) -> dict:
+        """See FusionSolarClient.get_historical_data. If `date` is not set, the
+           current date is used.
+        """
+        if date is None:
+            date = datetime.now()
+
+        return await self._run(
+            self._client.get_historical_data, signal_ids=signal_ids, device_dn=device_dn, date=date
+        )
+
+    async def iter_history(
+        self, device_dns: Union[str, list], signal_ids: list, start_date: date, end_date: Optional[date] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator:
+        """See FusionSolarClient.iter_history"""
+        iterator = self._client.iter_history(
+            device_dns, signal_ids, start_date, end_date=end_date, batch_size=batch_size
+        )
+
+        async for item in self._iterate(iterator):
+            yield item
+
+    async def get_historical_columns(
+        self, signal_ids: list, device_dn: str, date: datetime = None, output: str = "numpy"
+    ):
+        """See FusionSolarClient.get_historical_columns"""
+        return await self._run(
+            self._client.get_historical_columns, signal_ids, device_dn, date=date, output=output
+        )
+
+    async def query_history(self, wants: list, max_signals_per_request: Optional[int] = None) -> HistoryQueryResult:
+        """See FusionSolarClient.query_history"""
+        return await self._run(self._client.query_history, wants, max_signals_per_request=max_signals_per_request)
+
+    async def get_real_time_data(self, device_dn: str = None) -> dict:
+        """See FusionSolarClient.get_real_time_data"""
+        return await self._run(self._client.get_real_time_data, device_dn=device_dn)
+
+    async def get_real_time_data_bulk(self, device_dns: list) -> dict:
+        """See FusionSolarClient.get_real_time_data_bulk"""
+        return await self._run(self._client.get_real_time_data_bulk, device_dns)
+
+    async def get_real_time_values(self, device_dn: str, device_type: str = None) -> RealtimeValues:
+        """See FusionSolarClient.get_real_time_values"""
+        return await self._run(self._client.get_real_time_values, device_dn, device_type=device_type)
+
+    async def get_real_time_values_bulk(self, device_dns: list, device_type: str = None) -> dict:
+        """See FusionSolarClient.get_real_time_values_bulk"""
+        return await self._run(self._client.get_real_time_values_bulk, device_dns, device_type=device_type)
+
+    async def get_alarm_data(self, device_dn: str = None, page: int = 1, page_size: int = 10) -> dict:
+        """See FusionSolarClient.get_alarm_data"""
+        return await self._run(self._client.get_alarm_data, device_dn=device_dn, page=page, page_size=page_size)
+
+    async def iter_alarm_data(self, device_dn: str = None, page_size: int = 100) -> AsyncIterator[dict]:
+        """See FusionSolarClient.iter_alarm_data"""
+        async for alarm in self._iterate(self._client.iter_alarm_data(device_dn, page_size=page_size)):
+            yield alarm
+
+    async def get_all_alarm_data(self, device_dn: str = None, page_size: int = 100) -> list:
+        """See FusionSolarClient.get_all_alarm_data"""
+        return await self._run(self._client.get_all_alarm_data, device_dn, page_size=page_size)
+
+    async def get_topology(self, refresh: bool = False, include_optimizers: bool = True) -> TopologyIndex:
+        """See FusionSolarClient.get_topology"""
+        return await self._run(self._client.get_topology, refresh=refresh, include_optimizers=include_optimizers)
+
+    async def refresh_topology(self) -> TopologyIndex:
+        """See FusionSolarClient.refresh_topology"""
+        return await self._run(self._client.refresh_topology)
+
+    async def get_battery_ids(self, plant_id) -> list:
+        """See FusionSolarClient.get_battery_ids"""
+        return await self._run(self._client.get_battery_ids, plant_id)
+
+    async def get_battery_basic_stats(self, battery_id: str) -> BatteryStatus:
+        """See FusionSolarClient.get_battery_basic_stats"""
+        return await self._run(self._client.get_battery_basic_stats, battery_id)
+
+    async def get_battery_basic_stats_bulk(self, battery_ids: list) -> dict:
+        """See FusionSolarClient.get_battery_basic_stats_bulk"""
+        return await self._run(self._client.get_battery_basic_stats_bulk, battery_ids)
+
+    async def get_battery_day_stats(
+        self, battery_id: str, signalIds: list[str] = ["30005", "30007"], query_time: int = None
+    ) -> dict:
+        """See FusionSolarClient.get_battery_day_stats"""
+        return await self._run(
+            self._client.get_battery_day_stats, battery_id, signalIds=signalIds, query_time=query_time
+        )
+
+    async def get_inverter_day_stats(
+        self, inverter_id: str, signalIds: list[str] = ["30007"], query_time: int = None
+    ) -> dict:
+        """See FusionSolarClient.get_inverter_day_stats"""
+        return await self._run(
+            self._client.get_inverter_day_stats, inverter_id, signalIds=signalIds, query_time=query_time
+        )
+
+    async def get_battery_module_stats(
+        self, battery_id: str, module_id: str = "1", signal_ids: list = None
+    ) -> dict:
+        """See FusionSolarClient.get_battery_module_stats"""
+        return await self._run(
+            self._client.get_battery_module_stats, battery_id, module_id=module_id, signal_ids=signal_ids
+        )
+
+    async def get_battery_module_values(
+        self, battery_id: str, module_id: str = "1", signal_ids: list = None
+    ) -> dict:
+        """See FusionSolarClient.get_battery_module_values"""
+        return await self._run(
+            self._client.get_battery_module_values, battery_id, module_id=module_id, signal_ids=signal_ids
+        )
+
+    async def get_battery_modules(
+        self, battery_id: str, module_ids: list = None, refresh_static: bool = False
+    ) -> dict:
+        """See FusionSolarClient.get_battery_modules"""
+        return await self._run(
+            self._client.get_battery_modules, battery_id, module_ids=module_ids, refresh_static=refresh_static
+        )
+
+    async def get_battery_status(self, battery_id: str) -> dict:
+        """See FusionSolarClient.get_battery_status"""
+        return await self._run(self._client.get_battery_status, battery_id)
+
+    async def get_battery_status_bulk(self, battery_ids: list) -> dict:
+        """See FusionSolarClient.get_battery_status_bulk"""
+        return await self._run(self._client.get_battery_status_bulk, battery_ids)
+
+    async def active_power_control(self, power_setting) -> None:
+        """See FusionSolarClient.active_power_control"""
+        return await self._run(self._client.active_power_control, power_setting)
+
+    async def get_plant_flow(self, plant_id: str) -> dict:
+        """See FusionSolarClient.get_plant_flow"""
+        return await self._run(self._client.get_plant_flow, plant_id)
+
+    async def get_plant_stats(self, plant_id: str, query_time: int = None) -> dict:
+        """See FusionSolarClient.get_plant_stats"""
+        return await self._run(self._client.get_plant_stats, plant_id, query_time=query_time)
+
+    async def get_plant_stats_columns(
+        self, plant_id: str, query_time: int = None, utc_offset: int = 0, output: str = "numpy"
+    ):
+        """See FusionSolarClient.get_plant_stats_columns"""
+        return await self._run(
+            self._client.get_plant_stats_columns, plant_id, query_time=query_time, utc_offset=utc_offset,
+            output=output
+        )
+
+    async def get_plant_snapshot(self, plant_id: str, include_optimizers: bool = False) -> PlantSnapshot:
+        """See FusionSolarClient.get_plant_snapshot"""
+        return await self._run(
+            self._client.get_plant_snapshot, plant_id, include_optimizers=include_optimizers
+        )
+
+    def get_last_plant_data(self, plant_data: dict) -> dict:
+        """See FusionSolarClient.get_last_plant_data. This function does not access
+           the API and is therefore not a coroutine.
+        """
+        return self._client.get_last_plant_data(plant_data)
+
+    def get_last_plant_data_bulk(self, plant_stats: dict, keys: Optional[list] = None) -> LastValueTable:
+        """See FusionSolarClient.get_last_plant_data_bulk. This function does not access
+           the API and is therefore not a coroutine.
+        """
+        return self._client.get_last_plant_data_bulk(plant_stats, keys=keys)
+
+    async def get_optimizer_stats(self, inverter_id: str) -> dict:
+        """See FusionSolarClient.get_optimizer_stats"""
+        return await self._run(self._client.get_optimizer_stats, inverter_id)
+
+    async def get_optimizer_stats_bulk(self, plant_id: str, metrics: list = None):
+        """See FusionSolarClient.get_optimizer_stats_bulk"""
+        return await self._run(self._client.get_optimizer_stats_bulk, plant_id, metrics=metrics)
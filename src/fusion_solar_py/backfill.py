@@ -0,0 +1,232 @@
+"""Resumable retrieval of the history data over date ranges"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from typing import Callable, Optional
+
+from .history import get_days, get_query_date
+from .ratelimit import AdaptiveRateLimiter
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class BackfillStats:
+    """Class representing the result of a backfill run"""
+
+    def __init__(self, completed: int, skipped: int, failed: list, duration: float):
+        """Create a new BackfillStats object
+        :param completed: Number of days retrieved in this run
+        :type completed: int
+        :param skipped: Number of days skipped since they were completed by a previous run
+        :type skipped: int
+        :param failed: List of (device_dn, day) tuples that failed after all retries
+        :type failed: list
+        :param duration: Duration of the run in seconds
+        :type duration: float
+        """
+        self.completed = completed
+        self.skipped = skipped
+        self.failed = failed
+        self.duration = duration
+
+    @property
+    def days_per_second(self) -> float:
+        """Number of days (per device) retrieved per second"""
+        if self.duration <= 0:
+            return 0.0
+
+        return self.completed / self.duration
+
+    def __repr__(self):
+        return (f"BackfillStats(completed={self.completed}, "
+                f"skipped={self.skipped}, "
+                f"failed={len(self.failed)}, "
+                f"duration={self.duration:.1f}, "
+                f"days_per_second={self.days_per_second:.2f})")
+
+
+class HistoryBackfill:
+    """Retrieves the history data of a set of devices and signals for every day
+    in a date range.
+
+    Every (device, day) combination is processed as a separate job. Jobs are run in
+    parallel, limited by the client's `max_concurrent_requests` and the passed request
+    rate. Only `max_concurrent_requests` jobs are queued at once, so the memory usage
+    does not depend on the length of the date range. If a checkpoint file is set,
+    completed jobs are saved (at most every `checkpoint_interval` seconds and at the
+    end of a run) and skipped when the backfill is run again with the same signals.
+    """
+
+    def __init__(
+        self, client, device_dns: list, signal_ids: list, start_date: date, end_date: date,
+        checkpoint_path: Optional[str] = None, requests_per_second: float = 2.0, max_retries: int = 3,
+        checkpoint_interval: float = 5
+    ):
+        """Create a new HistoryBackfill
+        :param client: The client to use
+        :type client: FusionSolarClient
+        :param device_dns: The devices' ids
+        :type device_dns: list
+        :param signal_ids: The signals to retrieve (see get_historical_data)
+        :type signal_ids: list
+        :param start_date: The first day to retrieve
+        :type start_date: date
+        :param end_date: The last day to retrieve (inclusive)
+        :type end_date: date
+        :param checkpoint_path: Optional path to a JSON file storing the completed jobs. A
+                                checkpoint of different signals raises a ValueError.
+        :type checkpoint_path: str
+        :param requests_per_second: Maximum number of requests per second. The rate is reduced while
+                                    requests fail (see AdaptiveRateLimiter). 0 disables the limit.
+        :type requests_per_second: float
+        :param max_retries: Number of retries of a failed job
+        :type max_retries: int
+        :param checkpoint_interval: Minimum number of seconds between two saves of the checkpoint file
+        :type checkpoint_interval: float
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+
+        self._client = client
+        self.device_dns = list(device_dns)
+        self.signal_ids = list(signal_ids)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.checkpoint_path = checkpoint_path
+        self.max_retries = max_retries
+        self.checkpoint_interval = checkpoint_interval
+        self._limiter = AdaptiveRateLimiter(rate=requests_per_second, burst=1) if requests_per_second else None
+        self._completed_jobs = self._load_checkpoint()
+
+    def get_jobs(self) -> list:
+        """Returns all (device_dn, day) jobs of the backfill"""
+        days = get_days(self.start_date, self.end_date)
+
+        return [(device_dn, day) for device_dn in self.device_dns for day in days]
+
+    def _load_checkpoint(self) -> set:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return set()
+
+        with open(self.checkpoint_path, "r") as reader:
+            checkpoint = json.load(reader)
+
+        # days completed for other signals do not contain the requested ones
+        if sorted(map(str, checkpoint.get("signal_ids", []))) != sorted(map(str, self.signal_ids)):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was created for the signals {checkpoint.get('signal_ids')}, "
+                f"not {self.signal_ids}"
+            )
+
+        return {(device_dn, day) for device_dn, day in checkpoint["completed"]}
+
+    def _save_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".backfill_")
+
+        with os.fdopen(fd, "w") as writer:
+            json.dump({"signal_ids": self.signal_ids, "completed": sorted(self._completed_jobs)}, writer)
+
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _process_job(self, device_dn: str, day: date) -> dict:
+        """Retrieves the data of one day, retrying failed requests with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            if self._limiter is not None:
+                self._limiter.acquire()
+
+            try:
+                with self._client._request_semaphore:
+                    data = self._client.get_historical_data(
+                        signal_ids=self.signal_ids, device_dn=device_dn, date=get_query_date(day)
+                    )
+            except Exception as e:
+                if self._limiter is not None:
+                    self._limiter.backoff()
+
+                if attempt >= self.max_retries:
+                    raise
+
+                _LOGGER.debug(f"Failed to retrieve {device_dn} on {day} (attempt {attempt + 1}): {e}")
+                time.sleep(2 ** attempt)
+                continue
+
+            if self._limiter is not None:
+                self._limiter.recover()
+
+            return data
+
+    def run(self, callback: Callable[[str, date, dict], None]) -> BackfillStats:
+        """Runs all jobs that were not completed before
+        :param callback: Function called with the device id, the day and the data returned
+                         by get_historical_data for every completed job. It is always called
+                         from the thread running the backfill.
+        :type callback: function
+        :return: Statistics of the run
+        :rtype: BackfillStats
+        """
+        start = time.perf_counter()
+        all_jobs = self.get_jobs()
+        jobs = [job for job in all_jobs if (job[0], job[1].isoformat()) not in self._completed_jobs]
+        skipped = len(all_jobs) - len(jobs)
+        completed = 0
+        failed = []
+        last_save = time.monotonic()
+
+        _LOGGER.debug(f"Backfilling {len(jobs)} days ({skipped} already completed)")
+
+        executor = ThreadPoolExecutor(max_workers=self._client._max_concurrent_requests)
+
+        try:
+            # only keep a limited number of jobs (and their responses) in memory
+            pending = {}
+            job_iter = iter(jobs)
+
+            while True:
+                for job in job_iter:
+                    pending[executor.submit(self._process_job, *job)] = job
+                    if len(pending) >= self._client._max_concurrent_requests:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    device_dn, day = pending.pop(future)
+
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        _LOGGER.warning(f"Failed to retrieve {device_dn} on {day}: {e}")
+                        failed.append((device_dn, day))
+                        continue
+
+                    callback(device_dn, day, data)
+
+                    completed += 1
+                    self._completed_jobs.add((device_dn, day.isoformat()))
+
+                if time.monotonic() - last_save > self.checkpoint_interval:
+                    self._save_checkpoint()
+                    last_save = time.monotonic()
+        finally:
+            # keep the progress if the run is interrupted
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._save_checkpoint()
+
+        stats = BackfillStats(completed, skipped, failed, time.perf_counter() - start)
+        _LOGGER.debug(str(stats))
+
+        return stats
@@ -0,0 +1,176 @@
+"""Structured stats of the battery modules (see get_battery_modules)"""
+
+import logging
+from typing import Optional
+
+from .constants import MODULE_SIGNALS
+from .signals import MODULE_SIGNAL_REGISTRY
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# number of battery packs per module
+PACKS_PER_MODULE = 3
+
+# attributes of BatteryModule and the name of their signal in signals.md
+MODULE_FIELDS = {
+    "module_no": "No.",
+    "working_status": "[DC/DC] Working status",
+    "sn": "[DC/DC] SN",
+    "software_version": "[DC/DC] Software version",
+    "state_of_charge": "[DC/DC] SOC",
+    "charge_discharge_power": "[DC/DC] Charge and discharge power",
+    "internal_temperature": "[DC/DC] Internal temperature",
+    "daily_charge_energy": "[DC/DC] Daily charge energy",
+    "daily_discharge_energy": "[DC/DC] Daily discharge energy",
+    "total_charge_energy": "Total charge energy",
+    "total_discharge_energy": "Total discharge energy",
+    "bus_voltage": "[DC/DC] Bus voltage",
+    "bus_current": "[DC/DC] Bus current",
+    "fe_connection": "FE connection",
+}
+
+# attributes of BatteryPack and the name of their signal without the "[Battery pack n] " prefix
+PACK_FIELDS = {
+    "pack_no": "No.",
+    "sn": "SN",
+    "firmware_version": "Firmware version",
+    "operating_status": "Operating status",
+    "voltage": "Voltage",
+    "charge_discharge_power": "Charge/Discharge power",
+    "max_temperature": "Maximum temperature",
+    "min_temperature": "Minimum temperature",
+    "capacity": "Capacity",
+    "current": "Current",
+    "state_of_charge": "SOC",
+    "fuse_status": "High voltage fuse status",
+}
+
+# attributes that do not change while polling (serial numbers and versions)
+STATIC_MODULE_FIELDS = ("module_no", "sn", "software_version")
+STATIC_PACK_FIELDS = ("pack_no", "sn", "firmware_version")
+
+
+def _get_pack_signal_name(pack: int, name: str) -> str:
+    return f"[Battery pack {pack}] {name}"
+
+
+def _create_field_ids(module_id: str) -> tuple:
+    """Returns the signal ids of the module's attributes and of its packs' attributes"""
+    module_ids = {field: MODULE_SIGNAL_REGISTRY.find(name, module_id) for field, name in MODULE_FIELDS.items()}
+    pack_ids = [
+        {field: MODULE_SIGNAL_REGISTRY.find(_get_pack_signal_name(pack, name), module_id) for field, name in PACK_FIELDS.items()}
+        for pack in range(1, PACKS_PER_MODULE + 1)
+    ]
+
+    return module_ids, pack_ids
+
+
+# signal ids of the attributes per module, created once
+_FIELD_IDS = {module_id: _create_field_ids(module_id) for module_id in MODULE_SIGNALS}
+
+
+def get_static_signal_ids(module_id: str) -> list:
+    """Returns the ids of the module's signals that do not change (serial numbers and versions)"""
+    module_ids, pack_ids = _FIELD_IDS[module_id]
+
+    return [module_ids[field] for field in STATIC_MODULE_FIELDS] + [
+        ids[field] for ids in pack_ids for field in STATIC_PACK_FIELDS
+    ]
+
+
+def get_dynamic_signal_ids(module_id: str) -> list:
+    """Returns the ids of the module's signals that change while polling"""
+    static_ids = set(get_static_signal_ids(module_id))
+
+    return [signal_id for signal_id in MODULE_SIGNALS[module_id] if signal_id not in static_ids]
+
+
+class BatteryPack:
+    """Class representing a battery pack of a battery module"""
+
+    __slots__ = ("number",) + tuple(PACK_FIELDS)
+
+    def __init__(self, number: int, **values):
+        """Create a new BatteryPack object
+        :param number: The pack's position in the module (1 - 3)
+        :type number: int
+        :param values: The attributes (see PACK_FIELDS). Missing attributes are set to None.
+                       Temperatures are in ℃, voltage in V, power in kW, capacity in Ah, current in A
+                       and the state of charge in %.
+        """
+        self.number = number
+
+        for field in PACK_FIELDS:
+            setattr(self, field, values.get(field))
+
+    def __repr__(self):
+        return (f"BatteryPack(number={self.number}, "
+                f"sn={self.sn}, "
+                f"operating_status={self.operating_status}, "
+                f"state_of_charge={self.state_of_charge}, "
+                f"voltage={self.voltage}, "
+                f"max_temperature={self.max_temperature}, "
+                f"min_temperature={self.min_temperature})")
+
+
+class BatteryModule:
+    """Class representing a battery module (DC/DC converter) and its battery packs"""
+
+    __slots__ = ("module_id", "packs") + tuple(MODULE_FIELDS)
+
+    def __init__(self, module_id: str, packs: list, **values):
+        """Create a new BatteryModule object
+        :param module_id: The module's id ("1" - "4")
+        :type module_id: str
+        :param packs: The module's battery packs
+        :type packs: list
+        :param values: The attributes (see MODULE_FIELDS). Missing attributes are set to None.
+                       Energies are in kWh, power in kW, the temperature in ℃, voltage in V, current
+                       in A and the state of charge in %.
+        """
+        self.module_id = module_id
+        self.packs = packs
+
+        for field in MODULE_FIELDS:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_values(cls, module_id: str, values: dict) -> "BatteryModule":
+        """Creates the module based on the decoded signals
+        :param module_id: The module's id ("1" - "4")
+        :type module_id: str
+        :param values: Dict with the signal's id as key and the value as value (see
+                       get_battery_module_values)
+        :type values: dict
+        :return: The module. Packs without any value are not included.
+        :rtype: BatteryModule
+        """
+        module_ids, pack_ids = _FIELD_IDS[module_id]
+        packs = []
+
+        for number, ids in enumerate(pack_ids, start=1):
+            pack_values = {field: values.get(signal_id) for field, signal_id in ids.items()}
+
+            if any(value is not None for value in pack_values.values()):
+                packs.append(BatteryPack(number, **pack_values))
+
+        return cls(module_id, packs, **{field: values.get(signal_id) for field, signal_id in module_ids.items()})
+
+    def get_pack(self, number: int) -> Optional[BatteryPack]:
+        """Returns the pack at the position (1 - 3) or None if it does not exist"""
+        for pack in self.packs:
+            if pack.number == number:
+                return pack
+
+        return None
+
+    def __repr__(self):
+        return (f"BatteryModule(module_id={self.module_id}, "
+                f"sn={self.sn}, "
+                f"working_status={self.working_status}, "
+                f"state_of_charge={self.state_of_charge}, "
+                f"charge_discharge_power={self.charge_discharge_power}, "
+                f"internal_temperature={self.internal_temperature}, "
+                f"packs={len(self.packs)})")
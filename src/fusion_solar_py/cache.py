@@ -0,0 +1,157 @@
+"""In-memory cache for API responses"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# parameter only used to prevent caching by the browser
+CACHE_BUSTING_PARAM = "_"
+
+# The real-time KPIs are only updated around every 5 minutes by FusionSolar.
+# endpoint path -> (TTL in seconds, additional parameters ignored in the cache key)
+DEFAULT_CACHE_RULES = {
+    "/rest/pvms/web/station/v1/station/total-real-kpi": (120, ("queryTime", )),
+    "/rest/pvms/web/station/v1/overview/station-real-kpi": (120, ("clientTime", )),
+    "/rest/pvms/web/station/v1/overview/energy-flow": (120, ()),
+}
+
+
+def _is_successful(response: requests.Response) -> bool:
+    """Checks whether the response contains a successful API result"""
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+
+    if not isinstance(payload, dict):
+        return False
+
+    return payload.get("success") is True or payload.get("code") == 0
+
+
+class ResponseCache:
+    """Size-bounded LRU cache for GET responses with a TTL per endpoint
+
+    Only endpoints with a rule are cached. The cache-busting parameter `_` (and
+    additional parameters defined by the rule) are ignored when comparing requests.
+    """
+
+    def __init__(self, rules: Optional[dict] = None, max_size: int = 256):
+        """Create a new ResponseCache
+        :param rules: Dict with the endpoint's path as key and a (TTL in seconds, ignored parameters)
+                      tuple as value. If not set, DEFAULT_CACHE_RULES are used.
+        :type rules: dict
+        :param max_size: Maximum number of cached responses
+        :type max_size: int
+        """
+        self._rules = dict(DEFAULT_CACHE_RULES if rules is None else rules)
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def set_rule(self, endpoint: str, ttl: float, ignored_params: tuple = ()):
+        """Caches the responses of an endpoint
+        :param endpoint: The endpoint's path (f.e. "/rest/pvms/web/station/v1/overview/energy-flow")
+        :type endpoint: str
+        :param ttl: Number of seconds a response is used
+        :type ttl: float
+        :param ignored_params: Parameters that are ignored when comparing requests
+        :type ignored_params: tuple
+        """
+        self._rules[endpoint] = (ttl, tuple(ignored_params))
+
+    def remove_rule(self, endpoint: str):
+        """Stops caching the responses of an endpoint"""
+        self._rules.pop(endpoint, None)
+        self.invalidate(endpoint)
+
+    def get_key(self, url: str, params=None) -> Optional[tuple]:
+        """Creates the cache key for a request
+        :param url: The request's URL
+        :type url: str
+        :param params: The request's parameters as dict or list of tuples
+        :return: The key or None if the endpoint is not cached
+        :rtype: tuple
+        """
+        rule = self._rules.get(urlparse(url).path)
+
+        if rule is None:
+            return None
+
+        if params is None:
+            params = ()
+        elif isinstance(params, dict):
+            params = params.items()
+
+        ignored_params = (CACHE_BUSTING_PARAM, ) + rule[1]
+        key_params = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params if name not in ignored_params
+        ))
+
+        return (url, key_params)
+
+    def get(self, key: tuple) -> Optional[requests.Response]:
+        """Returns the cached response or None if it is not available or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[1]
+
+    def put(self, key: tuple, response: requests.Response):
+        """Caches the response if it contains a successful JSON result"""
+        # invalid responses (f.e. the HTML login page) must never be cached
+        if response.status_code != 200 or "json" not in response.headers.get("Content-Type", ""):
+            return
+
+        # errors (f.e. {"success": false} or a non-zero code) are requested again
+        if not _is_successful(response):
+            return
+
+        ttl = self._rules[urlparse(key[0]).path][0]
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Removes cached responses
+        :param endpoint: If set, only the responses of this endpoint (path) are removed
+        :type endpoint: str
+        """
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if urlparse(key[0]).path == endpoint]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """Returns the number of hits, misses and cached responses"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,42 +1,49 @@
 """Client library to the fusion solar API"""
 
 import logging
+import math
+import threading
 import time
-from datetime import datetime
-from decimal import Decimal
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import partial, wraps
 import json
-from typing import Any, Optional
+from typing import Any, Iterator, Optional, Union
 
 import requests
 
 from .exceptions import AuthenticationException, CaptchaRequiredException, FusionSolarException
 from .constants import MODULE_SIGNALS
+from .cache import ResponseCache
 from .encryption import encrypt_password, get_secure_random
+from .history import iter_history
+from .history_cache import HistoryCache
+from .history_planner import HistoryQueryPlan, HistoryQueryResult
+from .interfaces import SessionStore
+# DEC_PRECISION and MAX_JS_NUMBER were defined here before, re-exported for backwards compatibility
+from .json_decoder import DEC_PRECISION, MAX_JS_NUMBER  # noqa: F401
+from .json_decoder import _parse_float, decode, round_floats
+from .keep_alive import KeepAliveThread
+from .last_values import IGNORED_STATS_KEYS, LastValueTable, extract_last_values, find_last_index
+from .snapshot import PlantSnapshot, create_plant_snapshot
+from .topology import TopologyIndex, crawl_topology
+from .battery_modules import BatteryModule, get_dynamic_signal_ids, get_static_signal_ids
+from .ratelimit import AdaptiveRateLimiter, get_rate_limiter, get_request_semaphore
+from .realtime import RealtimeDecoder, RealtimeValues
+from .signals import MODULE_SIGNAL_REGISTRY
+from .session_store import FileSessionStore, export_cookies, import_cookies
+from .transport import Transport, TransportConfig
 
 
 # global logger object
 _LOGGER = logging.getLogger(__name__)
 
-DEC_PRECISION = Decimal('1.00000000')
-MAX_JS_NUMBER = Decimal('1.7976931348623157E308')
-def _parse_float(value: str) -> float:
-    try:
-        _d = Decimal(value)
-        if _d == MAX_JS_NUMBER:
-            _LOGGER.warning("parsing MAX JS NUMBER returning 0.0: '%s'", value)
-            return 0.0
-
-        return float(_d.quantize(DEC_PRECISION))
-    except Exception as exc:
-        _LOGGER.error("cannot parse float from json: '%s'", value, exc_info=True)
-        return 0.0
-
-
 
 class PowerStatus:
     """Class representing the basic power status"""
 
+    __slots__ = ("current_power_kw", "energy_today_kwh", "energy_kwh")
+
     def __init__(
         self,
         current_power_kw: float,
@@ -93,9 +100,30 @@ class PowerStatus:
                 f"energy_kwh={self.energy_kwh})")
 
 
+# signal ids of the battery status (see get_battery_status) -> BatteryStatus attribute
+BATTERY_STATUS_SIGNALS = {
+    10003: "operating_status",
+    10013: "rated_capacity",
+    10015: "backup_time",
+    10001: "total_charged_today_kwh",
+    10002: "total_discharged_today_kwh",
+    10004: "current_charge_discharge_kw",
+    10005: "bus_voltage",
+    10006: "state_of_charge",
+}
+
+# attributes that are returned as text
+_BATTERY_STATUS_TEXT_FIELDS = ("operating_status", "backup_time")
+
+
 class BatteryStatus:
     """Class representing the basic battery status"""
 
+    __slots__ = (
+        "state_of_charge", "rated_capacity", "operating_status", "backup_time", "bus_voltage",
+        "total_charged_today_kwh", "total_discharged_today_kwh", "current_charge_discharge_kw",
+    )
+
     def __init__(
             self,
             state_of_charge: float,
@@ -144,31 +172,125 @@ class BatteryStatus:
             f"bus_voltage={self.bus_voltage}, "
             f"total_charged_today_kwh={self.total_charged_today_kwh}, "
             f"total_discharged_today_kwh={self.total_discharged_today_kwh}, "
-            f"current_charge_discharge_kw={self.current_charge_discharge_kw}, "
+            f"current_charge_discharge_kw={self.current_charge_discharge_kw})"
         )
 
+    @classmethod
+    def from_signals(cls, signals: list) -> "BatteryStatus":
+        """Creates a BatteryStatus based on the signals' ids
+        :param signals: The signals as returned by get_battery_status
+        :type signals: list
+        :return: The battery status. Missing numeric values ("-") are set to 0.
+        :rtype: BatteryStatus
+        """
+        signals_by_id = {_get_signal_id(signal): signal for signal in signals}
+        values = {}
+
+        for signal_id, field in BATTERY_STATUS_SIGNALS.items():
+            if signal_id not in signals_by_id:
+                raise FusionSolarException(f"Battery status signal {signal_id} ({field}) is missing")
+
+            signal = signals_by_id[signal_id]
+
+            if field in _BATTERY_STATUS_TEXT_FIELDS:
+                values[field] = signal["value"]
+            else:
+                values[field] = _parse_signal_value(signal["realValue"])
+
+        return cls(**values)
+
+    @classmethod
+    def from_signals_batch(cls, signals_by_battery: dict) -> dict:
+        """Creates the BatteryStatus objects of multiple batteries
+        :param signals_by_battery: Dict with the battery's id as key and the signals as returned by
+                                   get_battery_status as value
+        :type signals_by_battery: dict
+        :return: A dict with the battery's id as key and the BatteryStatus as value. If the signals of
+                 a battery are invalid, the value is the raised exception.
+        :rtype: dict
+        """
+        batteries = {}
+
+        for battery_id, signals in signals_by_battery.items():
+            try:
+                batteries[battery_id] = cls.from_signals(signals)
+            except Exception as e:
+                _LOGGER.debug(f"Failed to create the battery status of {battery_id}: {e}")
+                batteries[battery_id] = e
+
+        return batteries
+
+
+def _parse_signal_value(value) -> float:
+    """Converts a signal's realValue to float. Missing values ("-", "--") are returned as 0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _get_signal_id(signal: dict) -> Optional[int]:
+    """Returns a signal's id as int (the API returns it as number or string) or None if it is not set"""
+    try:
+        return int(signal["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def logged_in(func):
     """
     Decorator to make sure user is logged in.
+
+    After any successful call, the session is trusted for `liveness_ttl` seconds
+    without querying is-session-alive. Calls only served from the response cache
+    do not extend this time. If a call fails while the session was only
+    trusted (f.e. invalid JSON due to a redirect to the login page or a non-zero
+    response code), the session is checked once and the call repeated after a
+    new login if it expired.
     """
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        # wait for a login in progress in another thread
+        with self._login_lock:
+            login_generation = self._login_generation
+
+        trusted = self._is_session_trusted()
+        requests_sent = self._transport.requests_sent
+        cache_hits = self._transport.cache_hits
+
+        if trusted:
+            self._liveness_checks_saved += 1
         # use the is-session-alive feature to check whether the session is active
-        if not self.is_session_active():
+        elif not self.is_session_active():
             _LOGGER.debug("No active session. Resetting session and logging in...")
-
-            # reset the session
-            self._session = requests.Session()
-            self._configure_session()
+            self._relogin(login_generation)
 
         try:
             result = func(self, *args, **kwargs)
-        except (json.JSONDecodeError):
-            # this may indicate that the login failed
-            _LOGGER.error("Login apparently failed. Received invalid response.")
-            raise FusionSolarException("Failed to reset session and login again.")
-        
+        except (json.JSONDecodeError, FusionSolarException, requests.exceptions.HTTPError) as e:
+            # only retry if the failure may be caused by an expired session or
+            # another thread logged in while the request was sent
+            if login_generation == self._login_generation and (not trusted or self.is_session_active()):
+                if isinstance(e, json.JSONDecodeError):
+                    # this may indicate that the login failed
+                    _LOGGER.error("Login apparently failed. Received invalid response.")
+                    raise FusionSolarException("Failed to reset session and login again.")
+                raise
+
+            _LOGGER.debug("Session expired while trusted. Resetting session and logging in...")
+            self._relogin(login_generation)
+
+            try:
+                result = func(self, *args, **kwargs)
+            except (json.JSONDecodeError):
+                _LOGGER.error("Login apparently failed. Received invalid response.")
+                raise FusionSolarException("Failed to reset session and login again.")
+
+        # cached responses do not show that the session is still alive
+        if self._transport.requests_sent != requests_sent or self._transport.cache_hits == cache_hits:
+            self._mark_session_alive()
+
         return result
 
     return wrapper
@@ -208,7 +330,11 @@ class FusionSolarClient:
 
     def __init__(
         self, username: str, password: str, huawei_subdomain: str = "region01eu5",
-        session: Optional[requests.Session] = None, captcha_model_path: Optional[str] = None, captcha_device: Optional[Any] = ['CPUExecutionProvider']
+        session: Optional[requests.Session] = None, captcha_model_path: Optional[str] = None, captcha_device: Optional[Any] = ['CPUExecutionProvider'],
+        liveness_ttl: float = 60, transport_config: Optional[TransportConfig] = None,
+        session_store: Optional[Union[SessionStore, str]] = None, max_concurrent_requests: int = 4,
+        response_cache: Optional[ResponseCache] = None, history_cache: Optional[Union[HistoryCache, str]] = None,
+        topology_ttl: float = 3600, rate_limiter: Optional[Union[AdaptiveRateLimiter, float]] = None
     ) -> None:
         """Initialiazes a new FusionSolarClient instance. This is the main
            class to interact with the FusionSolar API.
@@ -227,14 +353,41 @@ class FusionSolarClient:
         :param captcha_device : The device to run the captcha solver on, as list of execution providers. Only required if you want to use the auto captcha solver.
         Please refer to the onnxruntime documentation for more information. https://onnxruntime.ai/docs/execution-providers/
         :type captcha_device: list
+        :param liveness_ttl: Number of seconds a session is trusted to be active after a successful
+                             response without calling is-session-alive. Set to 0 to check before every call.
+        :type liveness_ttl: float
+        :param transport_config: Settings of the connection pool (pool sizes, keep-alive, timeouts, compression).
+                                 If a session is passed, the session is only changed if this is set.
+        :type transport_config: TransportConfig
+        :param session_store: Optional storage to persist the login between processes. Either a SessionStore
+                              or the path of a JSON file. A saved session is only reused if it is still active.
+        :type session_store: SessionStore or str
+        :param max_concurrent_requests: Maximum number of requests bulk functions (f.e. `get_real_time_data_bulk`)
+                                        send at the same time. The limit is shared by all clients of the
+                                        account and subdomain (see get_request_semaphore).
+        :type max_concurrent_requests: int
+        :param response_cache: Optional cache for responses of endpoints that are only updated every
+                               few minutes (f.e. get_power_status and get_plant_flow).
+        :type response_cache: ResponseCache
+        :param history_cache: Optional persistent cache for the history data (f.e. get_historical_data) of
+                              completed days. Either a HistoryCache or the path of a SQLite database file.
+        :type history_cache: HistoryCache or str
+        :param topology_ttl: Number of seconds the plants and devices returned by `get_topology` are reused
+        :type topology_ttl: float
+        :param rate_limiter: Optional limit of the requests per second. Either an AdaptiveRateLimiter or the
+                             initial number of requests per second of the limiter shared by all clients of
+                             the account and subdomain (see get_rate_limiter). Not limited if not set.
+        :type rate_limiter: AdaptiveRateLimiter or float
         """
         self._user = username
         self._password = password
         self._captcha_verify_code = None
-        if session is None:
-            self._session = requests.Session()
-        else:
-            self._session = session
+        if isinstance(rate_limiter, (int, float)):
+            rate_limiter = get_rate_limiter(username, huawei_subdomain, rate=rate_limiter)
+
+        self._transport = Transport(
+            config=transport_config, session=session, cache=response_cache, rate_limiter=rate_limiter
+        )
         self._huawei_subdomain = huawei_subdomain
         # hierarchy: company <- plants <- devices <- subdevices
         self._company_id = None
@@ -249,14 +402,251 @@ class FusionSolarClient:
         self.captcha_device = captcha_device
         self._captcha_solver = None
 
+        # liveness cache - monotonic time until which the session is assumed to be active
+        self._liveness_ttl = liveness_ttl
+        self._session_alive_until = 0.0
+        self._last_alive = None
+        self._liveness_checks_saved = 0
+        self._history_requests_saved = 0
+        self._keep_alive_thread = None
+
+        # only one thread may log in at a time, the others wait and reuse the new session
+        self._login_lock = threading.RLock()
+        self._login_generation = 0
+
+        # limits the requests sent in parallel by bulk functions of all clients of the account
+        self._max_concurrent_requests = max_concurrent_requests
+        self._request_semaphore = get_request_semaphore(username, huawei_subdomain, max_concurrent_requests)
+
+        if isinstance(session_store, str):
+            session_store = FileSessionStore(session_store)
+        self._session_store = session_store
+
+        if isinstance(history_cache, str):
+            history_cache = HistoryCache(history_cache)
+        self._history_cache = history_cache
+
+        # index of the plants and devices (see get_topology)
+        self._topology_ttl = topology_ttl
+        self._topology = None
+        self._topology_lock = threading.Lock()
+
+        # schemas of the real time data per device type (see get_real_time_values)
+        self._realtime_decoder = RealtimeDecoder()
+
+        # serial numbers and versions per (battery, module) (see get_battery_modules)
+        self._battery_static_values = {}
+
+        # positions of the optimizers per plant (see get_optimizer_stats_bulk)
+        self._optimizer_indexes = {}
+
         # Only login if no session has been provided. The session should hold the cookies for a logged in state
-        if session is None:
+        if session is None and not self._restore_session():
+            self._configure_session()
+
+    @property
+    def liveness_checks_saved(self) -> int:
+        """Number of is-session-alive calls that were skipped since the session
+        was still trusted due to a recent successful response.
+        """
+        return self._liveness_checks_saved
+
+    @property
+    def history_requests_saved(self) -> int:
+        """Number of history requests saved by merging signals in `query_history`"""
+        return self._history_requests_saved
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The response cache (if set)"""
+        return self._transport.cache
+
+    @property
+    def history_cache(self) -> Optional[HistoryCache]:
+        """The history cache (if set)"""
+        return self._history_cache
+
+    @property
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        """The rate limiter (if set)"""
+        return self._transport.rate_limiter
+
+    @property
+    def realtime_decoder(self) -> RealtimeDecoder:
+        """The decoder used by `get_real_time_values`"""
+        return self._realtime_decoder
+
+    @property
+    def _session(self) -> requests.Session:
+        """The requests session holding the cookies and headers of the current login"""
+        return self._transport.session
+
+    def _is_session_trusted(self) -> bool:
+        """Checks whether the session had a successful response within the last
+        `liveness_ttl` seconds.
+        """
+        return time.monotonic() < self._session_alive_until
+
+    def _mark_session_alive(self):
+        """Trust the current session for the next `liveness_ttl` seconds
+        """
+        self._last_alive = time.monotonic()
+        self._session_alive_until = self._last_alive + self._liveness_ttl
+
+    def _invalidate_session(self):
+        """Stop trusting the current session
+        """
+        self._session_alive_until = 0.0
+
+    def seconds_since_alive(self) -> float:
+        """Number of seconds since the last successful response.
+
+        :return: The number of seconds or infinity if there was no successful response yet
+        :rtype: float
+        """
+        if self._last_alive is None:
+            return float("inf")
+
+        return time.monotonic() - self._last_alive
+
+    def start_keep_alive(self, interval: float = 30):
+        """Starts a background thread that calls `keep_alive` every `interval` seconds.
+           The call is skipped if another request succeeded within the interval.
+
+        :param interval: Number of seconds between two keep-alive calls
+        :type interval: float
+        """
+        self.stop_keep_alive()
+
+        self._keep_alive_thread = KeepAliveThread(self, interval=interval)
+        self._keep_alive_thread.start()
+
+    def stop_keep_alive(self):
+        """Stops the background keep-alive thread (if running)
+        """
+        if self._keep_alive_thread is None:
+            return
+
+        self._keep_alive_thread.stop()
+        if self._keep_alive_thread is not threading.current_thread():
+            self._keep_alive_thread.join()
+        self._keep_alive_thread = None
+
+    def close(self):
+        """Stops the keep-alive thread and closes all open connections. This does not log out.
+        """
+        self.stop_keep_alive()
+        self._transport.close()
+
+    def _run_concurrently(self, func, items: list) -> dict:
+        """Calls `func` for every item using at most `max_concurrent_requests` parallel
+           requests (across all bulk calls of the clients of the account).
+
+        :param func: The function to call with every item
+        :param items: The items to process
+        :type items: list
+        :return: A dict with the item as key and the function's result as value. If the call
+                 failed for an item, the value is the raised exception.
+        :rtype: dict
+        """
+        def process(item):
+            with self._request_semaphore:
+                try:
+                    return func(item)
+                except Exception as e:
+                    _LOGGER.debug(f"Failed to process {item}: {e}")
+                    return e
+
+        if len(items) < 1:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self._max_concurrent_requests, len(items))) as executor:
+            results = executor.map(process, items)
+
+            return dict(zip(items, results))
+
+    def _relogin(self, login_generation: Optional[int] = None):
+        """Resets the session and logs in again. Open connections are kept.
+
+        :param login_generation: The login generation the caller found expired. If another thread
+                                 logged in since then, its session is reused instead of logging in again.
+        :type login_generation: int
+        """
+        with self._login_lock:
+            if login_generation is not None and login_generation != self._login_generation:
+                _LOGGER.debug("Session was renewed by another thread")
+                return
+
+            self._invalidate_session()
+            self._transport.reset()
             self._configure_session()
+            self._login_generation += 1
+
+    def _save_session(self):
+        """Saves the current login to the session store (if set)
+        """
+        if self._session_store is None:
+            return
+
+        state = {
+            "username": self._user,
+            "huawei_subdomain": self._huawei_subdomain,
+            "login_subdomain": self._login_subdomain,
+            "company_id": self._company_id,
+            "roarand": self._session.headers.get("roarand"),
+            "cookies": export_cookies(self._session.cookies),
+        }
+
+        try:
+            self._session_store.save(state)
+        except Exception as e:
+            _LOGGER.warning(f"Failed to save session: {e}")
+
+    def _restore_session(self) -> bool:
+        """Restores the login saved in the session store (if set) and checks
+           whether it is still active.
+
+        :return: Indicates whether an active session was restored
+        :rtype: bool
+        """
+        if self._session_store is None:
+            return False
+
+        state = self._session_store.load()
+
+        # only use sessions of the same account
+        if not state or state.get("username") != self._user or state.get("huawei_subdomain") != self._huawei_subdomain:
+            return False
+
+        _LOGGER.debug("Restoring saved session")
+
+        import_cookies(self._session.cookies, state["cookies"])
+        if state.get("roarand"):
+            self._session.headers["roarand"] = state["roarand"]
+        self._company_id = state["company_id"]
+        self._login_subdomain = state["login_subdomain"]
+
+        try:
+            if self.is_session_active():
+                return True
+        except Exception as e:
+            _LOGGER.debug(f"Failed to check restored session: {e}")
+
+        _LOGGER.debug("Saved session expired")
+        self._transport.reset()
+
+        return False
 
     def log_out(self):
         """Log out from the FusionSolarAPI
         """
-        self._session.get(
+        self.stop_keep_alive()
+        self._invalidate_session()
+
+        if self._session_store is not None:
+            self._session_store.clear()
+
+        self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/unisess/v1/logout",
             params={
                 "service": f"https://{self._huawei_subdomain}.fusionsolar.huawei.com"
@@ -283,7 +673,7 @@ class FusionSolarClient:
         params = {
             "service": "%2Funisess%2Fv1%2Fauth%3Fservice%3D%252Fnetecowebext%252Fhome%252Findex.html",
         }
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
         soup = bs4.BeautifulSoup(r.text, 'html.parser')
         captcha_exists = soup.find(id="verificationCodeInput")
@@ -291,7 +681,7 @@ class FusionSolarClient:
             captcha = self._get_captcha()
             self._init_solver()
             self._captcha_verify_code = self._captcha_solver.solve_captcha(captcha)
-            r = self._session.post(url=f"https://{self._login_subdomain}.fusionsolar.huawei.com/unisso/preValidVerifycode",
+            r = self._transport.post(url=f"https://{self._login_subdomain}.fusionsolar.huawei.com/unisso/preValidVerifycode",
                                    data={"verifycode": self._captcha_verify_code, "index": 0})
             r.raise_for_status()
             if r.text != "success":
@@ -303,7 +693,7 @@ class FusionSolarClient:
     def _get_captcha(self):
         url = f"https://{self._login_subdomain}.fusionsolar.huawei.com/unisso/verifycode"
         params = {"timestamp": round(time.time() * 1000)}
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
         image_buffer = r.content
         return image_buffer
@@ -320,7 +710,7 @@ class FusionSolarClient:
     @with_solver
     def _login(self, allow_captcha_exception=True):
         # retrieve the public key in order to test which loging function to use
-        key_request = self._session.get("https://eu5.fusionsolar.huawei.com/unisso/pubkey")
+        key_request = self._transport.get("https://eu5.fusionsolar.huawei.com/unisso/pubkey")
 
         if key_request.status_code != 200:
             _LOGGER.error(f"Failed to retrieve public key. Status code = {key_request.status_code}")
@@ -358,7 +748,7 @@ class FusionSolarClient:
             self._captcha_verify_code = None
 
         # send the request
-        r = self._session.post(url=url, params=url_params, json=json_data)
+        r = self._transport.post(url=url, params=url_params, json=json_data)
         r.raise_for_status()
 
         try:
@@ -374,7 +764,7 @@ class FusionSolarClient:
             _LOGGER.debug("New loging procedure successful, sending additional request")
             target_subdomain = login_response['respMultiRegionName'][1]
             target_url = f"https://{self._login_subdomain}.fusionsolar.huawei.com{ target_subdomain }"
-            new_procedure_response = self._session.get(target_url)
+            new_procedure_response = self._transport.get(target_url)
             new_procedure_response.raise_for_status()
 
         # make sure that the login worked - NOTE: This may no longer work with the new procedure
@@ -409,7 +799,7 @@ class FusionSolarClient:
             raise FusionSolarException("Login failed. No payload received from keep-alive.")
 
         # get the main id
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/neteco/web/organization/v2/company/current",
             params={"_": round(time.time() * 1000)},
         )
@@ -445,7 +835,7 @@ class FusionSolarClient:
         self._company_id = r.json()["data"]["moDn"]
 
         # get the roarand, which is needed for non-GET requests, thus to change device settings
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/unisess/v1/auth/session"
         )
         r.raise_for_status()
@@ -458,6 +848,8 @@ class FusionSolarClient:
             # this currently does not work in the new login procedure
             pass
 
+        self._save_session()
+
     def is_session_active(self) -> bool:
         """Tests whether the current session is active. In the web-based application, this
         function is triggered every 10 seconds.
@@ -469,27 +861,29 @@ class FusionSolarClient:
             return False
         
         # send the request
-        r = self._session.get(f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/dpcloud/auth/v1/is-session-alive")
+        r = self._transport.get(f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/dpcloud/auth/v1/is-session-alive")
         r.raise_for_status()
 
         # get the response
         response_data = r.json()
 
         if "code" not in response_data or response_data["code"] != 0:
+            self._invalidate_session()
             return False
         else:
+            self._mark_session_alive()
             return True
         
     @logged_in
     def keep_alive(self) -> str:
         """This function replicates a call sent by the web-based application. Currently,
         the rate at which this function is called is unclear. It seems to be called around
-        every 30 seconds.
+        every 30 seconds. A refreshed token is saved to the session store (if set).
 
         :return: This function returns the payload returned by the respective call
         :rtype: str
         """
-        r = self._session.get(f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/dpcloud/auth/v1/keep-alive")
+        r = self._transport.get(f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/dpcloud/auth/v1/keep-alive")
         r.raise_for_status()
 
         response_data = r.json()
@@ -500,7 +894,13 @@ class FusionSolarClient:
         # get the payload
         if "payload" in response_data:
             # save the payload as a session header
+            refreshed = self._session.headers.get("roarand") != response_data["payload"]
             self._session.headers["roarand"] = response_data["payload"]
+
+            # a restored session needs the current token
+            if refreshed:
+                self._save_session()
+
             return response_data["payload"]
 
         return None
@@ -519,7 +919,7 @@ class FusionSolarClient:
             "_": round(time.time() * 1000),
         }
 
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
 
         # errors in decoding the object generally mean that the login expired
@@ -548,7 +948,7 @@ class FusionSolarClient:
             "_": round(time.time() * 1000),
         }
 
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
 
         # errors in decoding the object generally mean that the login expired
@@ -568,7 +968,7 @@ class FusionSolarClient:
         :rtype: list
         """
         # get the complete object tree
-        station_list = self.get_station_list()
+        station_list = self.get_all_stations()
 
         # get the ids
         plant_ids = [obj["dn"] for obj in station_list]
@@ -576,18 +976,31 @@ class FusionSolarClient:
         return plant_ids
 
     @logged_in
-    def get_station_list(self) -> list:
-        """Get the list of available PV stations.
-
+    def get_station_list(self, page: int = 1, page_size: int = 10) -> list:
+        """Get the list of available PV stations. Only returns one page of
+           stations, use get_all_stations to retrieve all stations.
+
+        :param page: The page to retrieve (starting at 1)
+        :type page: int
+        :param page_size: The number of stations per page
+        :type page_size: int
         :return: _description_
         :rtype: list
         """
-        # get the complete list
-        r = self._session.post(
+        # simply return the original object list
+        return self._get_station_page(page, page_size)["list"]
+
+    @logged_in
+    def _get_station_page(self, page: int, page_size: int) -> dict:
+        """Retrieves one page of the station list
+        :return: The response's data object containing the "list" and the "total" number of stations
+        :rtype: dict
+        """
+        r = self._transport.post(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/station/station-list",
             json={
-                "curPage": 1,
-                "pageSize": 10,
+                "curPage": page,
+                "pageSize": page_size,
                 "gridConnectedTime": "",
                 "queryTime": self._get_day_start_sec(),
                 "timeZone": 2,
@@ -603,21 +1016,84 @@ class FusionSolarClient:
         if not obj_tree["success"]:
             raise FusionSolarException("Failed to retrieve station list")
 
-        # simply return the original object list
-        return obj_tree["data"]["list"]
+        return obj_tree["data"]
+
+    def iter_station_list(self, page_size: int = 100) -> Iterator[dict]:
+        """Iterates over all available PV stations. The total number of stations is taken
+           from the first page, the remaining pages are retrieved in parallel.
+
+        :param page_size: The number of stations per request
+        :type page_size: int
+        :return: The stations as returned by get_station_list
+        :rtype: Iterator[dict]
+        """
+        return self._iter_pages(lambda page: self._get_station_page(page, page_size), page_size)
+
+    @logged_in
+    def get_all_stations(self, page_size: int = 100) -> list:
+        """Get the complete list of available PV stations (all pages).
+
+        :param page_size: The number of stations per request
+        :type page_size: int
+        :return: The stations as returned by get_station_list
+        :rtype: list
+        """
+        return list(self.iter_station_list(page_size=page_size))
+
+    def _iter_pages(self, get_page, page_size: int) -> Iterator[dict]:
+        """Iterates over the items of all pages. The remaining pages are retrieved
+           in parallel based on the total number of items reported with the first page.
+
+        :param get_page: Function returning the response's data object of the passed page
+                         number. This must contain a "list" and should contain the "total" number
+                         of items.
+        :param page_size: The number of items per page
+        :type page_size: int
+        :return: The items of all pages
+        :rtype: Iterator[dict]
+        """
+        first_page = get_page(1)
+        yield from first_page["list"]
+
+        total = first_page.get("total")
+
+        if total is None:
+            # without the total, retrieve pages until a page is not complete
+            _LOGGER.debug("No total number of items returned, retrieving pages sequentially")
+            page_number, items = 1, first_page["list"]
+            while len(items) >= page_size:
+                page_number += 1
+                items = get_page(page_number)["list"]
+                yield from items
+            return
+
+        pages = self._run_concurrently(get_page, list(range(2, math.ceil(int(total) / page_size) + 1)))
+
+        for page in pages.values():
+            # do not silently lose items
+            if isinstance(page, Exception):
+                raise page
+
+            yield from page["list"]
 
 
     @logged_in
-    def get_device_ids(self) -> list:
+    def get_device_ids(self, parent_dn: str = None) -> list:
         """gets the devices associated to a given parent_id (can be a plant or a company/account)
-        returns a dictionary mapping device_type to device_id"""
+        returns a dictionary mapping device_type to device_id
+        :param parent_dn: The plant's id. If not set, the devices of the whole company are returned.
+        :type parent_dn: str
+        """
+        if parent_dn is None:
+            parent_dn = self._company_id
+
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/neteco/web/config/device/v1/device-list"
         params = {
-            "conditionParams.parentDn": self._company_id,  # can be a plant or company id
+            "conditionParams.parentDn": parent_dn,  # can be a plant or company id
             "conditionParams.mocTypes": "20814,20815,20816,20819,20822,50017,60066,60014,60015,23037",  # specifies the types of devices
             "_": round(time.time() * 1000),
         }
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
         device_data = r.json()
 
@@ -626,55 +1102,256 @@ class FusionSolarClient:
             devices += [dict(type=device["mocTypeName"], deviceDn=device["dn"])]
         return devices
     @logged_in
-    def get_historical_data(self, signal_ids: list[str] = ['30014', '30016', '30017'], device_dn:str = None, date: datetime = datetime.now() ) -> dict:
+    def get_historical_data(self, signal_ids: list[str] = ['30014', '30016', '30017'], device_dn:str = None, date: datetime = None) -> dict:
         """retrieves historical data for specified signals and device
             possible signal_ids:
             30017 : produced DC in kW
             30016 : daily production in kWh
             30014 : produced AC in kW
 
+            :param date: The day to retrieve the data for. If not set, the current day is used.
+            :type date: datetime
             :return: historical data for requested signals and device
             :rtype: dict
             """
+        if date is None:
+            date = datetime.now()
+
+        return self._get_device_history(
+            device_dn, signal_ids, int(date.timestamp() * 1000), parse_float=_parse_float
+        )
+
+    def iter_history(
+        self, device_dns: Union[str, list], signal_ids: list, start_date: date, end_date: Optional[date] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator:
+        """Retrieves the history data of a date range day by day and returns the single
+           measurements as `HistoryRecord(device_dn, signal_id, timestamp, value)` tuples.
+           Following days are requested in parallel while the current day is processed
+           so that the memory usage does not depend on the length of the date range.
+
+        :param device_dns: The device's id or a list of ids
+        :type device_dns: str or list
+        :param signal_ids: The signals to retrieve (see get_historical_data)
+        :type signal_ids: list
+        :param start_date: The first day to retrieve
+        :type start_date: date
+        :param end_date: The last day to retrieve (inclusive). If not set, only start_date is retrieved.
+        :type end_date: date
+        :param batch_size: If set, lists of up to batch_size records are returned instead of single records
+        :type batch_size: int
+        :return: The records ordered by device, day, signal and time
+        :rtype: Iterator[HistoryRecord] or Iterator[list]
+        """
+        if isinstance(device_dns, str):
+            device_dns = [device_dns]
+
+        return iter_history(self, device_dns, signal_ids, start_date, end_date=end_date, batch_size=batch_size)
+
+    @logged_in
+    def query_history(self, wants: list, max_signals_per_request: Optional[int] = None) -> HistoryQueryResult:
+        """Retrieves the history data of multiple (device, signal, day) combinations. All
+           signals of a device and day are retrieved using a single request. The requests
+           are sent in parallel (limited by `max_concurrent_requests`).
+
+        :param wants: The required data as (device_dn, signal_id, day) tuples
+        :type wants: list
+        :param max_signals_per_request: If set, requests are split to contain at most this number of signals
+        :type max_signals_per_request: int
+        :return: The data per (device, signal, day). Use `result.get(device_dn, signal_id, day)`.
+        :rtype: HistoryQueryResult
+        """
+        plan = HistoryQueryPlan(wants, max_signals_per_request=max_signals_per_request)
+        result = plan.execute(self)
+
+        self._history_requests_saved += plan.requests_saved
+
+        return result
+
+    @logged_in
+    def get_historical_columns(
+        self, signal_ids: list, device_dn: str, date: datetime = None, output: str = "numpy"
+    ):
+        """Retrieves the history data (see get_historical_data) as columns. Requires numpy.
+        :param signal_ids: The signals to retrieve
+        :type signal_ids: list
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param date: The day to retrieve. If not set, the current day is used.
+        :type date: datetime
+        :param output: "numpy" to return a dict of arrays, "pandas" for a DataFrame, "arrow" for a pyarrow Table
+        :type output: str
+        :return: The columns "signal_id" (int64), "timestamp" (int64, seconds since epoch) and "value"
+                 (float64, NaN for missing values)
+        :rtype: dict, pandas.DataFrame or pyarrow.Table
+        """
+        from .columnar import history_to_columns
+
+        if date is None:
+            date = datetime.now()
+
+        # the numbers are converted in bulk
+        history_data = self._get_raw_history_data(device_dn, signal_ids, int(date.timestamp() * 1000))
+
+        return history_to_columns(history_data, output=output)
+
+    @logged_in
+    def _get_raw_history_data(self, device_dn: str, signal_ids: list, query_time: int) -> dict:
+        """Retrieves the history data without converting the numbers. All floats are
+           returned as str (see IntradayHistory).
+        """
+        history_data = self._get_device_history(device_dn, signal_ids, query_time, parse_float=str)
+
+        if not history_data.get("success") or not isinstance(history_data.get("data"), dict):
+            raise FusionSolarException(f"Failed to retrieve history data for {device_dn}")
+
+        return history_data
+
+    def _get_device_history(self, device_dn: str, signal_ids: list, query_time: int, parse_float=None) -> dict:
+        """Retrieves the history data of the passed signals. Data of completed days is
+           taken from the history cache (if set).
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param signal_ids: The signals to retrieve
+        :type signal_ids: list
+        :param query_time: A time of the day to retrieve in milliseconds since epoch
+        :type query_time: int
+        :param parse_float: Optional function to parse floats (see json.loads)
+        :return: The complete response as dict
+        :rtype: dict
+        """
+        day = None
+        cached_data = {}
+
+        if self._history_cache is not None:
+            day = self._history_cache.get_completed_day(query_time)
+
+            if day is not None:
+                cached_data = self._history_cache.get(device_dn, signal_ids, day, parse_float=parse_float)
+
+        missing_signals = [signal_id for signal_id in signal_ids if str(signal_id) not in cached_data]
+
+        if not missing_signals:
+            return {"success": True, "data": cached_data}
 
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-history-data"
         params = ()
-        for signal_id in signal_ids:
+        for signal_id in missing_signals:
             params += (("signalIds", signal_id),)
 
         params += (
             ("deviceDn", device_dn),  #
-            ("date", int(date.timestamp() * 1000)),
+            ("date", query_time),
             ("_", round(time.time() * 1000)),
         )
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
 
-        return r.json(parse_float=_parse_float)
+        if parse_float is _parse_float:
+            # the floats are rounded after the unconverted data was cached
+            history_data = decode(r.content)
+        else:
+            history_data = r.json(parse_float=parse_float)
 
-    @logged_in
-    def get_real_time_data(self, device_dn: str = None) -> dict:
-        """retrieves real time data for requested device
+        succeeded = history_data.get("success") and isinstance(history_data.get("data"), dict)
 
-            :return: real time data for requested signals and device
-            :rtype: dict
+        if succeeded and day is not None:
+            # the unconverted data is stored, parse_float is applied when reading from the cache
+            signal_data = history_data["data"] if parse_float is None or parse_float is _parse_float else r.json()["data"]
 
-            """
+            self._history_cache.put(device_dn, day, {
+                str(signal_id): signal_data[str(signal_id)]
+                for signal_id in missing_signals if str(signal_id) in signal_data
+            })
+
+        if parse_float is _parse_float:
+            # rounds all floats at once instead of creating a Decimal per float
+            history_data = round_floats(history_data, r.content)
+
+        if succeeded:
+            history_data["data"].update(cached_data)
+
+        return history_data
 
+    def _request_real_time_data(self, device_dn: str) -> requests.Response:
+        """Requests the real time data of a device"""
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-realtime-data"
         params = (
             ("deviceDn", device_dn),  #
             ("_", round(time.time() * 1000)),
         )
-        r = self._session.get(url=url, params=params)
+        r = self._transport.get(url=url, params=params)
         r.raise_for_status()
 
-        return r.json()
+        return r
 
+    @logged_in
+    def get_real_time_data(self, device_dn: str = None) -> dict:
+        """retrieves real time data for requested device
+
+            :return: real time data for requested signals and device
+            :rtype: dict
+
+            """
+
+        return self._request_real_time_data(device_dn).json()
 
     @logged_in
-    def get_alarm_data(self, device_dn: str = None) -> dict:
-        """retrieves alarm data for device id
+    def get_real_time_data_bulk(self, device_dns: list) -> dict:
+        """Retrieves the real time data of multiple devices in parallel. The number
+           of parallel requests is limited by `max_concurrent_requests`.
+
+        :param device_dns: The devices' ids
+        :type device_dns: list
+        :return: A dict with the device id as key and the result of `get_real_time_data`
+                 as value. If the request failed for a device, the value is the raised exception.
+        :rtype: dict
+        """
+        return self._run_concurrently(self.get_real_time_data, device_dns)
+
+    @logged_in
+    def get_real_time_values(self, device_dn: str, device_type: str = None) -> RealtimeValues:
+        """Retrieves the real time data of a device as compact values. Numeric values are
+           stored in a float array, text values in a dict. The response is decoded without
+           parsing the JSON once the layout of its signals is known. The position of a signal
+           in the array is returned by `realtime_decoder.get_schema(device_type).get_index(signal_id)`.
+
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param device_type: The device's type (the "type" of get_device_ids). If not set,
+                            the schema is identified by the returned signals.
+        :type device_type: str
+        :return: The values. `values[signal_id]` returns a float, str or None for missing values.
+        :rtype: RealtimeValues
+        """
+        return self._realtime_decoder.decode(self._request_real_time_data(device_dn).content, device_type)
+
+    @logged_in
+    def get_real_time_values_bulk(self, device_dns: list, device_type: str = None) -> dict:
+        """Retrieves the real time data of multiple devices of the same type in parallel
+           (see `get_real_time_values`). The number of parallel requests is limited by
+           `max_concurrent_requests`.
+
+        :param device_dns: The devices' ids
+        :type device_dns: list
+        :param device_type: The devices' type (the "type" of get_device_ids). If not set,
+                            the schema is identified by the signals of every device.
+        :type device_type: str
+        :return: Dict with the device's id as key and the RealtimeValues as value. If the
+                 request failed for a device, the value is the raised exception.
+        :rtype: dict
+        """
+        return self._run_concurrently(partial(self.get_real_time_values, device_type=device_type), device_dns)
+
+
+    @logged_in
+    def get_alarm_data(self, device_dn: str = None, page: int = 1, page_size: int = 10) -> dict:
+        """retrieves alarm data for device id. Only returns one page of alarms, use
+            get_all_alarm_data to retrieve all alarms.
+            :param page: The page to retrieve (starting at 1)
+            :type page: int
+            :param page_size: The number of alarms per page
+            :type page_size: int
             :return: alarm data for device id
             :rtype: dict
             https://uni004eu5.fusionsolar.huawei.com/rest/pvms/fm/v1/query
@@ -683,22 +1360,96 @@ class FusionSolarClient:
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/fm/v1/query"
         request_data = {"dataType":"CURRENT",
                         "domainType":"OC_SOLAR",
-                        "pageNo":1,
-                        "pageSize":10,
+                        "pageNo":page,
+                        "pageSize":page_size,
                         "nativeMeDn":device_dn}
-        r = self._session.post(url=url, json=request_data)
+        r = self._transport.post(url=url, json=request_data)
         r.raise_for_status()
 
         return r.json()
 
+    def iter_alarm_data(self, device_dn: str = None, page_size: int = 100) -> Iterator[dict]:
+        """Iterates over all current alarms of the device. The total number of alarms is taken
+           from the first page, the remaining pages are retrieved in parallel.
+
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param page_size: The number of alarms per request
+        :type page_size: int
+        :return: The single alarms
+        :rtype: Iterator[dict]
+        """
+        def get_page(page: int) -> dict:
+            alarm_data = self.get_alarm_data(device_dn, page=page, page_size=page_size)
+
+            if not isinstance(alarm_data.get("data"), dict) or "list" not in alarm_data["data"]:
+                raise FusionSolarException(f"Failed to retrieve alarm data for {device_dn}")
+
+            return alarm_data["data"]
+
+        return self._iter_pages(get_page, page_size)
+
+    @logged_in
+    def get_all_alarm_data(self, device_dn: str = None, page_size: int = 100) -> list:
+        """Retrieves all current alarms of the device (all pages).
+
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param page_size: The number of alarms per request
+        :type page_size: int
+        :return: The single alarms
+        :rtype: list
+        """
+        return list(self.iter_alarm_data(device_dn, page_size=page_size))
+
+
+    def get_topology(self, refresh: bool = False, include_optimizers: bool = True) -> TopologyIndex:
+        """Returns the index of all plants, devices, batteries and optimizers of the company.
+           The index is created with concurrent requests and reused until `topology_ttl`
+           is expired.
+
+        :param refresh: If set, the index is created again even if it is not expired
+        :type refresh: bool
+        :param include_optimizers: If set, the optimizers of all inverters are retrieved as well.
+                                   Only used if the index is created.
+        :type include_optimizers: bool
+        :return: The index
+        :rtype: TopologyIndex
+        """
+        # only one thread crawls the topology, the others wait for the result
+        with self._topology_lock:
+            if refresh or self._topology is None or self._topology.expired:
+                self._topology = crawl_topology(self, include_optimizers=include_optimizers, ttl=self._topology_ttl)
+
+            return self._topology
+
+    def refresh_topology(self) -> TopologyIndex:
+        """Creates the index of all plants and devices again (see get_topology)"""
+        return self.get_topology(refresh=True)
 
     @logged_in
     def get_battery_ids(self, plant_id) -> list:
-        """gets the battery ids associated to a given plant id
+        """gets the battery ids associated to a given plant id. If a valid topology
+        index exists (see get_topology), no request is sent.
         :return: A list of battery ids (strings)
         :rtype: list
         """
+        topology = self._topology
+        if topology is not None and not topology.expired and topology.get(plant_id) is not None:
+            return topology.get_battery_ids(plant_id)
+
         plant_flow = self.get_plant_flow(plant_id)
+
+        return self._extract_battery_ids(plant_flow)
+
+    @staticmethod
+    def _extract_battery_ids(plant_flow: dict) -> list:
+        """Extracts the battery ids from the energy flow diagram
+        :param plant_flow: The plant flow as returned by get_plant_flow
+        :type plant_flow: dict
+        :return: A list of battery ids (strings)
+        :rtype: list
+        """
         nodes = plant_flow['data']['flow']['nodes']
         battery_ids = []
         for node in nodes:
@@ -715,25 +1466,30 @@ class FusionSolarClient:
         :type battery_id: str
         :return: The basic stats as a BatteryStatus object
         """
-        battery_stats = self.get_battery_status(battery_id)
-
-        # ensure that all values are numeric
-        for index in (2, 4, 5, 6, 7, 8):
-            if "-" in battery_stats[index]["realValue"]:
-                battery_stats[index]["realValue"] = 0
-
-        battery_status = BatteryStatus(
-            state_of_charge=float(battery_stats[8]["realValue"]),
-            rated_capacity=float(battery_stats[2]["realValue"]),
-            operating_status=battery_stats[0]["value"],
-            backup_time=battery_stats[3]["value"],
-            bus_voltage=float(battery_stats[7]["realValue"]),
-            total_charged_today_kwh=float(battery_stats[4]["realValue"]),
-            total_discharged_today_kwh=float(battery_stats[5]["realValue"]),
-            current_charge_discharge_kw=float(battery_stats[6]["realValue"]),
-        )
+        return BatteryStatus.from_signals(self.get_battery_status(battery_id))
 
-        return battery_status
+    @logged_in
+    def get_battery_basic_stats_bulk(self, battery_ids: list) -> dict:
+        """Retrieves the basic stats of multiple batteries in parallel. The number
+           of parallel requests is limited by `max_concurrent_requests`.
+
+        :param battery_ids: The batteries' ids
+        :type battery_ids: list
+        :return: A dict with the battery id as key and the BatteryStatus as value. If the request
+                 failed for a battery, the value is the raised exception.
+        :rtype: dict
+        """
+        signals_by_battery = self.get_battery_status_bulk(battery_ids)
+        failed = {
+            battery_id: signals for battery_id, signals in signals_by_battery.items() if isinstance(signals, Exception)
+        }
+
+        batteries = BatteryStatus.from_signals_batch({
+            battery_id: signals for battery_id, signals in signals_by_battery.items() if battery_id not in failed
+        })
+        batteries.update(failed)
+
+        return batteries
 
     @logged_in
     def get_battery_day_stats(self, battery_id: str, signalIds: list[str] = ["30005", "30007"],query_time: int = None) -> dict:
@@ -753,17 +1509,9 @@ class FusionSolarClient:
         current_time = round(time.time() * 1000)
         if query_time is not None:
             current_time = query_time
-        r = self._session.get(
-            url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-history-data",
-            params={
-                "signalIds": signalIds, # 30005 is Charge/Discharge power, 30007 is SOC, state of charge in %
-                "deviceDn": battery_id,
-                "date": current_time,
-                "_": current_time,
-            },
-        )
-        r.raise_for_status()
-        battery_data = r.json()
+
+        # 30005 is Charge/Discharge power, 30007 is SOC, state of charge in %
+        battery_data = self._get_device_history(battery_id, signalIds, current_time)
 
         if not battery_data["success"] or "data" not in battery_data:
             raise FusionSolarException(
@@ -815,18 +1563,7 @@ class FusionSolarClient:
         else:
             current_time = round(time.time() * 1000)
 
-        r = self._session.get(
-            url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-history-data",
-            params={
-                "signalIds": signalIds,
-                "deviceDn": inverter_id,
-                "date": current_time,
-                "_": current_time,
-            },
-        )
-
-        r.raise_for_status()
-        inverter_data = r.json()
+        inverter_data = self._get_device_history(inverter_id, signalIds, current_time)
 
         if not inverter_data["success"] or "data" not in inverter_data:
             raise FusionSolarException(
@@ -852,13 +1589,12 @@ class FusionSolarClient:
         """
         if signal_ids is None:
             signal_ids = MODULE_SIGNALS[module_id]
-        else:
-            if not all(signal_id in MODULE_SIGNALS[module_id] for signal_id in signal_ids):
-                raise ValueError(f"One or more unknown signal ids for module {module_id}")
+        elif MODULE_SIGNAL_REGISTRY.get_unknown_signals(module_id, signal_ids):
+            raise ValueError(f"One or more unknown signal ids for module {module_id}")
 
         signal_ids = ",".join(signal_ids)
 
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/query-battery-dc",
             params={
                 "sigids": signal_ids,
@@ -877,6 +1613,71 @@ class FusionSolarClient:
 
         return battery_data["data"]
 
+    def get_battery_module_values(
+        self, battery_id: str, module_id: str="1", signal_ids: list=None
+        ) -> dict:
+        """Retrieves the stats of the given battery module (see get_battery_module_stats)
+           and converts them based on signals.md. Enum signals are returned as their
+           meaning, signals with a unit as float and missing values as None.
+        :param battery_id: The battery's id
+        :type battery_id: str
+        :param module_id: The module's id
+        :type module_id: str
+        :param signal_ids: The signal ids to retrieve. If not set, all signals will be retrieved
+        :type signal_ids: list
+        :return: Dict with the signal's id as key and the converted value as value
+        :rtype: dict
+        """
+        return MODULE_SIGNAL_REGISTRY.decode_signals(
+            self.get_battery_module_stats(battery_id, module_id=module_id, signal_ids=signal_ids)
+        )
+
+    @logged_in
+    def get_battery_modules(
+        self, battery_id: str, module_ids: list=None, refresh_static: bool=False
+        ) -> dict:
+        """Retrieves the stats of multiple battery modules in parallel. The number
+           of parallel requests is limited by `max_concurrent_requests`.
+
+           The serial numbers and versions of a module are only retrieved by the first
+           call and reused afterwards.
+
+        :param battery_id: The battery's id
+        :type battery_id: str
+        :param module_ids: The modules' ids. If not set, all modules ("1" - "4") are retrieved.
+        :type module_ids: list
+        :param refresh_static: Retrieve the serial numbers and versions again
+        :type refresh_static: bool
+        :return: A dict with the module's id as key and the BatteryModule as value. If the request
+                 failed for a module, the value is the raised exception.
+        :rtype: dict
+        """
+        if module_ids is None:
+            module_ids = list(MODULE_SIGNALS.keys())
+
+        for module_id in module_ids:
+            if module_id not in MODULE_SIGNALS:
+                raise ValueError(f"Unknown module id {module_id}")
+
+        def get_module(module_id: str) -> BatteryModule:
+            static_values = None if refresh_static else self._battery_static_values.get((battery_id, module_id))
+
+            if static_values is None:
+                values = self.get_battery_module_values(battery_id, module_id=module_id)
+                static_values = {signal_id: values.get(signal_id) for signal_id in get_static_signal_ids(module_id)}
+
+                # f.e. the module was offline
+                if any(value is not None for value in static_values.values()):
+                    self._battery_static_values[(battery_id, module_id)] = static_values
+            else:
+                values = self.get_battery_module_values(
+                    battery_id, module_id=module_id, signal_ids=get_dynamic_signal_ids(module_id)
+                )
+                values.update(static_values)
+
+            return BatteryModule.from_values(module_id, values)
+
+        return self._run_concurrently(get_module, module_ids)
 
     @logged_in
     def get_battery_status(self, battery_id: str) -> dict:
@@ -887,7 +1688,7 @@ class FusionSolarClient:
         :return: The current status as a dict
         """
 
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-realtime-data",
             params={
                 "deviceDn": battery_id,
@@ -903,8 +1704,26 @@ class FusionSolarClient:
                 f"Failed to retrieve battery status for {battery_id}"
             )
 
+        # the group holding the battery status is usually the second one
+        for group in battery_data["data"]:
+            if any(_get_signal_id(signal) in BATTERY_STATUS_SIGNALS for signal in group.get("signals", ())):
+                return group["signals"]
+
         return battery_data["data"][1]["signals"]
 
+    @logged_in
+    def get_battery_status_bulk(self, battery_ids: list) -> dict:
+        """Retrieves the current status of multiple batteries in parallel. The number
+           of parallel requests is limited by `max_concurrent_requests`.
+
+        :param battery_ids: The batteries' ids
+        :type battery_ids: list
+        :return: A dict with the battery id as key and the result of `get_battery_status`
+                 as value. If the request failed for a battery, the value is the raised exception.
+        :rtype: dict
+        """
+        return self._run_concurrently(self.get_battery_status, battery_ids)
+
 
     @logged_in
     def active_power_control(self, power_setting) -> None:
@@ -921,8 +1740,16 @@ class FusionSolarClient:
         if power_setting not in power_setting_options:
             raise ValueError("Unknown power setting")
 
-        device_ids = self.get_device_ids()
-        dongle_id = list(filter(lambda e: e['type'] == 'Dongle', device_ids))[0]['id']
+        # only a valid topology index is used, crawling it would need far more requests
+        topology = self._topology
+        if topology is not None and not topology.expired:
+            dongle_ids = [node.dn for node in topology.get_by_type("Dongle")]
+        else:
+            dongle_ids = [device["deviceDn"] for device in self.get_device_ids() if device["type"] == "Dongle"]
+
+        if len(dongle_ids) < 1:
+            raise FusionSolarException("No Dongle found")
+        dongle_id = dongle_ids[0]
 
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/device/v1/deviceExt/set-config-signals"
         data = {
@@ -931,7 +1758,7 @@ class FusionSolarClient:
             "changeValues": f'[{{"id":"230190032","value":"{power_setting_options[power_setting]}"}}]',
         }
 
-        r = self._session.post(url, data=data)
+        r = self._transport.post(url, data=data)
         r.raise_for_status()
 
     @logged_in
@@ -943,7 +1770,7 @@ class FusionSolarClient:
         :return: The complete data structure as a dict
         """
         # https://region01eu5.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-flow?stationDn=NE%3D33594051&_=1652469979488
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-flow",
             params={"stationDn": plant_id, "_": round(time.time() * 1000)},
         )
@@ -973,7 +1800,7 @@ class FusionSolarClient:
         if not query_time:
             query_time = self._get_day_start_sec()
 
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
             params={
                 "stationDn": plant_id,
@@ -996,6 +1823,41 @@ class FusionSolarClient:
         # return the plant data
         return plant_data["data"]
 
+    @logged_in
+    def get_plant_stats_columns(
+        self, plant_id: str, query_time: int = None, utc_offset: int = 0, output: str = "numpy"
+    ):
+        """Retrieves the plant stats (see get_plant_stats) as columns. Requires numpy.
+        :param plant_id: The plant's id
+        :type plant_id: str
+        :param query_time: See get_plant_stats
+        :type query_time: int
+        :param utc_offset: The plant's offset to UTC in seconds (the stats use the plant's local time)
+        :type utc_offset: int
+        :param output: "numpy" to return a dict of arrays, "pandas" for a DataFrame, "arrow" for a pyarrow Table
+        :type output: str
+        :return: The column "timestamp" (int64, seconds since epoch) and a float64 column per measurement
+        :rtype: dict, pandas.DataFrame or pyarrow.Table
+        """
+        from .columnar import plant_stats_to_columns
+
+        return plant_stats_to_columns(self.get_plant_stats(plant_id, query_time), utc_offset=utc_offset, output=output)
+
+    @logged_in
+    def get_plant_snapshot(self, plant_id: str, include_optimizers: bool = False) -> PlantSnapshot:
+        """Retrieves the current data, stats, energy flow and battery status of a plant.
+           Independent requests are sent in parallel (limited by `max_concurrent_requests`)
+           and every endpoint is only requested once. Failed endpoints are reported in
+           `PlantSnapshot.errors` and the duration of every step in `PlantSnapshot.timings`.
+        :param plant_id: The plant's id
+        :type plant_id: str
+        :param include_optimizers: If set, the optimizer stats of all the plant's inverters are retrieved as well
+        :type include_optimizers: bool
+        :return: The plant's data as a PlantSnapshot object
+        :rtype: PlantSnapshot
+        """
+        return create_plant_snapshot(self, plant_id, include_optimizers=include_optimizers)
+
     def get_last_plant_data(self, plant_data: dict) -> dict:
         """Extracts the last measurements from the plant data
         The dict contains detailed information about the data of the plant.
@@ -1015,7 +1877,7 @@ class FusionSolarClient:
         for key_name in plant_data.keys():
             try:
                 # fields to ignore
-                if key_name in ("xAxis", "stationTimezone", "clientTimezone", "stationDn"):
+                if key_name in IGNORED_STATS_KEYS:
                     continue
 
                 key_value = plant_data[key_name]
@@ -1041,6 +1903,19 @@ class FusionSolarClient:
 
         return extracted_data
 
+    def get_last_plant_data_bulk(self, plant_stats: dict, keys: Optional[list] = None) -> LastValueTable:
+        """Extracts the last measurements from the stats of multiple plants
+        :param plant_stats: Dict with the plant's id as key and the plant's stats returned
+                            by get_plant_stats as value
+        :type plant_stats: dict
+        :param keys: The keys to extract (f.e. ["productPower"]). If not set, all keys containing
+                     measurements are extracted.
+        :type keys: list
+        :return: A table with the last value and time per plant and key
+        :rtype: LastValueTable
+        """
+        return extract_last_values(plant_stats, keys=keys)
+
     def _get_last_value(self, values: list, measurement_times: list):
         """Get the last valid value from a values array where
            missing values are stored as '--'
@@ -1050,16 +1925,10 @@ class FusionSolarClient:
         :type values: list
         :return: A dict with a "value" and "timepoint"
         """
-        # add all found values in a list
-        found_values = list()
-
-        for index, value in enumerate(values):
-            if value != "--":
-                found_values.append({"time": measurement_times[index], "value": float(values[index])})
+        index = find_last_index(values)
 
-        # if it's the last value
-        if len(found_values) > 0:
-            return found_values[-1]
+        if index is not None:
+            return {"time": measurement_times[index], "value": float(values[index])}
         else:
             # If nothing is found return "None" for the current time
             return {"time": datetime.now().strftime("%Y-%m-%d %H:%M"), "value": None}
@@ -1087,7 +1956,7 @@ class FusionSolarClient:
         :type plant_id: str
         :return: _description_
         """
-        r = self._session.get(
+        r = self._transport.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/layout/optimizer-info",
             params={
                 "inverterDn": inverter_id,
@@ -1110,3 +1979,35 @@ class FusionSolarClient:
 
         # return the plant data
         return optimizer_data["data"]
+
+    @logged_in
+    def get_optimizer_stats_bulk(self, plant_id: str, metrics: list = None):
+        """Retrieves the optimizer stats of all inverters of a plant in parallel as numpy
+           arrays. Requires numpy. The number of parallel requests is limited by
+           `max_concurrent_requests`.
+
+           Every optimizer keeps its position in the arrays for all calls of this client.
+
+        :param plant_id: The plant's id
+        :type plant_id: str
+        :param metrics: The fields of get_optimizer_stats to return. Defaults to output power,
+                        input voltage, input current and temperature.
+        :type metrics: list
+        :return: The stats with a float64 array per metric (NaN if an optimizer did not report a value).
+                 Inverters that failed (f.e. since they have no optimizers) are listed in `errors`.
+        :rtype: OptimizerTable
+        """
+        from .optimizers import OptimizerIndex, create_optimizer_table
+
+        topology = self._topology
+        if topology is not None and not topology.expired and topology.get(plant_id) is not None:
+            inverter_dns = [node.dn for node in topology.get_by_plant(plant_id, "Inverter")]
+        else:
+            inverter_dns = [
+                device["deviceDn"] for device in self.get_device_ids(parent_dn=plant_id) if device["type"] == "Inverter"
+            ]
+
+        optimizer_stats = self._run_concurrently(self.get_optimizer_stats, inverter_dns)
+        index = self._optimizer_indexes.setdefault(plant_id, OptimizerIndex())
+
+        return create_optimizer_table(optimizer_stats, index, metrics)
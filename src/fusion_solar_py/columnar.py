@@ -0,0 +1,157 @@
+"""Conversion of history data and plant stats into columnar arrays"""
+
+import logging
+from operator import itemgetter
+
+from .exceptions import FusionSolarException
+from .last_values import IGNORED_STATS_KEYS
+
+try:
+    import numpy as np
+except ImportError:
+    raise FusionSolarException("numpy is required for the columnar data. Please install the package using pip install fusion_solar_py[analytics].")
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# value used by FusionSolar for invalid measurements (MAX_JS_NUMBER)
+MAX_JS_FLOAT = np.finfo(np.float64).max
+
+# strings used for missing values
+MISSING_VALUES = ("--", "-", "")
+
+OUTPUT_FORMATS = ("numpy", "pandas", "arrow")
+
+
+def to_float_array(values: list) -> "np.ndarray":
+    """Converts a list of numbers and numeric strings to a float64 array. Missing
+       values ("--") and the MAX_JS_NUMBER sentinel are returned as NaN.
+    :param values: The values as returned by the API
+    :type values: list
+    :return: The values
+    :rtype: np.ndarray
+    """
+    array = np.asarray(values)
+
+    if array.dtype.kind in "fiub":
+        array = array.astype(np.float64)
+    elif array.dtype.kind == "U":
+        # numbers and strings are both converted to str by numpy
+        array = np.where(np.isin(array, MISSING_VALUES), "nan", array)
+
+        try:
+            array = array.astype(np.float64)
+        except ValueError:
+            array = _to_float_array_slow(values)
+    else:
+        # f.e. None values
+        array = _to_float_array_slow(values)
+
+    array[array == MAX_JS_FLOAT] = np.nan
+
+    return array
+
+
+def _to_float_array_slow(values: list) -> "np.ndarray":
+    """Converts the values one by one, invalid values are returned as NaN"""
+    array = np.empty(len(values), dtype=np.float64)
+
+    for index, value in enumerate(values):
+        try:
+            array[index] = float(value)
+        except (TypeError, ValueError):
+            array[index] = np.nan
+
+    return array
+
+
+def history_to_columns(history_data: dict, output: str = "numpy"):
+    """Converts a device-history-data response (see get_historical_data) into
+       columns holding the measurements of all signals.
+
+    :param history_data: The response as returned by get_historical_data
+    :type history_data: dict
+    :param output: "numpy" to return a dict of arrays, "pandas" for a DataFrame, "arrow" for a pyarrow Table
+    :type output: str
+    :return: The columns "signal_id" (int64), "timestamp" (int64, seconds since epoch) and "value" (float64)
+    :rtype: dict, pandas.DataFrame or pyarrow.Table
+    """
+    signal_ids, timestamps, values = [], [], []
+
+    for signal_id, signal_data in history_data.get("data", {}).items():
+        points = signal_data.get("pmDataList", [])
+
+        signal_ids.append(np.full(len(points), int(signal_id), dtype=np.int64))
+        timestamps.append(np.fromiter(map(itemgetter("startTime"), points), dtype=np.int64, count=len(points)))
+        values.append(to_float_array([point.get("counterValue") for point in points]))
+
+    columns = {
+        "signal_id": np.concatenate(signal_ids) if signal_ids else np.empty(0, dtype=np.int64),
+        "timestamp": np.concatenate(timestamps) if timestamps else np.empty(0, dtype=np.int64),
+        "value": np.concatenate(values) if values else np.empty(0, dtype=np.float64),
+    }
+
+    return convert_columns(columns, output)
+
+
+def plant_stats_to_columns(plant_stats: dict, utc_offset: int = 0, output: str = "numpy"):
+    """Converts the plant stats (see get_plant_stats) into columns
+
+    :param plant_stats: The plant's stats as returned by get_plant_stats
+    :type plant_stats: dict
+    :param utc_offset: The plant's offset to UTC in seconds. The times of the stats are local
+                       times of the plant.
+    :type utc_offset: int
+    :param output: "numpy" to return a dict of arrays, "pandas" for a DataFrame, "arrow" for a pyarrow Table
+    :type output: str
+    :return: The column "timestamp" (int64, seconds since epoch) and a float64 column per measurement
+    :rtype: dict, pandas.DataFrame or pyarrow.Table
+    """
+    if "xAxis" not in plant_stats:
+        raise FusionSolarException("Invalid plant_data object passed.")
+
+    timestamps = np.asarray(plant_stats["xAxis"], dtype="datetime64[s]").astype(np.int64) - utc_offset
+    columns = {"timestamp": timestamps}
+
+    for key, values in plant_stats.items():
+        if key in IGNORED_STATS_KEYS or not isinstance(values, list):
+            continue
+
+        if len(values) != len(timestamps):
+            _LOGGER.debug(f"Ignoring {key}: {len(values)} values for {len(timestamps)} times")
+            continue
+
+        columns[key] = to_float_array(values)
+
+    return convert_columns(columns, output)
+
+
+def convert_columns(columns: dict, output: str = "numpy"):
+    """Converts a dict of arrays into the requested output format. The arrays are not copied.
+    :param columns: The columns as dict of numpy arrays
+    :type columns: dict
+    :param output: "numpy" to return the dict, "pandas" for a DataFrame, "arrow" for a pyarrow Table
+    :type output: str
+    :return: The converted columns
+    """
+    if output == "numpy":
+        return columns
+
+    if output == "pandas":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise FusionSolarException("pandas is required for this output format.")
+
+        return pd.DataFrame(columns, copy=False)
+
+    if output == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise FusionSolarException("pyarrow is required for this output format.")
+
+        return pa.table(columns)
+
+    raise ValueError(f"Unknown output format '{output}'. Must be one of {OUTPUT_FORMATS}")
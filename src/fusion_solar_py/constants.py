@@ -48,3 +48,59 @@ MODULE_SIGNALS = {
         "230320621", "230320632", "230320507", "230320508", "230320509"
     ]
 }
+
+
+# descriptions of the MODULE_SIGNALS (in the same order, see signals.md)
+# (name, unit, possible values)
+MODULE_SIGNAL_DEFINITIONS = [
+    ("No.", None, None),
+    ("[DC/DC] Working status", None, {0: "Offline", 1: "Standby", 2: "Running", 3: "Fault", 4: "Hibernation"}),
+    ("[DC/DC] SN", None, None),
+    ("[DC/DC] Software version", None, None),
+    ("[DC/DC] SOC", "%", None),
+    ("[DC/DC] Charge and discharge power", "kW", None),
+    ("[DC/DC] Internal temperature", "℃", None),
+    ("[DC/DC] Daily charge energy", "kWh", None),
+    ("[DC/DC] Daily discharge energy", "kWh", None),
+    ("Total discharge energy", "kWh", None),
+    ("[DC/DC] Bus voltage", "V", None),
+    ("[DC/DC] Bus current", "A", None),
+    ("FE connection", None, {0: "Disconnected", 1: "Connecting...", 2: "Connected", 3: "Connection failed", 4: "Internal error", 5: "Closed by peer", 6: "Link error", 7: "Port unreachable", 8: "Peer certificate verification failed", 9: "Local certificate abnormal", 20: "Unsuccessful domain name resolution", 21: "Server unreachable", 22: "Link unresponsive", 23: "Second challenge authentication failed"}),
+    ("Total charge energy", "kWh", None),
+    ("[Battery pack 1] No.", None, None),
+    ("[Battery pack 2] No.", None, None),
+    ("[Battery pack 3] No.", None, None),
+    ("[Battery pack 1] Firmware version", None, None),
+    ("[Battery pack 2] Firmware version", None, None),
+    ("[Battery pack 3] Firmware version", None, None),
+    ("[Battery pack 1] SN", None, None),
+    ("[Battery pack 2] SN", None, None),
+    ("[Battery pack 3] SN", None, None),
+    ("[Battery pack 1] Operating status", None, {0: "Offline", 1: "Standby", 2: "Running", 3: "Fault", 4: "Hibernation", 8: "EOL"}),
+    ("[Battery pack 2] Operating status", None, {0: "Offline", 1: "Standby", 2: "Running", 3: "Fault", 4: "Hibernation", 8: "EOL"}),
+    ("[Battery pack 3] Operating status", None, {0: "Offline", 1: "Standby", 2: "Running", 3: "Fault", 4: "Hibernation", 8: "EOL"}),
+    ("[Battery pack 1] Voltage", "V", None),
+    ("[Battery pack 2] Voltage", "V", None),
+    ("[Battery pack 3] Voltage", "V", None),
+    ("[Battery pack 1] Charge/Discharge power", "kW", None),
+    ("[Battery pack 2] Charge/Discharge power", "kW", None),
+    ("[Battery pack 3] Charge/Discharge power", "kW", None),
+    ("[Battery pack 1] Maximum temperature", "℃", None),
+    ("[Battery pack 2] Maximum temperature", "℃", None),
+    ("[Battery pack 3] Maximum temperature", "℃", None),
+    ("[Battery pack 1] Minimum temperature", "℃", None),
+    ("[Battery pack 2] Minimum temperature", "℃", None),
+    ("[Battery pack 3] Minimum temperature", "℃", None),
+    ("[Battery pack 1] Capacity", "Ah", None),
+    ("[Battery pack 2] Capacity", "Ah", None),
+    ("[Battery pack 3] Capacity", "Ah", None),
+    ("[Battery pack 1] Current", "A", None),
+    ("[Battery pack 2] Current", "A", None),
+    ("[Battery pack 3] Current", "A", None),
+    ("[Battery pack 1] SOC", "%", None),
+    ("[Battery pack 2] SOC", "%", None),
+    ("[Battery pack 3] SOC", "%", None),
+    ("[Battery pack 1] High voltage fuse status", None, {0: "Normal", 1: "Open", 2: "Short circuit", 3: "Blow"}),
+    ("[Battery pack 2] High voltage fuse status", None, {0: "Normal", 1: "Open", 2: "Short circuit", 3: "Blow"}),
+    ("[Battery pack 3] High voltage fuse status", None, {0: "Normal", 1: "Open", 2: "Short circuit", 3: "Blow"}),
+]
@@ -0,0 +1,118 @@
+"""Helper functions to process the history data (device-history-data)"""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryRecord(NamedTuple):
+    """A single measurement of a signal"""
+    device_dn: str
+    signal_id: str
+    timestamp: int  # seconds since epoch
+    value: Optional[float]
+
+
+def iter_history_records(device_dn: str, history_data: dict) -> Iterator[HistoryRecord]:
+    """Converts a response of get_historical_data into single records
+    :param device_dn: The device's id
+    :type device_dn: str
+    :param history_data: The response as returned by get_historical_data
+    :type history_data: dict
+    :return: The records ordered by signal and time
+    :rtype: Iterator[HistoryRecord]
+    """
+    for signal_id, signal_data in history_data.get("data", {}).items():
+        for point in signal_data.get("pmDataList", []):
+            value = point.get("counterValue")
+
+            if not isinstance(value, (int, float)):
+                value = None
+
+            yield HistoryRecord(device_dn, str(signal_id), int(point["startTime"]), value)
+
+
+def get_days(start_date: date, end_date: date) -> list:
+    """Returns all days from start_date to end_date (inclusive)"""
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def get_query_date(day: date) -> datetime:
+    """Returns the time used to request the history data of a day (noon to be safe
+       against timezone differences)
+    """
+    return datetime.combine(day, datetime.min.time()).replace(hour=12)
+
+
+def iter_history(
+    client, device_dns: list, signal_ids: list, start_date: date, end_date: Optional[date] = None,
+    batch_size: Optional[int] = None
+) -> Iterator:
+    """Retrieves the history data day by day and yields the single records. The following
+       days are requested in parallel (limited by the client's `max_concurrent_requests`)
+       while the records of the current day are processed. Therefore, the memory usage
+       does not depend on the length of the date range.
+
+    :param client: The client to use
+    :type client: FusionSolarClient
+    :param device_dns: The devices' ids
+    :type device_dns: list
+    :param signal_ids: The signals to retrieve
+    :type signal_ids: list
+    :param start_date: The first day to retrieve
+    :type start_date: date
+    :param end_date: The last day to retrieve (inclusive). If not set, only start_date is retrieved.
+    :type end_date: date
+    :param batch_size: If set, lists of up to batch_size records are returned instead of single records
+    :type batch_size: int
+    :return: The records ordered by device, day, signal and time
+    :rtype: Iterator[HistoryRecord] or Iterator[list]
+    """
+    if end_date is None:
+        end_date = start_date
+
+    jobs = [(device_dn, day) for device_dn in device_dns for day in get_days(start_date, end_date)]
+
+    def fetch(device_dn: str, day: date) -> dict:
+        with client._request_semaphore:
+            return client.get_historical_data(
+                signal_ids=signal_ids, device_dn=device_dn, date=get_query_date(day)
+            )
+
+    batch = []
+
+    with ThreadPoolExecutor(max_workers=client._max_concurrent_requests) as executor:
+        # only keep a limited number of responses in memory
+        pending = deque()
+        job_iter = iter(jobs)
+
+        for job in job_iter:
+            pending.append((job[0], executor.submit(fetch, *job)))
+            if len(pending) >= client._max_concurrent_requests:
+                break
+
+        while pending:
+            device_dn, future = pending.popleft()
+
+            next_job = next(job_iter, None)
+            if next_job is not None:
+                pending.append((next_job[0], executor.submit(fetch, *next_job)))
+
+            for record in iter_history_records(device_dn, future.result()):
+                if batch_size is None:
+                    yield record
+                    continue
+
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+    if batch:
+        yield batch
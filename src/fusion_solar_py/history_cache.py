@@ -0,0 +1,120 @@
+"""Persistent cache for the history data of completed days"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from .json_decoder import _parse_float, loads
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryCache:
+    """SQLite based cache for device-history-data responses
+
+    The data of a completed day never changes. Therefore, it is stored per device,
+    signal and day and used instead of requesting it again. Data of the current day
+    is never cached.
+    """
+
+    def __init__(self, path: str, min_age_days: int = 1):
+        """Create a new HistoryCache
+        :param path: Path to the SQLite database file. Use ":memory:" for a non-persistent cache.
+        :type path: str
+        :param min_age_days: Minimum age of a day (based on the local date) to be treated as
+                             completed. Increase this if the plant's timezone is behind the local
+                             timezone.
+        :type min_age_days: int
+        """
+        self.path = path
+        self.min_age_days = min_age_days
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "device_dn TEXT NOT NULL, signal_id TEXT NOT NULL, day TEXT NOT NULL, data TEXT NOT NULL, "
+                "PRIMARY KEY (device_dn, signal_id, day))"
+            )
+
+    def get_completed_day(self, query_time: int) -> Optional[str]:
+        """Returns the day of the passed time if it is completed
+        :param query_time: The time in milliseconds since epoch
+        :type query_time: int
+        :return: The day as "YYYY-MM-DD" or None if the day is not completed
+        :rtype: str
+        """
+        day = datetime.fromtimestamp(query_time / 1000).date()
+
+        if day > date.today() - timedelta(days=self.min_age_days):
+            return None
+
+        return day.isoformat()
+
+    def get(self, device_dn: str, signal_ids: list, day: str, parse_float=None) -> dict:
+        """Returns the cached data of the passed signals
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param signal_ids: The signals to retrieve
+        :type signal_ids: list
+        :param day: The day as "YYYY-MM-DD"
+        :type day: str
+        :param parse_float: Optional function to parse floats (see json.loads)
+        :return: A dict with the signal id as key and the signal's data as value. Signals
+                 that are not cached are missing.
+        :rtype: dict
+        """
+        signal_ids = list(signal_ids)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT signal_id, data FROM history WHERE device_dn = ? AND day = ? "
+                f"AND signal_id IN ({','.join('?' * len(signal_ids))})",
+                [device_dn, day] + signal_ids
+            ).fetchall()
+
+        if parse_float is _parse_float:
+            # all rows are decoded at once, only the floats that need to be rounded are converted
+            return dict(zip((signal_id for signal_id, _ in rows), loads("[" + ",".join(data for _, data in rows) + "]")))
+
+        return {signal_id: json.loads(data, parse_float=parse_float) for signal_id, data in rows}
+
+    def put(self, device_dn: str, day: str, signal_data: dict):
+        """Stores the data of a completed day
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param day: The day as "YYYY-MM-DD"
+        :type day: str
+        :param signal_data: A dict with the signal id as key and the signal's data as value
+        :type signal_data: dict
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO history (device_dn, signal_id, day, data) VALUES (?, ?, ?, ?)",
+                [(device_dn, str(signal_id), day, json.dumps(data)) for signal_id, data in signal_data.items()]
+            )
+
+    def clear(self):
+        """Removes all cached data"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM history")
+
+    def close(self):
+        """Closes the database"""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
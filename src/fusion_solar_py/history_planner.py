@@ -0,0 +1,153 @@
+"""Merges single history signal requests into as few requests as possible"""
+
+import logging
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+from .exceptions import FusionSolarException
+from .history import get_query_date
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryWant(NamedTuple):
+    """A signal of a device required for a day"""
+    device_dn: str
+    signal_id: str
+    day: date
+
+
+class HistoryRequest(NamedTuple):
+    """A single device-history-data request"""
+    device_dn: str
+    day: date
+    signal_ids: tuple
+
+
+class HistoryQueryPlan:
+    """Groups (device, signal, day) wants by device and day. device-history-data
+    accepts multiple signals, therefore one request per device and day is sufficient.
+    """
+
+    def __init__(self, wants: list, max_signals_per_request: Optional[int] = None):
+        """Create a new HistoryQueryPlan
+        :param wants: The required data as (device_dn, signal_id, day) tuples. The day can
+                      either be a date or a datetime.
+        :type wants: list
+        :param max_signals_per_request: If set, requests are split to contain at most this number of signals
+        :type max_signals_per_request: int
+        """
+        self.wants = []
+        groups = {}
+
+        for device_dn, signal_id, day in wants:
+            if isinstance(day, datetime):
+                day = day.date()
+
+            want = HistoryWant(device_dn, str(signal_id), day)
+            signal_ids = groups.setdefault((device_dn, day), [])
+
+            # duplicate wants are only requested once
+            if want.signal_id not in signal_ids:
+                signal_ids.append(want.signal_id)
+                self.wants.append(want)
+
+        self.requests = []
+        for (device_dn, day), signal_ids in groups.items():
+            chunk_size = max_signals_per_request or len(signal_ids)
+
+            for offset in range(0, len(signal_ids), chunk_size):
+                self.requests.append(HistoryRequest(device_dn, day, tuple(signal_ids[offset:offset + chunk_size])))
+
+    @property
+    def requests_saved(self) -> int:
+        """Number of requests saved compared to one request per want"""
+        return len(self.wants) - len(self.requests)
+
+    def execute(self, client) -> "HistoryQueryResult":
+        """Sends all requests of the plan in parallel (limited by the client's `max_concurrent_requests`)
+        :param client: The client to use
+        :type client: FusionSolarClient
+        :return: The data per want
+        :rtype: HistoryQueryResult
+        """
+        def fetch(request: HistoryRequest) -> dict:
+            return client.get_historical_data(
+                signal_ids=list(request.signal_ids), device_dn=request.device_dn, date=get_query_date(request.day)
+            )
+
+        responses = client._run_concurrently(fetch, self.requests)
+        results, errors = {}, {}
+
+        for request, response in responses.items():
+            if not isinstance(response, Exception) and (
+                    not response.get("success") or not isinstance(response.get("data"), dict)):
+                response = FusionSolarException(f"Failed to retrieve history data for {request.device_dn}")
+
+            for signal_id in request.signal_ids:
+                want = HistoryWant(request.device_dn, signal_id, request.day)
+
+                if isinstance(response, Exception):
+                    errors[want] = response
+                elif signal_id not in response["data"]:
+                    errors[want] = FusionSolarException(f"Signal {signal_id} missing for {request.device_dn}")
+                else:
+                    results[want] = response["data"][signal_id]
+
+        _LOGGER.debug(f"Retrieved {len(self.wants)} signals using {len(self.requests)} requests")
+
+        return HistoryQueryResult(results, errors, len(self.requests), self.requests_saved)
+
+    def __repr__(self):
+        return (f"HistoryQueryPlan(wants={len(self.wants)}, "
+                f"requests={len(self.requests)}, "
+                f"requests_saved={self.requests_saved})")
+
+
+class HistoryQueryResult:
+    """Class representing the data retrieved for a HistoryQueryPlan"""
+
+    def __init__(self, results: dict, errors: dict, requests: int, requests_saved: int):
+        """Create a new HistoryQueryResult object
+        :param results: The signal's data (as returned by get_historical_data) per HistoryWant
+        :type results: dict
+        :param errors: The exception per HistoryWant that could not be retrieved
+        :type errors: dict
+        :param requests: Number of requests sent
+        :type requests: int
+        :param requests_saved: Number of requests saved compared to one request per want
+        :type requests_saved: int
+        """
+        self.results = results
+        self.errors = errors
+        self.requests = requests
+        self.requests_saved = requests_saved
+
+    def get(self, device_dn: str, signal_id: str, day: date) -> dict:
+        """Returns the data of a signal
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param signal_id: The signal's id
+        :type signal_id: str
+        :param day: The day
+        :type day: date
+        :return: The signal's data (f.e. the "pmDataList")
+        :rtype: dict
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+
+        want = HistoryWant(device_dn, str(signal_id), day)
+
+        if want in self.errors:
+            raise self.errors[want]
+
+        return self.results[want]
+
+    def __repr__(self):
+        return (f"HistoryQueryResult(results={len(self.results)}, "
+                f"errors={len(self.errors)}, "
+                f"requests={self.requests}, "
+                f"requests_saved={self.requests_saved})")
@@ -23,3 +23,26 @@ class GenericSolver(ABC):
     @abstractmethod
     def preprocess_image(self, img):
         pass
+
+
+class SessionStore(ABC):
+    """Storage backend to persist a logged in session between processes
+    """
+
+    @abstractmethod
+    def load(self):
+        """Returns the saved session state as dict or None if no session was saved
+        """
+        pass
+
+    @abstractmethod
+    def save(self, state: dict):
+        """Saves the passed session state (a JSON serializable dict)
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Removes the saved session state
+        """
+        pass
@@ -0,0 +1,151 @@
+"""Incremental retrieval of the history data of the current day"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+from .client import _parse_float
+from .history import HistoryRecord
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_value(value) -> Optional[float]:
+    """Converts a counterValue decoded with `parse_float=str` identical to get_historical_data.
+       Values that are no numbers (f.e. "-") are returned as None.
+    """
+    if isinstance(value, str):
+        try:
+            if not Decimal(value).is_finite():
+                return None
+        except InvalidOperation:
+            return None
+
+        return _parse_float(value)
+
+    if isinstance(value, (int, float)):
+        return value
+
+    return None
+
+
+class IntradayHistory:
+    """Polls the history data of the current day and returns only new measurements
+
+    device-history-data always returns the complete day. Therefore, the response is
+    still downloaded completely, but its numbers are only decoded as strings. Only
+    measurements newer than the last timestamp seen per (device, signal) are converted
+    and appended to the day buffer. The buffer is cleared when the day changes.
+    """
+
+    def __init__(self, client, device_dns: list, signal_ids: list):
+        """Create a new IntradayHistory
+        :param client: The client to use
+        :type client: FusionSolarClient
+        :param device_dns: The devices' ids
+        :type device_dns: list
+        :param signal_ids: The signals to retrieve (see get_historical_data)
+        :type signal_ids: list
+        """
+        self._client = client
+        self.device_dns = list(device_dns)
+        self.signal_ids = [str(signal_id) for signal_id in signal_ids]
+        self.day = None
+        self.errors = {}
+        self.points_skipped = 0
+        self._last_timestamps = {}
+        self._buffers = {}
+
+    def reset(self):
+        """Removes all buffered measurements"""
+        self.day = None
+        self._last_timestamps = {}
+        self._buffers = {}
+
+    def get_last_timestamp(self, device_dn: str, signal_id: str) -> Optional[int]:
+        """Returns the time (seconds since epoch) of the last measurement seen or None"""
+        return self._last_timestamps.get((device_dn, str(signal_id)))
+
+    def get_day_buffer(self, device_dn: str, signal_id: str) -> list:
+        """Returns all measurements of the current day
+        :param device_dn: The device's id
+        :type device_dn: str
+        :param signal_id: The signal's id
+        :type signal_id: str
+        :return: The measurements ordered by time
+        :rtype: list[HistoryRecord]
+        """
+        return list(self._buffers.get((device_dn, str(signal_id)), []))
+
+    def refresh(self, now: Optional[datetime] = None) -> list:
+        """Retrieves the history data of all devices (in parallel) and returns the
+           measurements that were added since the last call. Devices that could not be
+           retrieved are stored in `errors` and returned by the next call.
+
+        :param now: The current time. If not set, the local time is used.
+        :type now: datetime
+        :return: The new measurements ordered by device, signal and time
+        :rtype: list[HistoryRecord]
+        """
+        if now is None:
+            now = datetime.now()
+
+        if self.day != now.date():
+            _LOGGER.debug(f"Starting new day {now.date()}")
+            self.reset()
+            self.day = now.date()
+
+        query_time = int(now.timestamp() * 1000)
+        responses = self._client._run_concurrently(
+            lambda device_dn: self._client._get_raw_history_data(device_dn, self.signal_ids, query_time),
+            self.device_dns
+        )
+
+        delta = []
+        self.errors = {}
+
+        for device_dn, history_data in responses.items():
+            if isinstance(history_data, Exception):
+                _LOGGER.warning(f"Failed to refresh history data of {device_dn}: {history_data}")
+                self.errors[device_dn] = history_data
+                continue
+
+            for signal_id, signal_data in history_data.get("data", {}).items():
+                delta += self._append_new_points(device_dn, str(signal_id), signal_data.get("pmDataList", []))
+
+        return delta
+
+    def _append_new_points(self, device_dn: str, signal_id: str, points: list) -> list:
+        """Converts the measurements newer than the last seen one and adds them to the day buffer"""
+        key = (device_dn, signal_id)
+        last_timestamp = self._last_timestamps.get(key)
+
+        # measurements are ordered by time, only the end of the list is new
+        start = len(points)
+        if last_timestamp is None:
+            start = 0
+        else:
+            while start > 0 and int(points[start - 1]["startTime"]) > last_timestamp:
+                start -= 1
+
+        self.points_skipped += start
+
+        new_records = [
+            HistoryRecord(device_dn, signal_id, int(point["startTime"]), _parse_value(point.get("counterValue")))
+            for point in points[start:]
+        ]
+
+        if new_records:
+            self._buffers.setdefault(key, []).extend(new_records)
+            self._last_timestamps[key] = new_records[-1].timestamp
+
+        return new_records
+
+    def __repr__(self):
+        return (f"IntradayHistory(day={self.day}, "
+                f"devices={len(self.device_dns)}, "
+                f"signals={self.signal_ids}, "
+                f"points_skipped={self.points_skipped})")
@@ -0,0 +1,351 @@
+"""Decoding of JSON responses with rounded floats"""
+
+import json
+import logging
+import math
+import re
+from collections import Counter
+from decimal import Decimal
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+DEC_PRECISION = Decimal('1.00000000')
+MAX_JS_NUMBER = Decimal('1.7976931348623157E308')
+MAX_JS_FLOAT = float(MAX_JS_NUMBER)
+
+# orjson returns integers beyond 64 bits as float, json.loads keeps them exact
+MAX_EXACT_VALUE = float(2 ** 63)
+
+# minimum number of floats to use numpy
+MIN_NUMPY_SIZE = 64
+
+# the distance of a number with 8 decimal places to the middle of two of them
+HALF_STEP = Decimal('0.000000005')
+
+# above this value, the rounding of a float can depend on its text (see _round_float)
+MAX_ROUNDED_VALUE = float(2 ** 24)
+
+# a float with more than 8 decimal places needs to be rounded (except MAX_JS_NUMBER)
+_MANY_DECIMALS = re.compile(rb'\.(?!7976931348623157[eE]\+?308)\d{9}')
+
+# patterns of _get_decimals_pattern by the number of decimal places
+_DECIMALS_PATTERNS = {}
+
+# the exponent of a number like 123456785e-9 (searched starting with the "-")
+_NEGATIVE_EXPONENT = re.compile(rb'-(?<=[eE]-)')
+
+# splits a JSON document into its numbers (and parts of strings) using bytes.split
+_DELIMITERS_TO_SPACE = bytes.maketrans(b",:[]{}", b"      ")
+
+
+def _parse_float(value: str) -> float:
+    try:
+        _d = Decimal(value)
+        if _d == MAX_JS_NUMBER:
+            _LOGGER.warning("parsing MAX JS NUMBER returning 0.0: '%s'", value)
+            return 0.0
+
+        return float(_d.quantize(DEC_PRECISION))
+    except Exception as exc:
+        _LOGGER.error("cannot parse float from json: '%s'", value, exc_info=True)
+        return 0.0
+
+
+def _collect_floats(data) -> tuple:
+    """Returns all floats of a decoded JSON structure and the dict or list containing each float"""
+    values = []
+    containers = []
+    stack = [data]
+
+    while stack:
+        container = stack.pop()
+
+        # decoded JSON only contains the exact types, no subclasses
+        for value in (container.values() if container.__class__ is dict else container):
+            value_class = value.__class__
+
+            if value_class is float:
+                values.append(value)
+                containers.append(container)
+            elif value_class is dict or value_class is list:
+                stack.append(value)
+
+    return values, containers
+
+
+def _replace_floats(values: list, containers: list, replacements: dict):
+    """Replaces floats by their index in the order of _collect_floats. Only the containers
+       of the replaced floats are visited."""
+    lists = {}
+
+    for index, replacement in replacements.items():
+        container = containers[index]
+        value = values[index]
+
+        if container.__class__ is dict:
+            for key, item in container.items():
+                if item is value:
+                    container[key] = replacement
+                    break
+        else:
+            # visited once for all replaced floats
+            lists.setdefault(id(container), (container, {}))[1][id(value)] = replacement
+
+    for container, list_replacements in lists.values():
+        for position, item in enumerate(container):
+            replacement = list_replacements.get(id(item))
+
+            if replacement is not None:
+                container[position] = replacement
+
+
+def _round_float(value: float) -> Optional[float]:
+    """Rounds a float like _parse_float rounds its text
+    :return: The rounded float or None if the result depends on the text (the float is too close
+             to the middle of two numbers with 8 decimal places or out of range)
+    :rtype: float
+    """
+    if value == MAX_JS_FLOAT:
+        return 0.0
+    if not abs(value) < MAX_EXACT_VALUE:
+        return None
+
+    exact = Decimal(value)
+    rounded = exact.quantize(DEC_PRECISION)
+
+    # the text differs from the float by up to half an ulp
+    if abs(abs(exact - rounded) - HALF_STEP) <= Decimal(math.ulp(value)):
+        return None
+
+    return float(rounded)
+
+
+def _get_decimals_pattern(decimals: int):
+    """Returns a pattern finding numbers with more decimal places (except MAX_JS_NUMBER)"""
+    pattern = _DECIMALS_PATTERNS.get(decimals)
+
+    if pattern is None:
+        pattern = re.compile(rb'\.(?!7976931348623157[eE]\+?308)\d{%d}' % (decimals + 1))
+        _DECIMALS_PATTERNS[decimals] = pattern
+
+    return pattern
+
+
+def _round_shortest(values: list, content: bytes) -> Optional[list]:
+    """Rounds floats using their shortest text (`repr`) without looking it up. Different numbers
+       with up to n decimal places differ by at least 10^-n, so only one of them is decoded to a
+       float if 10^-n is not smaller than its ulp. If the document contains no number with more
+       decimal places (and no negative exponent), this number is the text of the float.
+    :return: The rounded floats or None if the text of a float can be another one
+    :rtype: list
+    """
+    if not max(map(abs, values)) < MAX_ROUNDED_VALUE:
+        return None
+
+    decimals = int(-math.log10(max(map(math.ulp, values))))
+    texts = list(map(repr, values))
+
+    if any("e" in text or len(text) - text.index(".") - 1 > decimals for text in texts):
+        return None
+
+    if _get_decimals_pattern(decimals).search(content):
+        return None
+
+    # a negative exponent adds decimal places (f.e. 123456785e-9)
+    if _NEGATIVE_EXPONENT.search(content):
+        return None
+
+    return list(map(_parse_float, texts))
+
+
+def _round_texts(values: list, counts: list, content: bytes) -> Optional[list]:
+    """Rounds floats using their text. Only the shortest text of a float (`repr`) is looked up.
+    :param values: The floats to round
+    :param counts: The number of occurrences of every float in the document
+    :return: The rounded floats or None if a float is not written as its shortest text everywhere
+    :rtype: list
+    """
+    texts = [repr(value).encode() for value in values]
+    found = Counter(filter(set(texts).__contains__, content.translate(_DELIMITERS_TO_SPACE).split()))
+
+    if any(found[text] != count for text, count in zip(texts, counts)):
+        return None
+
+    return [_parse_float(text.decode()) for text in texts]
+
+
+def _get_replacements(values: list, content: bytes) -> Optional[dict]:
+    """Finds the floats _parse_float would change and rounds them.
+
+       A float that is changed by rounding to 8 decimal places is rounded in bulk like np.round
+       (scaled, rounded to an integer and scaled back), which returns the same result as rounding
+       its text unless the scaled float is close to the middle of two integers. These floats
+       (f.e. 0.123456785) and large floats are rounded one by one, using their text if the result
+       depends on it.
+
+    :param values: The floats of the document (see _collect_floats)
+    :param content: The JSON document
+    :return: Dict with the index of a changed float as key and the rounded float as value or None
+             if the document needs to be decoded using _parse_float
+    :rtype: dict
+    """
+    # a large float is not changed by rounding, but its text with more than 8 decimal places can be
+    max_value = MAX_ROUNDED_VALUE if _MANY_DECIMALS.search(content) else MAX_EXACT_VALUE
+
+    if np is not None and len(values) >= MIN_NUMPY_SIZE:
+        array = np.asarray(values, dtype=np.float64)
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            scaled = array * 1e8
+            steps = np.rint(scaled)
+            rounded = steps / 1e8
+            indexes = np.flatnonzero((rounded != array) | ~(np.abs(array) < max_value))
+
+            if not len(indexes):
+                return {}
+
+            small = np.abs(array[indexes]) < MAX_ROUNDED_VALUE
+            # the text differs from the float by up to half an ulp, the scaled float by up to 2 ulp
+            exact = small & (
+                np.abs(np.abs(scaled[indexes] - steps[indexes]) - 0.5) > 4 * np.spacing(np.abs(scaled[indexes]))
+            )
+
+        replacements = dict(zip(indexes[exact].tolist(), rounded[indexes[exact]].tolist()))
+        # close to the middle of two numbers with 8 decimal places
+        ambiguous = indexes[small & ~exact].tolist()
+        remaining = indexes[~small].tolist()
+
+        def count(value: float) -> int:
+            return int(np.count_nonzero(array == value))
+    else:
+        replacements = {}
+        remaining = [
+            index for index, value in enumerate(values)
+            if not abs(value) < max_value or round(value, 8) != value
+        ]
+        ambiguous = []
+        count = values.count
+
+    for index in remaining:
+        replacement = _round_float(values[index])
+
+        if replacement is None:
+            ambiguous.append(index)
+        else:
+            replacements[index] = replacement
+
+    if ambiguous:
+        ambiguous_values = [values[index] for index in ambiguous]
+        rounded = _round_shortest(ambiguous_values, content)
+
+        if rounded is None:
+            rounded = _round_texts(ambiguous_values, list(map(count, ambiguous_values)), content)
+
+        if rounded is None:
+            return None
+
+        replacements.update(zip(ambiguous, rounded))
+
+    return replacements
+
+
+def _loads_exact(content: bytes):
+    """Decodes a JSON document creating a Decimal per float"""
+    return json.loads(content, parse_float=_parse_float)
+
+
+def decode(content: bytes):
+    """Decodes a JSON document without converting the floats (using orjson if available). Unlike
+       json.loads, orjson returns integers beyond 64 bits as float.
+
+    :param content: The JSON document
+    :type content: bytes or str
+    :return: The decoded document
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except ValueError:
+            # f.e. numbers out of the range of a double (1e400)
+            pass
+
+    return json.loads(content)
+
+
+def round_floats(data, content: bytes):
+    """Rounds the floats of a document returned by `decode` identical to
+       `json.loads(content, parse_float=_parse_float)`. The document is changed in place.
+
+       All floats are checked in a single pass. Most responses only contain floats with up to 8
+       decimal places, which are returned unchanged. Only the floats that need to be rounded are
+       rounded (see _get_replacements). If the rounding of a float depends on a text that cannot
+       be found, the document is decoded again using `json.loads(content, parse_float=_parse_float)`.
+
+    :param data: The decoded document
+    :param content: The JSON document
+    :type content: bytes or str
+    :return: The rounded document
+    """
+    if isinstance(content, str):
+        content = content.encode()
+
+    if isinstance(data, (dict, list)):
+        values, containers = _collect_floats(data)
+    elif isinstance(data, float):
+        values = [data]
+    else:
+        return data
+
+    replacements = _get_replacements(values, content)
+
+    if replacements is None:
+        return _loads_exact(content)
+
+    if replacements:
+        sentinels = sum(1 for index in replacements if values[index] == MAX_JS_FLOAT)
+
+        if sentinels:
+            _LOGGER.warning(f"parsing MAX JS NUMBER returning 0.0 ({sentinels} values)")
+
+        if not isinstance(data, (dict, list)):
+            return replacements[0]
+
+        _replace_floats(values, containers, replacements)
+
+    return data
+
+
+def loads(content: bytes):
+    """Decodes a JSON document identical to `json.loads(content, parse_float=_parse_float)`.
+
+       The document is decoded using orjson (if available) and only the floats that need to be
+       rounded are rounded afterwards (see round_floats). Documents that orjson cannot decode are
+       decoded using `json.loads(content, parse_float=_parse_float)`.
+
+    :param content: The JSON document
+    :type content: bytes or str
+    :return: The decoded document
+    """
+    if isinstance(content, str):
+        content = content.encode()
+
+    try:
+        data = orjson.loads(content) if orjson is not None else json.loads(content)
+    except ValueError:
+        # f.e. numbers out of the range of a double (1e400)
+        return _loads_exact(content)
+
+    return round_floats(data, content)
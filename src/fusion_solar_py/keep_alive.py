@@ -0,0 +1,70 @@
+"""Background tasks keeping a session alive"""
+
+import asyncio
+import logging
+import threading
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class KeepAliveThread(threading.Thread):
+    """Daemon thread calling the client's keep_alive function at a fixed
+    interval. The call is skipped if another request proved that the session
+    is alive within the interval.
+    """
+
+    def __init__(self, client, interval: float = 30):
+        """Create a new KeepAliveThread
+        :param client: The client to keep alive
+        :type client: FusionSolarClient
+        :param interval: Number of seconds between two keep-alive calls
+        :type interval: float
+        """
+        super().__init__(name="fusion_solar_keep_alive", daemon=True)
+        self._client = client
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            keep_alive(self._client, self.interval)
+
+    def stop(self):
+        """Stops the thread after the current call"""
+        self._stop_event.set()
+
+
+async def keep_alive_task(client, interval: float = 30):
+    """Coroutine calling the async client's keep_alive function at a fixed
+    interval until it is cancelled. The call is skipped if another request proved
+    that the session is alive within the interval.
+    :param client: The client to keep alive
+    :type client: AsyncFusionSolarClient
+    :param interval: Number of seconds between two keep-alive calls
+    :type interval: float
+    """
+    while True:
+        await asyncio.sleep(interval)
+        # the synchronous call is processed in the worker pool
+        await client._run(keep_alive, client.client, interval)
+
+
+def keep_alive(client, interval: float):
+    """Calls the client's keep_alive function unless the session was
+    active within the last `interval` seconds. Failures are only logged.
+    Used by KeepAliveThread and keep_alive_task.
+    :param client: The client to keep alive
+    :type client: FusionSolarClient
+    :param interval: Number of seconds
+    :type interval: float
+    """
+    if client.seconds_since_alive() < interval:
+        _LOGGER.debug("Session recently active, skipping keep-alive")
+        return
+
+    try:
+        client.keep_alive()
+    except Exception as e:
+        _LOGGER.warning(f"Keep-alive failed: {e}")
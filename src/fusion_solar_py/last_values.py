@@ -0,0 +1,137 @@
+"""Extraction of the last measurements from the plant stats"""
+
+import logging
+import math
+from array import array
+from typing import Optional
+
+from .exceptions import FusionSolarException
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# value used by get_plant_stats for missing measurements
+MISSING_VALUE = "--"
+
+# fields of get_plant_stats that do not contain measurements
+IGNORED_STATS_KEYS = ("xAxis", "stationTimezone", "clientTimezone", "stationDn")
+
+
+def find_last_index(values: list) -> Optional[int]:
+    """Returns the index of the last value that is not missing ("--"). The list
+       is scanned from the end, so only the trailing missing values are processed.
+    :param values: The values of a key of get_plant_stats
+    :type values: list
+    :return: The index or None if all values are missing
+    :rtype: int
+    """
+    for index in range(len(values) - 1, -1, -1):
+        if values[index] != MISSING_VALUE:
+            return index
+
+    return None
+
+
+class LastValueTable:
+    """Table of the last measurement per plant and key
+
+    The values are stored in a single float array (NaN if no valid value was found)
+    with one row per plant and one column per key.
+    """
+
+    def __init__(self, plant_ids: list, keys: list, values: array, times: list):
+        """Create a new LastValueTable object
+        :param plant_ids: The plants (rows)
+        :type plant_ids: list
+        :param keys: The keys of get_plant_stats (columns)
+        :type keys: list
+        :param values: The values in row-major order
+        :type values: array
+        :param times: The matching measurement times in row-major order (None if no value was found)
+        :type times: list
+        """
+        self.plant_ids = plant_ids
+        self.keys = keys
+        self.values = values
+        self.times = times
+        self._rows = {plant_id: row for row, plant_id in enumerate(plant_ids)}
+        self._columns = {key: column for column, key in enumerate(keys)}
+
+    def _get_index(self, plant_id: str, key: str) -> int:
+        return self._rows[plant_id] * len(self.keys) + self._columns[key]
+
+    def get_value(self, plant_id: str, key: str) -> Optional[float]:
+        """Returns the last value of a key or None if no valid value exists"""
+        value = self.values[self._get_index(plant_id, key)]
+
+        return None if math.isnan(value) else value
+
+    def get(self, plant_id: str, key: str) -> dict:
+        """Returns the last measurement of a key
+        :param plant_id: The plant's id
+        :type plant_id: str
+        :param key: The key (f.e. "productPower")
+        :type key: str
+        :return: A dict with a "value" and "time" as returned by get_last_plant_data
+        :rtype: dict
+        """
+        return {"time": self.times[self._get_index(plant_id, key)], "value": self.get_value(plant_id, key)}
+
+    def to_numpy(self):
+        """Returns the values as 2D numpy array (plants x keys) without copying them"""
+        import numpy as np
+
+        return np.frombuffer(self.values, dtype=np.float64).reshape(len(self.plant_ids), len(self.keys))
+
+    def __len__(self):
+        return len(self.plant_ids)
+
+    def __repr__(self):
+        return (f"LastValueTable(plants={len(self.plant_ids)}, "
+                f"keys={self.keys})")
+
+
+def extract_last_values(plant_stats: dict, keys: Optional[list] = None) -> LastValueTable:
+    """Extracts the last valid measurement of every key from the stats of multiple plants
+
+    :param plant_stats: Dict with the plant's id as key and the plant's stats (as returned by
+                        get_plant_stats) as value
+    :type plant_stats: dict
+    :param keys: The keys to extract. If not set, all keys containing measurements are used.
+    :type keys: list
+    :return: The last values
+    :rtype: LastValueTable
+    """
+    if keys is None:
+        # keeps the order of the keys
+        keys = list(dict.fromkeys(
+            key for stats in plant_stats.values() for key, values in stats.items()
+            if key not in IGNORED_STATS_KEYS and isinstance(values, list)
+        ))
+
+    values = array("d")
+    times = []
+
+    for plant_id, stats in plant_stats.items():
+        if "xAxis" not in stats:
+            raise FusionSolarException(f"Invalid plant stats passed for {plant_id}.")
+
+        measurement_times = stats["xAxis"]
+
+        for key in keys:
+            key_values = stats.get(key)
+            index = find_last_index(key_values) if isinstance(key_values, list) else None
+            value = math.nan
+
+            if index is not None:
+                try:
+                    value = float(key_values[index])
+                except (TypeError, ValueError):
+                    _LOGGER.debug(f"Failed to parse {key} = {key_values[index]} of {plant_id}")
+                    index = None
+
+            values.append(value)
+            times.append(measurement_times[index] if index is not None else None)
+
+    return LastValueTable(list(plant_stats.keys()), keys, values, times)
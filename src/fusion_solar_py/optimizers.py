@@ -0,0 +1,169 @@
+"""Optimizer stats of multiple inverters as numpy arrays (see get_optimizer_stats_bulk)"""
+
+import logging
+import threading
+from typing import Optional
+
+from .columnar import np, to_float_array
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# numeric fields of get_optimizer_stats
+OPTIMIZER_METRICS = ("outputPower", "inputVoltage", "inputCurrent", "temperature")
+
+
+def get_optimizer_dn(inverter_dn: str, optimizer: dict) -> str:
+    """Returns the id of an optimizer as used by the topology index"""
+    return optimizer.get("dn", f"{inverter_dn}/{optimizer.get('optName')}")
+
+
+class OptimizerIndex:
+    """Assigns every optimizer a fixed position. New optimizers are appended, so
+       the position of an optimizer does not change between polls.
+
+       The index can be shared between threads.
+    """
+
+    def __init__(self):
+        self.optimizer_dns = []
+        self.inverter_dns = []
+        self.names = []
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def get_position(self, optimizer_dn: str) -> Optional[int]:
+        """Returns the position of an optimizer or None if it is unknown"""
+        return self._positions.get(optimizer_dn)
+
+    def add(self, inverter_dn: str, optimizer: dict) -> int:
+        """Returns the position of an optimizer. Unknown optimizers are appended.
+        :param inverter_dn: The inverter's id
+        :type inverter_dn: str
+        :param optimizer: The optimizer as returned by get_optimizer_stats
+        :type optimizer: dict
+        :return: The position
+        :rtype: int
+        """
+        optimizer_dn = get_optimizer_dn(inverter_dn, optimizer)
+        position = self._positions.get(optimizer_dn)
+
+        if position is None:
+            with self._lock:
+                position = self._positions.get(optimizer_dn)
+
+                if position is None:
+                    position = len(self.optimizer_dns)
+                    self.optimizer_dns.append(optimizer_dn)
+                    self.inverter_dns.append(inverter_dn)
+                    self.names.append(optimizer.get("optName"))
+                    self._positions[optimizer_dn] = position
+
+        return position
+
+    def __len__(self):
+        return len(self.optimizer_dns)
+
+
+class OptimizerTable:
+    """Stats of all optimizers of a plant
+
+    Every metric is a float64 array with one value per optimizer of the OptimizerIndex
+    (NaN if the optimizer did not report a value).
+    """
+
+    def __init__(self, index: OptimizerIndex, columns: dict, errors: dict):
+        """Create a new OptimizerTable object
+        :param index: The positions of the optimizers
+        :type index: OptimizerIndex
+        :param columns: Dict with the metric as key and the values as numpy array
+        :type columns: dict
+        :param errors: Dict with the inverter's id as key and the exception raised while
+                       retrieving its optimizers as value
+        :type errors: dict
+        """
+        size = len(next(iter(columns.values()))) if columns else len(index)
+
+        self.optimizer_dns = index.optimizer_dns[:size]
+        self.inverter_dns = index.inverter_dns[:size]
+        self.names = index.names[:size]
+        self.columns = columns
+        self.errors = errors
+        self._index = index
+
+        # the inverter of every optimizer as position in `inverters`
+        self.inverters = list(dict.fromkeys(self.inverter_dns))
+        inverter_positions = {inverter_dn: position for position, inverter_dn in enumerate(self.inverters)}
+        self.inverter_codes = np.fromiter(
+            (inverter_positions[inverter_dn] for inverter_dn in self.inverter_dns), dtype=np.int32, count=size
+        )
+
+    def get_position(self, optimizer_dn: str) -> Optional[int]:
+        """Returns the position of an optimizer in the arrays or None if it is unknown"""
+        position = self._index.get_position(optimizer_dn)
+
+        return position if position is not None and position < len(self.optimizer_dns) else None
+
+    def get_inverter_mask(self, inverter_dn: str) -> "np.ndarray":
+        """Returns a boolean array selecting the optimizers of an inverter"""
+        if inverter_dn not in self.inverters:
+            return np.zeros(len(self.optimizer_dns), dtype=bool)
+
+        return self.inverter_codes == self.inverters.index(inverter_dn)
+
+    def __getitem__(self, metric: str) -> "np.ndarray":
+        return self.columns[metric]
+
+    def __len__(self):
+        return len(self.optimizer_dns)
+
+    def __repr__(self):
+        return (f"OptimizerTable(optimizers={len(self.optimizer_dns)}, "
+                f"inverters={len(self.inverters)}, "
+                f"metrics={list(self.columns.keys())})")
+
+
+def create_optimizer_table(optimizer_stats: dict, index: OptimizerIndex, metrics: Optional[list] = None) -> OptimizerTable:
+    """Converts the optimizer stats of multiple inverters into arrays
+
+    :param optimizer_stats: Dict with the inverter's id as key and the result of get_optimizer_stats
+                            (or the raised exception) as value
+    :type optimizer_stats: dict
+    :param index: The positions of the optimizers. Unknown optimizers are added.
+    :type index: OptimizerIndex
+    :param metrics: The fields to convert. Defaults to OPTIMIZER_METRICS.
+    :type metrics: list
+    :return: The table
+    :rtype: OptimizerTable
+    """
+    if metrics is None:
+        metrics = OPTIMIZER_METRICS
+
+    positions = []
+    values = {metric: [] for metric in metrics}
+    errors = {}
+
+    for inverter_dn, optimizers in optimizer_stats.items():
+        if isinstance(optimizers, Exception):
+            # inverters without optimizers return an error
+            _LOGGER.debug(f"No optimizers found for {inverter_dn}: {optimizers}")
+            errors[inverter_dn] = optimizers
+            continue
+
+        for optimizer in optimizers:
+            positions.append(index.add(inverter_dn, optimizer))
+
+            for metric in metrics:
+                values[metric].append(optimizer.get(metric))
+
+    size = len(index)
+    positions = np.asarray(positions, dtype=np.intp)
+    columns = {}
+
+    for metric in metrics:
+        column = np.full(size, np.nan)
+        column[positions] = to_float_array(values[metric])
+        columns[metric] = column
+
+    return OptimizerTable(index, columns, errors)
@@ -0,0 +1,240 @@
+"""Adaptive rate limiting of the requests of an account"""
+
+import json
+import logging
+import threading
+import time
+from typing import Optional
+
+import requests
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# HTTP status codes that indicate too many requests
+THROTTLING_STATUS_CODES = (429,)
+
+# failCode of FusionSolar responses that indicates too many requests (ACCESS_FREQUENCY_IS_TOO_HIGH)
+THROTTLING_FAIL_CODES = (407,)
+
+# limiters shared by all clients of an account (see get_rate_limiter)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# semaphores limiting the parallel requests of an account (see get_request_semaphore)
+_semaphores = {}
+
+
+class AdaptiveRateLimiter:
+    """Token bucket limiting the requests per second
+
+    The rate is reduced (multiplied by `backoff_factor`) whenever FusionSolar responds with
+    429, a server error or a failure code, and slowly increased again (by `recovery_step`
+    per successful response) up to `max_rate`.
+
+    The limiter can be shared between threads. A thread calling `acquire` blocks until
+    a token is available.
+    """
+
+    def __init__(
+        self, rate: float = 5.0, burst: int = 5, min_rate: float = 0.2, max_rate: Optional[float] = None,
+        backoff_factor: float = 0.5, recovery_step: float = 0.05, fail_codes: tuple = THROTTLING_FAIL_CODES
+    ):
+        """Create a new AdaptiveRateLimiter
+        :param rate: The initial number of requests per second
+        :type rate: float
+        :param burst: The maximum number of requests sent at once after a pause
+        :type burst: int
+        :param min_rate: The lowest rate the limiter backs off to
+        :type min_rate: float
+        :param max_rate: The highest rate the limiter recovers to. Defaults to the initial rate.
+        :type max_rate: float
+        :param backoff_factor: Factor the rate is multiplied with on a throttled or failed response
+        :type backoff_factor: float
+        :param recovery_step: Requests per second the rate is increased by after a successful response
+        :type recovery_step: float
+        :param fail_codes: The failCodes of FusionSolar responses that are treated as throttling
+        :type fail_codes: tuple
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.fail_codes = fail_codes
+
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_backoff = 0.0
+        self._waiting = 0
+        self._throttled = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current number of requests per second"""
+        return self._rate
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of threads currently waiting for a token"""
+        return self._waiting
+
+    @property
+    def throttled(self) -> int:
+        """The number of throttled or failed responses"""
+        return self._throttled
+
+    def _refill(self, now: float):
+        """Adds the tokens for the time since the last update. Must be called with the lock held."""
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Waits until a request may be sent
+        :param timeout: The maximum number of seconds to wait. None waits forever.
+        :type timeout: float
+        :return: True if a request may be sent, False if the timeout expired
+        :rtype: bool
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            self._waiting += 1
+
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+
+                    wait = max(self._paused_until - now, (1 - self._tokens) / self._rate)
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        return False
+
+                    wait = min(wait, remaining)
+
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def backoff(self, retry_after: Optional[float] = None):
+        """Reduces the rate after a throttled or failed request. Multiple failures within
+           the interval of a single request (f.e. of parallel requests) only reduce the rate once.
+        :param retry_after: If set, no request is sent for this number of seconds
+        :type retry_after: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._throttled += 1
+
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+            if now - self._last_backoff < 1 / self._rate:
+                return
+
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate * self.backoff_factor)
+            # the tokens collected at the old rate are dropped
+            self._tokens = min(self._tokens, 0.0)
+            self._last_backoff = now
+
+        _LOGGER.warning(f"Requests are throttled, reducing the rate to {self._rate:.2f} requests/s")
+
+    def recover(self):
+        """Increases the rate after a successful request"""
+        if self._rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(self.max_rate, self._rate + self.recovery_step)
+
+    def record_response(self, response: requests.Response):
+        """Adapts the rate based on a response"""
+        if response.status_code in THROTTLING_STATUS_CODES or response.status_code >= 500:
+            self.backoff(_get_retry_after(response))
+        elif self._is_failure_response(response):
+            self.backoff()
+        else:
+            self.recover()
+
+    def _is_failure_response(self, response: requests.Response) -> bool:
+        """Whether the response contains one of the fail codes. The body is only
+           decoded if it contains a failCode."""
+        if not self.fail_codes or b'"failCode"' not in response.content:
+            return False
+
+        try:
+            return json.loads(response.content).get("failCode") in self.fail_codes
+        except (ValueError, AttributeError):
+            return False
+
+    def __repr__(self):
+        return (f"AdaptiveRateLimiter(rate={self._rate:.2f}, "
+                f"queue_depth={self._waiting}, "
+                f"throttled={self._throttled})")
+
+
+def _get_retry_after(response: requests.Response) -> Optional[float]:
+    """Returns the seconds of the Retry-After header (if set)"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def get_rate_limiter(username: str, huawei_subdomain: str, **kwargs) -> AdaptiveRateLimiter:
+    """Returns the rate limiter of an account. All clients of the account and subdomain
+       in this process share the same limiter.
+    :param username: The account's username
+    :type username: str
+    :param huawei_subdomain: The subdomain
+    :type huawei_subdomain: str
+    :param kwargs: The settings of the limiter (see AdaptiveRateLimiter), only used if it does not exist yet
+    :return: The limiter
+    :rtype: AdaptiveRateLimiter
+    """
+    with _limiters_lock:
+        limiter = _limiters.get((username, huawei_subdomain))
+
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(**kwargs)
+            _limiters[(username, huawei_subdomain)] = limiter
+
+        return limiter
+
+
+def get_request_semaphore(username: str, huawei_subdomain: str, max_concurrent_requests: int) -> threading.BoundedSemaphore:
+    """Returns the semaphore limiting the parallel requests of an account. All clients of
+       the account and subdomain in this process share the same semaphore.
+    :param username: The account's username
+    :type username: str
+    :param huawei_subdomain: The subdomain
+    :type huawei_subdomain: str
+    :param max_concurrent_requests: Maximum number of parallel requests, only used if the semaphore does not exist yet
+    :type max_concurrent_requests: int
+    :return: The semaphore
+    :rtype: threading.BoundedSemaphore
+    """
+    with _limiters_lock:
+        semaphore = _semaphores.get((username, huawei_subdomain))
+
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(max_concurrent_requests)
+            _semaphores[(username, huawei_subdomain)] = semaphore
+
+        return semaphore
@@ -0,0 +1,518 @@
+"""Decoding of the device-realtime-data responses (see get_real_time_data)"""
+
+import json
+import logging
+import math
+import re
+import threading
+from array import array
+from operator import itemgetter
+from typing import Optional, Union
+
+from .exceptions import FusionSolarException
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# values used by FusionSolar for missing measurements
+MISSING_VALUES = frozenset(("-", "--", "", "N/A"))
+
+# maximum number of different signal layouts kept per schema
+MAX_LAYOUTS = 16
+
+# lookup tables replacing the missing values (used with dict.get(value, value))
+_MISSING_TO_NAN = {value: "nan" for value in MISSING_VALUES}
+_MISSING_TO_NAN[None] = "nan"
+_MISSING_TO_NONE = {value: None for value in MISSING_VALUES}
+_RAW_MISSING_TO_NAN = {value.encode(): b"nan" for value in MISSING_VALUES}
+
+# the ids and realValues of the signals in the order of a response. Only used for
+# layouts that were verified against the decoded response (see RealtimeSchema._add_raw_layout).
+_RAW_ID_PATTERN = re.compile(rb'"id":\s*(-?\d+)')
+_RAW_VALUE_PATTERN = re.compile(rb'"realValue":\s*"([^"\\]*)"')
+
+_NUMERIC = "numeric"
+_TEXT = "text"
+
+_get_id = itemgetter("id")
+_get_real_value = itemgetter("realValue")
+
+
+def _get_signals(payload: dict) -> list:
+    """Returns the signals of all groups of a response and raises an exception for failed requests"""
+    if not payload.get("success") or "data" not in payload:
+        raise FusionSolarException("Invalid real time data passed.")
+
+    return [signal for group in payload["data"] for signal in group.get("signals", ())]
+
+
+def _get_kind(value) -> Optional[str]:
+    """Returns whether a realValue is a number or text. Missing values return None."""
+    if value is None or value in MISSING_VALUES:
+        return None
+
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return _TEXT
+
+    return _NUMERIC
+
+
+def _create_getter(positions: list):
+    """Returns a function returning the items at the positions as tuple"""
+    if len(positions) == 1:
+        position = positions[0]
+        return lambda items: (items[position],)
+    if not positions:
+        return lambda items: ()
+
+    return itemgetter(*positions)
+
+
+class _Layout:
+    """Positions of the schema's signals in responses containing the same signals in
+       the same order. Pairs of ids and getters are replaced together, so that a thread
+       never sees a getter that does not match the ids."""
+
+    __slots__ = ("signal_ids", "version", "get_numeric", "text", "unknown")
+
+    def __init__(self, signal_ids: tuple):
+        self.signal_ids = signal_ids
+        self.version = -1
+        self.get_numeric = None
+        self.text = ((), None)
+        self.unknown = ((), None)
+
+
+class RealtimeValues:
+    """The decoded real time data of a device
+
+    Numeric values are stored in a float array in the order of the schema's
+    `array_signal_ids` (NaN for missing values). Text values are stored in a dict.
+    """
+
+    __slots__ = ("schema", "values", "text")
+
+    def __init__(self, schema: "RealtimeSchema", values: array, text: dict):
+        """Create a new RealtimeValues object
+        :param schema: The schema of the device type
+        :type schema: RealtimeSchema
+        :param values: The numeric values
+        :type values: array
+        :param text: Dict with the signal's id as key and the text (None if missing) as value
+        :type text: dict
+        """
+        self.schema = schema
+        self.values = values
+        self.text = text
+
+    def get(self, signal_id, default=None):
+        """Returns the value of a signal. Numeric values are returned as float, text as
+           str and missing values as None.
+        """
+        index = self.schema.get_index(signal_id)
+
+        if index is not None and index < len(self.values):
+            value = self.values[index]
+            # text reported by a numeric signal is stored in the text values
+            return self.text.get(signal_id) if math.isnan(value) else value
+
+        return self.text.get(signal_id, default)
+
+    def __getitem__(self, signal_id):
+        value = self.get(signal_id, KeyError)
+
+        if value is KeyError:
+            raise KeyError(signal_id)
+
+        return value
+
+    def __contains__(self, signal_id):
+        return self.get(signal_id, KeyError) is not KeyError
+
+    def __repr__(self):
+        return f"RealtimeValues(numeric={len(self.values)}, text={len(self.text)})"
+
+
+class RealtimeSchema:
+    """Signals of a device type
+
+    Every signal is classified by its values: signals with a number as realValue are
+    numeric, the others are text. Numeric signals are assigned a fixed index, which is
+    the position of their value in the arrays returned by `decode_array`. Signals that
+    only had missing values so far are classified once a value is reported. New numeric
+    signals are appended, so the index of a signal never changes.
+
+    The positions of the signals are stored per layout (the ids of a response in their order).
+    Responses with a known layout are decoded without looking up the single signals.
+    """
+
+    __slots__ = ("signal_ids", "names", "units", "array_signal_ids",
+                 "_index", "_kinds", "_layouts", "_version", "_lock")
+
+    def __init__(self):
+        self.signal_ids = []
+        self.names = []
+        self.units = []
+        self.array_signal_ids = []
+
+        self._index = {}
+        self._kinds = {}
+        self._layouts = {}
+        self._version = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "RealtimeSchema":
+        """Creates the schema based on a response of get_real_time_data"""
+        schema = cls()
+        schema._get_layout(_get_signals(payload))
+
+        return schema
+
+    @property
+    def numeric(self) -> list:
+        """Whether the signals (in the order of `signal_ids`) are numeric"""
+        return [self._kinds.get(signal_id) == _NUMERIC for signal_id in self.signal_ids]
+
+    def get_index(self, signal_id) -> Optional[int]:
+        """Returns the index of a signal in the arrays or None if the signal is not
+           part of the schema or not numeric"""
+        return self._index.get(signal_id)
+
+    def _classify(self, signal_ids, values):
+        """Classifies signals that had no value so far. Must be called with the lock held."""
+        changed = False
+
+        for signal_id, value in zip(signal_ids, values):
+            if signal_id in self._kinds:
+                continue
+
+            kind = _get_kind(value)
+
+            if kind is None:
+                continue
+
+            self._kinds[signal_id] = kind
+            changed = True
+
+            if kind == _NUMERIC:
+                self._index[signal_id] = len(self.array_signal_ids)
+                self.array_signal_ids.append(signal_id)
+
+        if changed:
+            self._version += 1
+
+    def _get_layout(self, signals: list) -> _Layout:
+        """Returns the layout of decoded signals. Unknown signals are added to the schema."""
+        signal_ids = tuple(map(_get_id, signals))
+        layout = self._layouts.get(signal_ids)
+
+        if layout is not None:
+            return layout
+
+        with self._lock:
+            known_ids = set(self.signal_ids)
+
+            for signal in signals:
+                if signal["id"] not in known_ids:
+                    known_ids.add(signal["id"])
+                    self.signal_ids.append(signal["id"])
+                    self.names.append(signal.get("name"))
+                    self.units.append(signal.get("unit") or "")
+
+            self._classify(signal_ids, [signal.get("realValue") for signal in signals])
+
+            layout = _Layout(signal_ids)
+
+            if len(self._layouts) < MAX_LAYOUTS:
+                self._layouts[signal_ids] = layout
+
+        return layout
+
+    def _add_raw_layout(self, raw_ids: list, raw_values: list, signals: list, layout: _Layout) -> bool:
+        """Stores the layout for the ids and values found in the response's content, if they
+           are identical to the decoded signals"""
+        if len(raw_ids) != len(signals) or len(raw_values) != len(signals):
+            return False
+
+        for raw_id, raw_value, signal in zip(raw_ids, raw_values, signals):
+            value = signal.get("realValue")
+
+            if raw_id != str(signal["id"]).encode() or not isinstance(value, str) or raw_value != value.encode():
+                return False
+
+        with self._lock:
+            if len(self._layouts) < MAX_LAYOUTS:
+                self._layouts[tuple(raw_ids)] = layout
+
+        return True
+
+    def _update_layout(self, layout: _Layout):
+        """Updates the positions of a layout after new signals were classified"""
+        with self._lock:
+            if layout.version == self._version:
+                return
+
+            positions = {}
+            for position, signal_id in enumerate(layout.signal_ids):
+                positions.setdefault(signal_id, position)
+
+            # numeric signals missing in the layout read the NaN appended to the values
+            missing_position = len(layout.signal_ids)
+            layout.get_numeric = _create_getter([
+                positions.get(signal_id, missing_position) for signal_id in self.array_signal_ids
+            ])
+
+            text_ids = [signal_id for signal_id in positions if self._kinds.get(signal_id) == _TEXT]
+            layout.text = (text_ids, _create_getter([positions[signal_id] for signal_id in text_ids]))
+
+            unknown_ids = [signal_id for signal_id in positions if signal_id not in self._kinds]
+            layout.unknown = (unknown_ids, _create_getter([positions[signal_id] for signal_id in unknown_ids]))
+
+            layout.version = self._version
+
+    def _decode_values(self, layout: _Layout, values: list, raw: bool, include_text: bool = True) -> RealtimeValues:
+        """Converts the realValues of a response with the passed layout
+        :param layout: The layout of the response
+        :param values: The realValues in the order of the layout
+        :param raw: Whether the values are the bytes of the response's content
+        :param include_text: If not set, only the numeric values are converted
+        """
+        if layout.version != self._version:
+            self._update_layout(layout)
+
+        unknown_ids, get_unknown = layout.unknown
+
+        if unknown_ids:
+            unknown_values = get_unknown(values)
+
+            # signals that only had missing values so far
+            if any(value not in _RAW_MISSING_TO_NAN if raw else value not in _MISSING_TO_NAN for value in unknown_values):
+                with self._lock:
+                    self._classify(unknown_ids, [value.decode() if raw else value for value in unknown_values])
+
+                self._update_layout(layout)
+
+        missing_to_nan = _RAW_MISSING_TO_NAN if raw else _MISSING_TO_NAN
+        numeric_values = layout.get_numeric(values + [b"nan" if raw else "nan"])
+        text = {}
+
+        try:
+            numbers = array("d", list(map(float, map(missing_to_nan.get, numeric_values, numeric_values))))
+        except (TypeError, ValueError):
+            numbers = self._parse_slow(numeric_values, raw, text)
+
+        if include_text:
+            text_ids, get_text = layout.text
+            text_values = get_text(values)
+
+            if raw:
+                text_values = [value.decode() for value in text_values]
+
+            text.update(zip(text_ids, map(_MISSING_TO_NONE.get, text_values, text_values)))
+            text.update(dict.fromkeys(layout.unknown[0]))
+
+        return RealtimeValues(self, numbers, text)
+
+    def _parse_slow(self, numeric_values: tuple, raw: bool, text: dict) -> array:
+        """Converts the numeric values one by one. Values that are not a number are NaN
+           and added to `text`."""
+        numbers = array("d", [math.nan]) * len(numeric_values)
+
+        for index, value in enumerate(numeric_values):
+            if value is None:
+                continue
+
+            if raw:
+                value = value.decode()
+
+            if value in MISSING_VALUES:
+                continue
+
+            try:
+                numbers[index] = float(value)
+            except (TypeError, ValueError):
+                # f.e. text in a numeric signal
+                text[self.array_signal_ids[index]] = value
+
+        return numbers
+
+    def decode(self, payload: Union[dict, bytes]) -> RealtimeValues:
+        """Converts a response into numeric and text values
+        :param payload: The response of get_real_time_data or the content of the response
+        :type payload: dict or bytes
+        :return: The values
+        :rtype: RealtimeValues
+        """
+        return self._decode(payload)
+
+    def decode_array(self, payload: Union[dict, bytes]) -> array:
+        """Converts a response into a float array in the order of `array_signal_ids`. Missing
+           values and numeric signals of the schema missing in the response are NaN, signals
+           that are not numeric are ignored.
+        :param payload: The response of get_real_time_data or the content of the response
+        :type payload: dict or bytes
+        :return: The values
+        :rtype: array
+        """
+        return self._decode(payload, include_text=False).values
+
+    def _decode(self, payload: Union[dict, bytes], raw_ids: Optional[list] = None, include_text: bool = True,
+                decoded: Optional[dict] = None) -> RealtimeValues:
+        """Decodes a response or its content
+        :param raw_ids: The ids found in the content, if they were already searched
+        :param include_text: If not set, only the numeric values are converted
+        :param decoded: The parsed content, if it was already parsed
+        """
+        if isinstance(payload, dict):
+            signals = _get_signals(payload)
+            return self._decode_values(self._get_layout(signals), list(map(_get_real_value, signals)), False, include_text)
+
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        if raw_ids is None:
+            raw_ids = _RAW_ID_PATTERN.findall(payload)
+        raw_values = _RAW_VALUE_PATTERN.findall(payload)
+
+        layout = self._layouts.get(tuple(raw_ids))
+
+        if layout is not None and len(raw_values) == len(raw_ids):
+            return self._decode_values(layout, raw_values, True, include_text)
+
+        # unknown layout or values that are not simple strings
+        signals = _get_signals(json.loads(payload) if decoded is None else decoded)
+        layout = self._get_layout(signals)
+        self._add_raw_layout(raw_ids, raw_values, signals, layout)
+
+        return self._decode_values(layout, [signal.get("realValue") for signal in signals], False, include_text)
+
+    def __len__(self):
+        return len(self.signal_ids)
+
+    def __repr__(self):
+        return (f"RealtimeSchema(signals={len(self.signal_ids)}, "
+                f"numeric={len(self.array_signal_ids)})")
+
+
+class RealtimeDecoder:
+    """Decodes the real time data of multiple devices. The schema of a device type is
+       created from the first response and extended by further responses.
+
+       The decoder can be shared between threads.
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def get_schema(self, device_type, payload: Optional[dict] = None) -> Optional[RealtimeSchema]:
+        """Returns the schema of a device type
+        :param device_type: The device type (f.e. the "type" of get_device_ids)
+        :param payload: A response of the device type. If set, the schema is created if it does not exist yet.
+        :type payload: dict
+        :return: The schema or None if it does not exist
+        :rtype: RealtimeSchema
+        """
+        schema = self._schemas.get(device_type)
+
+        if schema is None and payload is not None:
+            with self._lock:
+                schema = self._schemas.get(device_type)
+
+                if schema is None:
+                    schema = RealtimeSchema.from_payload(payload)
+                    self._schemas[device_type] = schema
+                    _LOGGER.debug(f"Created real time schema for {device_type} with {len(schema)} signals")
+
+        return schema
+
+    def _decode(self, payload: Union[dict, bytes], device_type, include_text: bool) -> RealtimeValues:
+        if device_type is not None:
+            schema = self._schemas.get(device_type)
+
+            decoded = None
+
+            if schema is None:
+                decoded = payload if isinstance(payload, dict) else json.loads(payload)
+                schema = self.get_schema(device_type, decoded)
+
+            return schema._decode(payload, include_text=include_text, decoded=decoded)
+
+        # without a device type, the schema is identified by the signals of the response
+        if isinstance(payload, dict):
+            return self.get_schema(tuple(map(_get_id, _get_signals(payload))), payload)._decode(
+                payload, include_text=include_text
+            )
+
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        raw_ids = _RAW_ID_PATTERN.findall(payload)
+        schema = self._schemas.get(tuple(raw_ids))
+        decoded = None
+
+        if schema is None:
+            decoded = json.loads(payload)
+            schema = self.get_schema(tuple(map(_get_id, _get_signals(decoded))), decoded)
+
+            with self._lock:
+                self._schemas.setdefault(tuple(raw_ids), schema)
+
+        return schema._decode(payload, raw_ids=raw_ids, include_text=include_text, decoded=decoded)
+
+    def decode(self, payload: Union[dict, bytes], device_type=None) -> RealtimeValues:
+        """Converts a response into numeric and text values (see RealtimeSchema.decode)
+        :param payload: The response of get_real_time_data or the content of the response
+        :type payload: dict or bytes
+        :param device_type: The device's type. If not set, the signals of the response identify the schema.
+        :return: The values
+        :rtype: RealtimeValues
+        """
+        return self._decode(payload, device_type, True)
+
+    def decode_array(self, payload: Union[dict, bytes], device_type=None) -> array:
+        """Converts a response into a float array (see RealtimeSchema.decode_array)
+        :param payload: The response of get_real_time_data or the content of the response
+        :type payload: dict or bytes
+        :param device_type: The device's type. If not set, the signals of the response identify the schema.
+        :return: The values
+        :rtype: array
+        """
+        return self._decode(payload, device_type, False).values
+
+    def decode_batch(self, payloads: dict, device_type=None) -> dict:
+        """Converts the responses of multiple devices of the same type into float arrays
+        :param payloads: Dict with the device's id as key and the response (f.e. of
+                         get_real_time_data_bulk) as value
+        :type payloads: dict
+        :param device_type: The devices' type. If not set, the signals of every response
+                            identify the schema.
+        :return: Dict with the device's id as key and the array as value. If a response is invalid,
+                 the value is the raised exception.
+        :rtype: dict
+        """
+        results = {}
+
+        for device_dn, payload in payloads.items():
+            if isinstance(payload, Exception):
+                results[device_dn] = payload
+                continue
+
+            try:
+                results[device_dn] = self.decode_array(payload, device_type)
+            except Exception as exc:
+                results[device_dn] = exc
+
+        return results
+
+    def clear(self):
+        """Removes all schemas"""
+        with self._lock:
+            self._schemas = {}
+
+    def __len__(self):
+        return len(set(map(id, self._schemas.values())))
@@ -0,0 +1,91 @@
+"""Storage backends to persist sessions between processes"""
+
+import json
+import logging
+import os
+import tempfile
+
+import requests
+
+from .interfaces import SessionStore
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class FileSessionStore(SessionStore):
+    """Saves the session state as a JSON file. Since the file contains
+    the session cookies, it is only readable by the current user.
+    """
+
+    def __init__(self, path: str):
+        """Create a new FileSessionStore
+        :param path: Path to the JSON file
+        :type path: str
+        """
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "r") as reader:
+                return json.load(reader)
+        except (OSError, ValueError) as e:
+            _LOGGER.warning(f"Failed to load session from {self.path}: {e}")
+            return None
+
+    def save(self, state: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        # write to a temporary file first to never leave a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".session_")
+        try:
+            with os.fdopen(fd, "w") as writer:
+                json.dump(state, writer)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def export_cookies(cookies: requests.cookies.RequestsCookieJar) -> list:
+    """Converts the cookies of a session into a JSON serializable list
+    :param cookies: The session's cookies
+    :type cookies: requests.cookies.RequestsCookieJar
+    :return: A list of dicts
+    :rtype: list
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expires": cookie.expires,
+        }
+        for cookie in cookies
+    ]
+
+
+def import_cookies(cookies: requests.cookies.RequestsCookieJar, cookie_list: list):
+    """Adds the cookies created by `export_cookies` to the cookie jar
+    :param cookies: The cookie jar to add the cookies to
+    :type cookies: requests.cookies.RequestsCookieJar
+    :param cookie_list: The list of exported cookies
+    :type cookie_list: list
+    """
+    for cookie in cookie_list:
+        cookies.set(
+            cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"],
+            secure=cookie["secure"], expires=cookie["expires"]
+        )
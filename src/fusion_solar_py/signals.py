@@ -0,0 +1,173 @@
+"""Registry of the battery module signals (see signals.md)"""
+
+import logging
+from typing import Optional
+
+from .constants import MODULE_SIGNAL_DEFINITIONS, MODULE_SIGNALS
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# values used by FusionSolar for missing measurements
+MISSING_VALUES = ("-", "--", "")
+
+
+class SignalDefinition:
+    """Class representing the description of a signal"""
+
+    __slots__ = ("signal_id", "module_id", "name", "unit", "values")
+
+    def __init__(self, signal_id: str, module_id: str, name: str, unit: Optional[str] = None,
+                 values: Optional[dict] = None):
+        """Create a new SignalDefinition object
+        :param signal_id: The signal's id
+        :type signal_id: str
+        :param module_id: The battery module's id
+        :type module_id: str
+        :param name: The signal's name (f.e. "[DC/DC] SOC")
+        :type name: str
+        :param unit: The signal's unit. None for text and enum signals.
+        :type unit: str
+        :param values: Dict with the possible (int) values as key and their meaning as value. None
+                       if the signal is not an enum.
+        :type values: dict
+        """
+        self.signal_id = signal_id
+        self.module_id = module_id
+        self.name = name
+        self.unit = unit
+        self.values = values
+
+    def decode(self, value):
+        """Converts a raw value of the signal. Missing values are returned as None.
+        :param value: The raw value as returned by the API
+        :return: The meaning (str) for enum signals, a float for signals with a unit, and
+                 the unchanged value for all other signals
+        """
+        if value is None or value in MISSING_VALUES:
+            return None
+
+        try:
+            if self.values is not None:
+                return self.values.get(int(value), value)
+
+            if self.unit is not None:
+                return float(value)
+        except (TypeError, ValueError):
+            _LOGGER.debug(f"Failed to decode {self.name} = {value}")
+            return None
+
+        return value
+
+    def __repr__(self):
+        return (f"SignalDefinition(signal_id={self.signal_id}, "
+                f"module_id={self.module_id}, "
+                f"name={self.name}, "
+                f"unit={self.unit})")
+
+
+class SignalRegistry:
+    """Index of the signal definitions by id, module and name"""
+
+    def __init__(self, definitions: list):
+        """Create a new SignalRegistry
+        :param definitions: The signals as SignalDefinition objects
+        :type definitions: list
+        """
+        self._by_id = {}
+        self._by_module = {}
+        self._by_name = {}
+
+        for definition in definitions:
+            self._by_id[definition.signal_id] = definition
+            self._by_module.setdefault(definition.module_id, {})[definition.signal_id] = definition
+            self._by_name.setdefault(definition.name, {})[definition.module_id] = definition.signal_id
+
+    def get(self, signal_id: str) -> Optional[SignalDefinition]:
+        """Returns the definition of a signal or None if the signal is unknown"""
+        return self._by_id.get(str(signal_id))
+
+    def get_signal_ids(self, module_id: str) -> list:
+        """Returns the ids of all signals of a battery module"""
+        return list(self._by_module.get(str(module_id), {}).keys())
+
+    def is_module_signal(self, module_id: str, signal_id: str) -> bool:
+        """Whether the signal belongs to the battery module"""
+        return str(signal_id) in self._by_module.get(str(module_id), {})
+
+    def get_unknown_signals(self, module_id: str, signal_ids: list) -> list:
+        """Returns the passed signal ids that do not belong to the battery module"""
+        module_signals = self._by_module.get(str(module_id), {})
+
+        return [signal_id for signal_id in signal_ids if str(signal_id) not in module_signals]
+
+    def find(self, name: str, module_id: Optional[str] = None):
+        """Returns the id of a signal by its name
+        :param name: The signal's name as listed in signals.md (f.e. "[DC/DC] SOC")
+        :type name: str
+        :param module_id: If set, the id of the signal of this module is returned
+        :type module_id: str
+        :return: The signal's id if module_id is set (None if not found), otherwise a dict
+                 with the module's id as key and the signal's id as value
+        :rtype: str or dict
+        """
+        signal_ids = self._by_name.get(name, {})
+
+        if module_id is not None:
+            return signal_ids.get(str(module_id))
+
+        return dict(signal_ids)
+
+    def decode(self, values: dict) -> dict:
+        """Converts the raw values of multiple signals (see SignalDefinition.decode)
+        :param values: Dict with the signal's id as key and the raw value as value
+        :type values: dict
+        :return: Dict with the signal's id as key and the converted value as value. Unknown
+                 signals are returned unchanged.
+        :rtype: dict
+        """
+        decoded = {}
+
+        for signal_id, value in values.items():
+            definition = self._by_id.get(str(signal_id))
+            decoded[signal_id] = definition.decode(value) if definition is not None else value
+
+        return decoded
+
+    def decode_signals(self, signals: list) -> dict:
+        """Converts the signals as returned by get_battery_module_stats in a single pass
+        :param signals: The signals as list of dicts with an "id" and a "realValue"
+        :type signals: list
+        :return: Dict with the signal's id (str) as key and the converted value as value
+        :rtype: dict
+        """
+        decoded = {}
+
+        for signal in signals:
+            signal_id = str(signal["id"])
+            value = signal.get("realValue")
+            definition = self._by_id.get(signal_id)
+            decoded[signal_id] = definition.decode(value) if definition is not None else value
+
+        return decoded
+
+    def __contains__(self, signal_id: str) -> bool:
+        return str(signal_id) in self._by_id
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+def _create_module_registry() -> SignalRegistry:
+    definitions = []
+
+    for module_id, signal_ids in MODULE_SIGNALS.items():
+        for signal_id, (name, unit, values) in zip(signal_ids, MODULE_SIGNAL_DEFINITIONS):
+            definitions.append(SignalDefinition(signal_id, module_id, name, unit, values))
+
+    return SignalRegistry(definitions)
+
+
+# created once when the module is imported
+MODULE_SIGNAL_REGISTRY = _create_module_registry()
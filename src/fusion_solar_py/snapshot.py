@@ -0,0 +1,141 @@
+"""Retrieves all data of a plant with concurrent requests"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .exceptions import FusionSolarException
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class PlantSnapshot:
+    """Class representing all data of a plant retrieved at one time"""
+
+    def __init__(self, plant_id: str, results: dict, errors: dict, timings: dict):
+        """Create a new PlantSnapshot object
+        :param plant_id: The plant's id
+        :type plant_id: str
+        :param results: The retrieved data per endpoint
+        :type results: dict
+        :param errors: The exception raised per failed endpoint
+        :type errors: dict
+        :param timings: The duration in seconds per endpoint
+        :type timings: dict
+        """
+        self.plant_id = plant_id
+        self.current_data = results.get("current_data")
+        self.stats = results.get("stats")
+        self.flow = results.get("flow")
+        self.battery_ids = results.get("battery_ids", [])
+        self.battery_status = results.get("battery_status", {})
+        self.devices = results.get("devices")
+        self.optimizer_stats = results.get("optimizer_stats", {})
+        self.errors = errors
+        self.timings = timings
+
+    def __repr__(self):
+        return (f"PlantSnapshot(plant_id={self.plant_id}, "
+                f"battery_ids={self.battery_ids}, "
+                f"errors={list(self.errors.keys())}, "
+                f"timings={self.timings})")
+
+
+def run_task_graph(tasks: dict) -> tuple:
+    """Runs the passed tasks as soon as all their dependencies are available.
+       Independent tasks are run in parallel.
+
+    :param tasks: A dict with the task name as key and a (dependencies, function) tuple
+                  as value. The function is called with a dict holding the dependencies'
+                  results.
+    :type tasks: dict
+    :return: A (results, errors, timings) tuple of dicts with the task name as key. Tasks
+             of which a dependency failed are not run.
+    :rtype: tuple
+    """
+    results, errors, timings = {}, {}, {}
+    pending = dict(tasks)
+    running = {}
+
+    def run_task(name, func, dependencies):
+        start = time.perf_counter()
+        try:
+            return func(dependencies)
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+        while pending or running:
+            for name, (dependencies, func) in list(pending.items()):
+                failed = [dependency for dependency in dependencies if dependency in errors]
+
+                if failed:
+                    del pending[name]
+                    errors[name] = FusionSolarException(f"Dependency {failed[0]} failed")
+                elif all(dependency in results for dependency in dependencies):
+                    del pending[name]
+                    future = executor.submit(
+                        run_task, name, func, {dependency: results[dependency] for dependency in dependencies}
+                    )
+                    running[future] = name
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Unresolvable dependencies for {list(pending.keys())}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    _LOGGER.debug(f"Failed to retrieve {name}: {e}")
+                    errors[name] = e
+
+    return results, errors, timings
+
+
+def create_plant_snapshot(client, plant_id: str, include_optimizers: bool = False) -> PlantSnapshot:
+    """Retrieves all data of a plant. Independent requests are sent in parallel
+       and every endpoint is only requested once.
+
+    :param client: The client to use
+    :type client: FusionSolarClient
+    :param plant_id: The plant's id
+    :type plant_id: str
+    :param include_optimizers: If set, the stats of all optimizers of the plant's inverters are retrieved as well
+    :type include_optimizers: bool
+    :return: The snapshot
+    :rtype: PlantSnapshot
+    """
+    def limited(func, *args, **kwargs):
+        with client._request_semaphore:
+            return func(*args, **kwargs)
+
+    tasks = {
+        "current_data": ((), lambda _: limited(client.get_current_plant_data, plant_id)),
+        "stats": ((), lambda _: limited(client.get_plant_stats, plant_id)),
+        "flow": ((), lambda _: limited(client.get_plant_flow, plant_id)),
+        "battery_ids": (("flow", ), lambda r: client._extract_battery_ids(r["flow"])),
+        "battery_status": (
+            ("battery_ids", ), lambda r: client._run_concurrently(client.get_battery_status, r["battery_ids"])
+        ),
+    }
+
+    if include_optimizers:
+        tasks["devices"] = ((), lambda _: limited(client.get_device_ids, parent_dn=plant_id))
+        tasks["optimizer_stats"] = (
+            ("devices", ),
+            lambda r: client._run_concurrently(
+                client.get_optimizer_stats,
+                [device["deviceDn"] for device in r["devices"] if device["type"] == "Inverter"]
+            )
+        )
+
+    results, errors, timings = run_task_graph(tasks)
+
+    return PlantSnapshot(plant_id, results, errors, timings)
@@ -0,0 +1,206 @@
+"""Index of the plants and devices of a company"""
+
+import logging
+import time
+from typing import Optional
+
+from .exceptions import FusionSolarException
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+# types of the nodes that are not returned by the device list
+PLANT_TYPE = "Plant"
+OPTIMIZER_TYPE = "Optimizer"
+
+
+class TopologyNode:
+    """Class representing a plant or device"""
+
+    def __init__(self, dn: str, node_type: str, parent_dn: Optional[str], plant_dn: Optional[str],
+                 name: Optional[str] = None, data: Optional[dict] = None):
+        """Create a new TopologyNode object
+        :param dn: The node's id (f.e. "NE=1234")
+        :type dn: str
+        :param node_type: The node's type (f.e. "Plant", "Inverter", "Dongle")
+        :type node_type: str
+        :param parent_dn: The id of the parent node. None for plants.
+        :type parent_dn: str
+        :param plant_dn: The id of the plant the node belongs to
+        :type plant_dn: str
+        :param name: The node's name (if available)
+        :type name: str
+        :param data: The raw data returned by the API
+        :type data: dict
+        """
+        self.dn = dn
+        self.type = node_type
+        self.parent_dn = parent_dn
+        self.plant_dn = plant_dn
+        self.name = name
+        self.data = data if data is not None else {}
+
+    def __repr__(self):
+        return (f"TopologyNode(dn={self.dn}, "
+                f"type={self.type}, "
+                f"parent_dn={self.parent_dn}, "
+                f"plant_dn={self.plant_dn})")
+
+
+class TopologyIndex:
+    """Lookup tables of all plants and devices of a company
+
+    The index is created once (see crawl_topology) and is not updated afterwards.
+    All lookups are dict based.
+    """
+
+    def __init__(self, nodes: list, battery_ids: Optional[dict] = None, ttl: float = 3600):
+        """Create a new TopologyIndex
+        :param nodes: All plants and devices as TopologyNode objects
+        :type nodes: list
+        :param battery_ids: Dict with the plant's id as key and the battery ids found in the
+                            plant's energy flow as value
+        :type battery_ids: dict
+        :param ttl: Number of seconds the index is valid
+        :type ttl: float
+        """
+        self._by_dn = {}
+        self._by_type = {}
+        self._by_plant = {}
+        self._by_parent = {}
+        self._battery_ids = dict(battery_ids) if battery_ids is not None else {}
+        self.created = time.monotonic()
+        self.ttl = ttl
+
+        for node in nodes:
+            self._by_dn[node.dn] = node
+            self._by_type.setdefault(node.type, []).append(node)
+
+            if node.type != PLANT_TYPE and node.plant_dn is not None:
+                self._by_plant.setdefault(node.plant_dn, []).append(node)
+            if node.parent_dn is not None:
+                self._by_parent.setdefault(node.parent_dn, []).append(node)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the index is older than its TTL"""
+        return time.monotonic() - self.created > self.ttl
+
+    @property
+    def plants(self) -> list:
+        """All plants as TopologyNode objects"""
+        return list(self._by_type.get(PLANT_TYPE, []))
+
+    def get(self, dn: str) -> Optional[TopologyNode]:
+        """Returns the plant or device with the passed id or None if it is unknown"""
+        return self._by_dn.get(dn)
+
+    def get_by_type(self, node_type: str) -> list:
+        """Returns all nodes of the passed type (f.e. "Inverter")"""
+        return list(self._by_type.get(node_type, []))
+
+    def get_by_plant(self, plant_dn: str, node_type: Optional[str] = None) -> list:
+        """Returns the devices of a plant
+        :param plant_dn: The plant's id
+        :type plant_dn: str
+        :param node_type: If set, only devices of this type are returned
+        :type node_type: str
+        :return: The devices as TopologyNode objects
+        :rtype: list
+        """
+        nodes = self._by_plant.get(plant_dn, [])
+
+        if node_type is None:
+            return list(nodes)
+
+        return [node for node in nodes if node.type == node_type]
+
+    def get_children(self, dn: str) -> list:
+        """Returns the direct children of a node (f.e. the optimizers of an inverter)"""
+        return list(self._by_parent.get(dn, []))
+
+    def get_battery_ids(self, plant_dn: str) -> list:
+        """Returns the battery ids of a plant as returned by get_battery_ids"""
+        return list(self._battery_ids.get(plant_dn, []))
+
+    def __contains__(self, dn: str) -> bool:
+        return dn in self._by_dn
+
+    def __len__(self):
+        return len(self._by_dn)
+
+    def __repr__(self):
+        return (f"TopologyIndex(plants={len(self._by_type.get(PLANT_TYPE, []))}, "
+                f"nodes={len(self._by_dn)}, "
+                f"types={sorted(self._by_type.keys())})")
+
+
+def crawl_topology(client, include_optimizers: bool = True, ttl: float = 3600) -> TopologyIndex:
+    """Retrieves all plants, devices, batteries and optimizers of the client's company.
+       Every level is requested concurrently (limited by the client's `max_concurrent_requests`).
+
+    :param client: The client to use
+    :type client: FusionSolarClient
+    :param include_optimizers: If set, the optimizers of all inverters are retrieved as well
+    :type include_optimizers: bool
+    :param ttl: Number of seconds the created index is valid
+    :type ttl: float
+    :return: The index
+    :rtype: TopologyIndex
+    """
+    stations = client.get_all_stations()
+    plant_dns = [station["dn"] for station in stations]
+    nodes = [
+        TopologyNode(station["dn"], PLANT_TYPE, client._company_id, station["dn"], station.get("name"), station)
+        for station in stations
+    ]
+
+    # the device list and the energy flow (batteries) of all plants are requested at once
+    jobs = [("devices", plant_dn) for plant_dn in plant_dns] + [("flow", plant_dn) for plant_dn in plant_dns]
+    functions = {"devices": client.get_device_ids, "flow": client.get_plant_flow}
+    results = client._run_concurrently(lambda job: functions[job[0]](job[1]), jobs)
+
+    battery_ids = {}
+    inverter_dns = []
+
+    for plant_dn in plant_dns:
+        # the topology must be complete, otherwise lookups would silently miss devices
+        for job in (("devices", plant_dn), ("flow", plant_dn)):
+            if isinstance(results[job], Exception):
+                raise FusionSolarException(f"Failed to retrieve the devices of {plant_dn}") from results[job]
+
+        known_dns = set()
+        for device in results[("devices", plant_dn)]:
+            nodes.append(TopologyNode(device["deviceDn"], device["type"], plant_dn, plant_dn, data=device))
+            known_dns.add(device["deviceDn"])
+
+            if device["type"] == "Inverter":
+                inverter_dns.append((plant_dn, device["deviceDn"]))
+
+        battery_ids[plant_dn] = client._extract_battery_ids(results[("flow", plant_dn)])
+
+        # batteries are not necessarily part of the device list
+        for battery_id in battery_ids[plant_dn]:
+            if battery_id not in known_dns:
+                nodes.append(TopologyNode(battery_id, "Battery", plant_dn, plant_dn))
+
+    if include_optimizers and inverter_dns:
+        optimizers = client._run_concurrently(lambda inverter: client.get_optimizer_stats(inverter[1]), inverter_dns)
+
+        for (plant_dn, inverter_dn), optimizer_data in optimizers.items():
+            # inverters without optimizers return an error
+            if isinstance(optimizer_data, Exception):
+                _LOGGER.debug(f"No optimizers found for {inverter_dn}: {optimizer_data}")
+                continue
+
+            for optimizer in optimizer_data:
+                optimizer_dn = optimizer.get("dn", f"{inverter_dn}/{optimizer.get('optName')}")
+                nodes.append(TopologyNode(
+                    optimizer_dn, OPTIMIZER_TYPE, inverter_dn, plant_dn, optimizer.get("optName"), optimizer
+                ))
+
+    index = TopologyIndex(nodes, battery_ids, ttl=ttl)
+    _LOGGER.debug(f"Created {index}")
+
+    return index
@@ -0,0 +1,191 @@
+"""HTTP transport used by the FusionSolarClient"""
+
+import logging
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .ratelimit import AdaptiveRateLimiter
+
+
+# global logger object
+_LOGGER = logging.getLogger(__name__)
+
+
+class TransportConfig:
+    """Settings of the HTTP connection pool"""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        timeout: Optional[Union[float, tuple]] = (10, 60),
+        compression: bool = True,
+        max_retries: int = 0,
+    ):
+        """Create a new TransportConfig object
+        :param pool_connections: The number of hosts connection pools are kept for
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections kept open per host
+        :type pool_maxsize: int
+        :param keep_alive: If set, connections are reused for further requests
+        :type keep_alive: bool
+        :param timeout: Default timeout in seconds as used by requests, either a single
+                        value or a (connect timeout, read timeout) tuple. None disables the timeout.
+        :type timeout: float or tuple
+        :param compression: If set, compressed (gzip / deflate) responses are accepted
+        :type compression: bool
+        :param max_retries: Number of retries for failed connections (not failed requests)
+        :type max_retries: int
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.compression = compression
+        self.max_retries = max_retries
+
+    def __repr__(self):
+        return (f"TransportConfig(pool_connections={self.pool_connections}, "
+                f"pool_maxsize={self.pool_maxsize}, "
+                f"keep_alive={self.keep_alive}, "
+                f"timeout={self.timeout}, "
+                f"compression={self.compression}, "
+                f"max_retries={self.max_retries})")
+
+
+class Transport:
+    """Sends the HTTP requests of a client through a (shared) connection pool
+
+    In contrast to creating a new requests.Session, `reset` only removes the cookies
+    and headers of the current login. Open connections are kept in the pool.
+    """
+
+    def __init__(
+        self, config: Optional[TransportConfig] = None, session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None, rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        """Create a new Transport
+        :param config: The connection settings. If not set, the defaults of TransportConfig are used.
+        :type config: TransportConfig
+        :param session: An optional requests session. If set without a config, the session's
+                        adapters are not changed.
+        :type session: requests.Session
+        :param cache: Optional cache for GET responses
+        :type cache: ResponseCache
+        :param rate_limiter: Optional limiter every request (except cached responses) has to pass
+        :type rate_limiter: AdaptiveRateLimiter
+        """
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        # number of responses received from the server and taken from the cache
+        self.requests_sent = 0
+        self.cache_hits = 0
+        self.config = config if config is not None else TransportConfig()
+
+        if session is None:
+            self._session = requests.Session()
+            self._mount_adapters()
+        else:
+            self._session = session
+            # only change the user's session if explicitly requested
+            if config is not None:
+                self._mount_adapters()
+
+        self._set_default_headers()
+
+    @property
+    def session(self) -> requests.Session:
+        """The underlying requests session"""
+        return self._session
+
+    def _mount_adapters(self):
+        """Creates the connection pools based on the current config
+        """
+        for prefix in ("https://", "http://"):
+            adapter = HTTPAdapter(
+                pool_connections=self.config.pool_connections,
+                pool_maxsize=self.config.pool_maxsize,
+                max_retries=self.config.max_retries,
+            )
+            self._session.mount(prefix, adapter)
+
+    def _set_default_headers(self):
+        """Sets the connection related headers based on the current config
+        """
+        self._session.headers["Accept-Encoding"] = "gzip, deflate" if self.config.compression else "identity"
+
+        if self.config.keep_alive:
+            self._session.headers["Connection"] = "keep-alive"
+        else:
+            self._session.headers["Connection"] = "close"
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request. Uses the configured default timeout if no timeout is set.
+           If a rate limiter is set, the request waits until the limiter allows it.
+        :param method: The HTTP method
+        :type method: str
+        :param url: The URL to send the request to
+        :type url: str
+        :param kwargs: Additional arguments passed to requests.Session.request
+        :return: The response
+        :rtype: requests.Response
+        """
+        kwargs.setdefault("timeout", self.config.timeout)
+
+        cache_key = None
+        if self.cache is not None and method == "GET":
+            cache_key = self.cache.get_key(url, kwargs.get("params"))
+
+        if cache_key is not None:
+            response = self.cache.get(cache_key)
+
+            if response is not None:
+                self.cache_hits += 1
+                return response
+
+        if self.rate_limiter is None:
+            response = self._session.request(method, url, **kwargs)
+        else:
+            self.rate_limiter.acquire()
+
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self.rate_limiter.backoff()
+                raise
+
+            self.rate_limiter.record_response(response)
+
+        self.requests_sent += 1
+
+        if cache_key is not None:
+            self.cache.put(cache_key, response)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Sends a GET request"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Sends a POST request"""
+        return self.request("POST", url, **kwargs)
+
+    def reset(self):
+        """Removes all cookies, headers (f.e. the roarand) and cached responses
+           while keeping the open connections.
+        """
+        _LOGGER.debug("Resetting cookies and headers")
+        if self.cache is not None:
+            self.cache.invalidate()
+        self._session.cookies.clear()
+        self._session.headers = requests.utils.default_headers()
+        self._set_default_headers()
+
+    def close(self):
+        """Closes all open connections"""
+        self._session.close()
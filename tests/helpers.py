@@ -0,0 +1,54 @@
+"""Shared setup of the tests"""
+
+from unittest.mock import MagicMock
+import json
+import os
+import sys
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.client import FusionSolarClient
+
+
+def create_client(username: str = "user", **kwargs) -> FusionSolarClient:
+    """Creates a client that does not log in and trusts its session
+    :param username: The account's username. Clients of the same account share the rate limiter
+                     and the request semaphore.
+    :type username: str
+    :param kwargs: Additional parameters of FusionSolarClient
+    :return: The client
+    :rtype: FusionSolarClient
+    """
+    # passing a session prevents the login
+    client = FusionSolarClient(username, "password", session=requests.Session(), **kwargs)
+    client.is_session_active = MagicMock(return_value=True)
+
+    return client
+
+
+def create_response(content=b'{"success": true}', status_code: int = 200, content_type: str = None,
+                    headers: dict = None) -> requests.Response:
+    """Creates a response without sending a request
+    :param content: The body as bytes or the data to encode as JSON
+    :param status_code: The HTTP status code
+    :type status_code: int
+    :param content_type: The Content-Type header (not set by default)
+    :type content_type: str
+    :param headers: Additional headers
+    :type headers: dict
+    :return: The response
+    :rtype: requests.Response
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content if isinstance(content, bytes) else json.dumps(content).encode()
+
+    if content_type is not None:
+        response.headers["Content-Type"] = content_type
+    response.headers.update(headers or {})
+
+    return response
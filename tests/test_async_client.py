@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import asyncio
+import inspect
+import os
+import sys
+import threading
+import time
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.client import FusionSolarClient
+from fusion_solar_py.async_client import AsyncFusionSolarClient
+from tests.helpers import create_client
+
+
+class AsyncFusionSolarClientTest(TestCase):
+    def test_mirrors_public_api(self):
+        sync_methods = {name for name, _ in inspect.getmembers(FusionSolarClient) if not name.startswith("_")}
+        async_methods = {name for name, _ in inspect.getmembers(AsyncFusionSolarClient) if not name.startswith("_")}
+
+        self.assertEqual(set(), sync_methods - async_methods)
+
+    def test_gather(self):
+        client = create_client()
+        client.get_plant_flow = MagicMock(side_effect=lambda plant_id: {"plant": plant_id})
+
+        async def run():
+            async with AsyncFusionSolarClient(client, max_concurrency=4) as async_client:
+                return await asyncio.gather(
+                    *[async_client.get_plant_flow(f"NE={i}") for i in range(20)]
+                )
+
+        results = asyncio.run(run())
+
+        self.assertEqual([{"plant": f"NE={i}"} for i in range(20)], results)
+
+    def test_bulk_limited(self):
+        client = create_client("async_bulk_user", max_concurrent_requests=2)
+        lock = threading.Lock()
+        running = []
+        max_running = []
+
+        def get_real_time_data(device_dn):
+            with lock:
+                running.append(device_dn)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(device_dn)
+            return {"device": device_dn}
+
+        client.get_real_time_data = MagicMock(side_effect=get_real_time_data)
+
+        async def run():
+            async with AsyncFusionSolarClient(client, max_concurrency=8) as async_client:
+                return await async_client.get_real_time_data_bulk([f"NE={i}" for i in range(10)])
+
+        results = asyncio.run(run())
+
+        self.assertEqual({f"NE={i}": {"device": f"NE={i}"} for i in range(10)}, results)
+        self.assertLessEqual(max(max_running), 2)
+
+    def test_close(self):
+        client = create_client()
+        client.close = MagicMock()
+        client.get_plant_flow = MagicMock(side_effect=lambda plant_id: time.sleep(0.2))
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            async_client = AsyncFusionSolarClient(client)
+            call = asyncio.ensure_future(async_client.get_plant_flow("NE=1"))
+            await asyncio.sleep(0.01)
+            ticker = asyncio.ensure_future(tick())
+
+            # the running call is awaited without blocking the event loop
+            await async_client.close()
+            ticker.cancel()
+            await call
+
+        asyncio.run(run())
+
+        client.close.assert_called_once()
+        self.assertGreater(len(ticks), 5)
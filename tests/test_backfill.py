@@ -0,0 +1,108 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import json
+import os
+import sys
+import tempfile
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.backfill import HistoryBackfill
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client
+
+
+class HistoryBackfillTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp_dir.name, "checkpoint.json")
+        self.client = create_client()
+        self.client.get_historical_data = MagicMock(
+            side_effect=lambda signal_ids, device_dn, date: {"success": True, "data": {"device": device_dn}}
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _create_backfill(self) -> HistoryBackfill:
+        return HistoryBackfill(
+            self.client, ["NE=1", "NE=2"], ["30014"], date(2024, 2, 27), date(2024, 3, 2),
+            checkpoint_path=self.checkpoint_path, requests_per_second=0, max_retries=0
+        )
+
+    def test_backfill(self):
+        results = {}
+
+        stats = self._create_backfill().run(lambda device_dn, day, data: results.update({(device_dn, day): data}))
+
+        self.assertEqual(10, stats.completed)
+        self.assertEqual(10, len(results))
+        self.assertEqual({"success": True, "data": {"device": "NE=2"}}, results[("NE=2", date(2024, 2, 29))])
+        self.assertTrue(stats.days_per_second > 0)
+
+    def test_resume(self):
+        get_historical_data = self.client.get_historical_data.side_effect
+
+        def fail_on_second_device(signal_ids, device_dn, date):
+            if device_dn == "NE=2":
+                raise FusionSolarException("Failed")
+            return get_historical_data(signal_ids, device_dn, date)
+
+        self.client.get_historical_data.side_effect = fail_on_second_device
+
+        stats = self._create_backfill().run(lambda device_dn, day, data: None)
+
+        self.assertEqual(5, stats.completed)
+        self.assertEqual(5, len(stats.failed))
+
+        # the second run only retrieves the failed days
+        self.client.get_historical_data.side_effect = get_historical_data
+        stats = self._create_backfill().run(lambda device_dn, day, data: None)
+
+        self.assertEqual(5, stats.completed)
+        self.assertEqual(5, stats.skipped)
+        self.assertEqual(0, len(stats.failed))
+
+    def test_bounded_queue(self):
+        self.client._max_concurrent_requests = 2
+        submitted = []
+        outstanding = []
+
+        class _Executor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(*args, **kwargs)
+
+        def callback(device_dn, day, data):
+            outstanding.append(len(submitted) - len(outstanding))
+
+        with patch("fusion_solar_py.backfill.ThreadPoolExecutor", _Executor):
+            stats = self._create_backfill().run(callback)
+
+        self.assertEqual(10, stats.completed)
+        # only two jobs are queued at once
+        self.assertLessEqual(max(outstanding), 2)
+
+    def test_checkpoint_of_other_signals(self):
+        self._create_backfill().run(lambda device_dn, day, data: None)
+
+        with open(self.checkpoint_path, "r") as reader:
+            self.assertEqual(["30014"], json.load(reader)["signal_ids"])
+
+        with self.assertRaises(ValueError):
+            HistoryBackfill(
+                self.client, ["NE=1"], ["30014", "30016"], date(2024, 2, 27), date(2024, 3, 2),
+                checkpoint_path=self.checkpoint_path
+            )
+
+    def test_rate_limit(self):
+        backfill = HistoryBackfill(
+            self.client, ["NE=1"], ["30014"], date(2024, 2, 27), date(2024, 2, 28), requests_per_second=4
+        )
+
+        self.assertEqual(4, backfill._limiter.rate)
+        self.assertEqual(2, backfill.run(lambda device_dn, day, data: None).completed)
@@ -0,0 +1,95 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.battery_modules import BatteryModule, get_dynamic_signal_ids, get_static_signal_ids
+from fusion_solar_py.constants import MODULE_SIGNALS
+from fusion_solar_py.signals import MODULE_SIGNAL_REGISTRY
+from tests.helpers import create_client
+
+
+def _find(name: str, module_id: str) -> str:
+    return MODULE_SIGNAL_REGISTRY.find(name, module_id)
+
+
+def _create_response(module_id: str, signal_ids: list) -> list:
+    """Creates the response of query-battery-dc with two battery packs"""
+    values = {
+        _find("No.", module_id): f"M{module_id}",
+        _find("[DC/DC] Working status", module_id): "2",
+        _find("[DC/DC] SN", module_id): f"SN-{module_id}",
+        _find("[DC/DC] Software version", module_id): "V100",
+        _find("[DC/DC] SOC", module_id): "55.0",
+        _find("[DC/DC] Internal temperature", module_id): "21.5",
+        _find("[Battery pack 1] SN", module_id): f"P1-{module_id}",
+        _find("[Battery pack 1] Firmware version", module_id): "F1",
+        _find("[Battery pack 1] SOC", module_id): "54.0",
+        _find("[Battery pack 1] Maximum temperature", module_id): "23.0",
+        _find("[Battery pack 2] SN", module_id): f"P2-{module_id}",
+        _find("[Battery pack 2] Voltage", module_id): "400.1",
+    }
+
+    return [{"id": int(signal_id), "realValue": values.get(signal_id, "-")} for signal_id in signal_ids]
+
+
+class BatteryModulesTest(TestCase):
+    def test_signal_ids(self):
+        for module_id, signal_ids in MODULE_SIGNALS.items():
+            self.assertEqual(12, len(get_static_signal_ids(module_id)))
+            self.assertEqual(
+                sorted(signal_ids),
+                sorted(get_static_signal_ids(module_id) + get_dynamic_signal_ids(module_id)),
+            )
+
+    def test_from_values(self):
+        values = MODULE_SIGNAL_REGISTRY.decode_signals(_create_response("3", MODULE_SIGNALS["3"]))
+        module = BatteryModule.from_values("3", values)
+
+        self.assertEqual("SN-3", module.sn)
+        self.assertEqual("Running", module.working_status)
+        self.assertEqual(55.0, module.state_of_charge)
+        self.assertEqual(21.5, module.internal_temperature)
+        self.assertIsNone(module.bus_voltage)
+        # the third pack has no values
+        self.assertEqual([1, 2], [pack.number for pack in module.packs])
+        self.assertEqual("P1-3", module.get_pack(1).sn)
+        self.assertEqual(23.0, module.get_pack(1).max_temperature)
+        self.assertEqual(400.1, module.get_pack(2).voltage)
+        self.assertIsNone(module.get_pack(3))
+        self.assertFalse(hasattr(module, "__dict__"))
+
+    def test_client(self):
+        client = create_client()
+
+        def get_stats(battery_id, module_id="1", signal_ids=None):
+            if module_id == "4":
+                raise ValueError("failed")
+            return _create_response(module_id, signal_ids or MODULE_SIGNALS[module_id])
+
+        client.get_battery_module_stats = MagicMock(side_effect=get_stats)
+
+        modules = client.get_battery_modules("NE=1")
+
+        self.assertEqual(["1", "2", "3", "4"], list(modules.keys()))
+        self.assertEqual("SN-2", modules["2"].sn)
+        self.assertIsInstance(modules["4"], ValueError)
+
+        # the serial numbers and versions are only requested once
+        client.get_battery_module_stats.reset_mock()
+        modules = client.get_battery_modules("NE=1", module_ids=["1"])
+
+        client.get_battery_module_stats.assert_called_once_with("NE=1", module_id="1", signal_ids=get_dynamic_signal_ids("1"))
+        self.assertEqual("SN-1", modules["1"].sn)
+        self.assertEqual("F1", modules["1"].get_pack(1).firmware_version)
+        self.assertEqual(54.0, modules["1"].get_pack(1).state_of_charge)
+
+        client.get_battery_modules("NE=1", module_ids=["1"], refresh_static=True)
+        client.get_battery_module_stats.assert_called_with("NE=1", module_id="1", signal_ids=None)
+
+        with self.assertRaises(ValueError):
+            client.get_battery_modules("NE=1", module_ids=["5"])
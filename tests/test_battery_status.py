@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import random
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.client import BatteryStatus, PowerStatus
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client, create_response
+
+
+def _create_signals():
+    return [
+        {"id": 10003, "value": "Running", "realValue": "2"},
+        {"id": 10008, "value": "Charge", "realValue": "1"},
+        {"id": 10013, "value": "10.000", "realValue": "10.000"},
+        {"id": 10015, "value": "-", "realValue": "-"},
+        {"id": 10001, "value": "3.21", "realValue": "3.21"},
+        {"id": 10002, "value": "-", "realValue": "-"},
+        {"id": 10004, "value": "-1.500", "realValue": "-1.500"},
+        {"id": 10005, "value": "412.3", "realValue": "412.3"},
+        {"id": 10006, "value": "87.0", "realValue": "87.0"},
+    ]
+
+
+class BatteryStatusTest(TestCase):
+    def test_slots(self):
+        self.assertFalse(hasattr(PowerStatus(1.0, 2.0, 3.0), "__dict__"))
+        self.assertFalse(hasattr(BatteryStatus.from_signals(_create_signals()), "__dict__"))
+
+    def test_from_signals(self):
+        signals = _create_signals()
+        # the order of the signals does not matter
+        random.Random(1).shuffle(signals)
+
+        status = BatteryStatus.from_signals(signals)
+
+        self.assertEqual(87.0, status.state_of_charge)
+        self.assertEqual(10.0, status.rated_capacity)
+        self.assertEqual("Running", status.operating_status)
+        self.assertEqual("-", status.backup_time)
+        self.assertEqual(412.3, status.bus_voltage)
+        self.assertEqual(3.21, status.total_charged_today_kwh)
+        self.assertEqual(0.0, status.total_discharged_today_kwh)
+        self.assertEqual(-1.5, status.current_charge_discharge_kw)
+
+    def test_string_ids(self):
+        signals = [dict(signal, id=str(signal["id"])) for signal in _create_signals()]
+
+        self.assertEqual(87.0, BatteryStatus.from_signals(signals + [{"name": "no id"}]).state_of_charge)
+
+    def test_missing_signal(self):
+        signals = [signal for signal in _create_signals() if signal["id"] != 10006]
+
+        self.assertRaises(FusionSolarException, BatteryStatus.from_signals, signals)
+
+    def test_batch(self):
+        batteries = BatteryStatus.from_signals_batch({"NE=1": _create_signals(), "NE=2": []})
+
+        self.assertEqual(87.0, batteries["NE=1"].state_of_charge)
+        self.assertIsInstance(batteries["NE=2"], FusionSolarException)
+
+    def test_client(self):
+        client = create_client()
+        client.get_battery_status = MagicMock(side_effect=lambda battery_id: {
+            "NE=1": _create_signals(),
+        }[battery_id])
+
+        self.assertEqual(87.0, client.get_battery_basic_stats("NE=1").state_of_charge)
+
+        batteries = client.get_battery_basic_stats_bulk(["NE=1", "NE=2"])
+
+        self.assertIsInstance(batteries["NE=1"], BatteryStatus)
+        self.assertIsInstance(batteries["NE=2"], KeyError)
+
+    def test_status_group(self):
+        client = create_client()
+        signals = [dict(signal, id=str(signal["id"])) for signal in _create_signals()]
+        response = create_response({"success": True, "data": [
+            {"name": "Other", "signals": [{"id": "1"}, {"name": "no id"}]},
+            {"name": "Info", "signals": [{"id": "2"}]},
+            {"name": "Status", "signals": signals},
+        ]})
+        client._transport.get = MagicMock(return_value=response)
+
+        # the group is found by the signal ids, even if they are strings
+        self.assertEqual(signals, client.get_battery_status("NE=1"))
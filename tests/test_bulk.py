@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+import threading
+import time
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client
+
+
+class BulkRequestTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client("bulk_user", max_concurrent_requests=3)
+
+    def test_real_time_data_bulk(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def get_real_time_data(device_dn):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+            if device_dn == "NE=3":
+                raise FusionSolarException("Failed")
+
+            return {"dn": device_dn}
+
+        self.client.get_real_time_data = MagicMock(side_effect=get_real_time_data)
+
+        device_dns = [f"NE={i}" for i in range(10)]
+        results = self.client.get_real_time_data_bulk(device_dns)
+
+        self.assertEqual(device_dns, list(results.keys()))
+        self.assertIsInstance(results["NE=3"], FusionSolarException)
+        self.assertEqual({"dn": "NE=4"}, results["NE=4"])
+        # never more than max_concurrent_requests in parallel
+        self.assertEqual(3, running[1])
+
+    def test_shared_limit(self):
+        # all clients of an account share the limit
+        client = create_client("bulk_user", max_concurrent_requests=8)
+        other_account = create_client("other_user")
+        other_subdomain = create_client("bulk_user", huawei_subdomain="region02eu5")
+
+        self.assertIs(self.client._request_semaphore, client._request_semaphore)
+        self.assertIsNot(self.client._request_semaphore, other_account._request_semaphore)
+        self.assertIsNot(self.client._request_semaphore, other_subdomain._request_semaphore)
@@ -0,0 +1,119 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+import time
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.cache import ResponseCache
+from fusion_solar_py.transport import Transport
+from tests.helpers import create_client, create_response
+
+FLOW_URL = "https://region01eu5.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-flow"
+KPI_URL = "https://region01eu5.fusionsolar.huawei.com/rest/pvms/web/station/v1/station/total-real-kpi"
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.cache = ResponseCache()
+        self.transport = Transport(cache=self.cache)
+        self.transport._session.request = MagicMock(
+            side_effect=lambda *args, **kwargs: create_response({"success": True, "data": {}}, content_type="application/json")
+        )
+
+    def test_ignore_cache_busting_param(self):
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1", "_": 1})
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1", "_": 2})
+        self.transport.get(KPI_URL, params={"queryTime": 1, "timeZone": 1, "_": 1})
+        self.transport.get(KPI_URL, params={"queryTime": 2, "timeZone": 1, "_": 2})
+
+        self.assertEqual(2, self.transport._session.request.call_count)
+        self.assertEqual({"hits": 2, "misses": 2, "size": 2}, self.cache.stats())
+
+    def test_different_params(self):
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1", "_": 1})
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=2", "_": 1})
+
+        self.assertEqual(2, self.transport._session.request.call_count)
+
+    def test_uncached_endpoint(self):
+        url = "https://region01eu5.fusionsolar.huawei.com/rest/pvms/web/device/v1/device-realtime-data"
+
+        self.transport.get(url, params={"deviceDn": "NE=1"})
+        self.transport.get(url, params={"deviceDn": "NE=1"})
+
+        self.assertEqual(2, self.transport._session.request.call_count)
+        self.assertEqual(0, len(self.cache))
+
+    def test_no_html_responses(self):
+        self.transport._session.request = MagicMock(side_effect=lambda *args, **kwargs: create_response(content_type="text/html"))
+
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+
+        self.assertEqual(0, len(self.cache))
+
+    def test_no_error_responses(self):
+        for content in (b'{"success": false, "data": {}}', b'{"code": 1, "message": "error"}', b'{"data": {}}', b'[]'):
+            self.transport._session.request = MagicMock(
+                side_effect=lambda *args, **kwargs: create_response(content, content_type="application/json")
+            )
+
+            self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+            self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+
+            self.assertEqual(2, self.transport._session.request.call_count)
+            self.assertEqual(0, len(self.cache))
+
+        self.transport._session.request = MagicMock(
+            side_effect=lambda *args, **kwargs: create_response(b'{"code": 0, "data": {}}', content_type="application/json")
+        )
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+
+        self.assertEqual(1, len(self.cache))
+
+    def test_ttl(self):
+        self.cache.set_rule("/rest/pvms/web/station/v1/overview/energy-flow", 0.05)
+
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+        time.sleep(0.1)
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+
+        self.assertEqual(2, self.transport._session.request.call_count)
+
+    def test_lru_eviction(self):
+        self.cache.max_size = 2
+
+        for station in ("NE=1", "NE=2", "NE=1", "NE=3"):
+            self.transport.get(FLOW_URL, params={"stationDn": station})
+
+        self.assertEqual(2, len(self.cache))
+        # NE=2 was used least recently
+        self.assertIsNone(self.cache.get(self.cache.get_key(FLOW_URL, {"stationDn": "NE=2"})))
+        self.assertIsNotNone(self.cache.get(self.cache.get_key(FLOW_URL, {"stationDn": "NE=1"})))
+
+    def test_invalidate(self):
+        self.transport.get(FLOW_URL, params={"stationDn": "NE=1"})
+        self.transport.get(KPI_URL, params={"timeZone": 1})
+
+        self.cache.invalidate("/rest/pvms/web/station/v1/overview/energy-flow")
+        self.assertEqual(1, len(self.cache))
+
+        # a new login removes all responses
+        self.transport.reset()
+        self.assertEqual(0, len(self.cache))
+
+    def test_cached_response_not_alive(self):
+        client = create_client(response_cache=self.cache, liveness_ttl=60)
+        client._transport._session.request = self.transport._session.request
+
+        client.get_plant_flow("NE=1")
+        self.assertEqual(1, client._transport.requests_sent)
+        client._last_alive -= 10
+
+        # the response is taken from the cache and does not reset the time since the last response
+        client.get_plant_flow("NE=1")
+        self.assertEqual(1, client._transport.cache_hits)
+        self.assertGreaterEqual(client.seconds_since_alive(), 10)
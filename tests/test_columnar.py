@@ -0,0 +1,78 @@
+from unittest import TestCase, skipIf
+from unittest.mock import MagicMock
+import math
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from tests.helpers import create_client, create_response
+
+try:
+    import numpy as np
+    from fusion_solar_py.columnar import history_to_columns, plant_stats_to_columns, to_float_array
+except Exception:
+    np = None
+
+
+@skipIf(np is None, "numpy is not installed")
+class ColumnarTest(TestCase):
+    def test_float_array(self):
+        values = to_float_array(["1.5", "--", 2, "1.7976931348623157E308"])
+
+        self.assertEqual(np.float64, values.dtype)
+        self.assertEqual(1.5, values[0])
+        self.assertTrue(math.isnan(values[1]))
+        self.assertEqual(2.0, values[2])
+        self.assertTrue(math.isnan(values[3]))
+
+        self.assertTrue(math.isnan(to_float_array([1.0, None])[1]))
+        self.assertTrue(math.isnan(to_float_array([1.0, "invalid"])[1]))
+
+    def test_history(self):
+        columns = history_to_columns({"success": True, "data": {
+            "30014": {"pmDataList": [
+                {"counterValue": 1.5, "startTime": 1700000000},
+                {"counterValue": "-", "startTime": 1700000300},
+            ]},
+            "30016": {"pmDataList": [
+                {"counterValue": 1.7976931348623157e308, "startTime": 1700000000},
+            ]},
+        }})
+
+        self.assertEqual([30014, 30014, 30016], columns["signal_id"].tolist())
+        self.assertEqual(np.int64, columns["timestamp"].dtype)
+        self.assertEqual([1700000000, 1700000300, 1700000000], columns["timestamp"].tolist())
+        self.assertEqual(1.5, columns["value"][0])
+        self.assertTrue(np.isnan(columns["value"][1:]).all())
+
+    def test_plant_stats(self):
+        columns = plant_stats_to_columns({
+            "xAxis": ["2024-03-07 00:00", "2024-03-07 00:05"],
+            "productPower": ["--", "1.25"],
+            "stationTimezone": "+01:00",
+            "totalProductPower": "5.0",
+        }, utc_offset=3600)
+
+        self.assertEqual({"timestamp", "productPower"}, set(columns.keys()))
+        # 2024-03-06 23:00 UTC
+        self.assertEqual([1709766000, 1709766300], columns["timestamp"].tolist())
+        self.assertTrue(math.isnan(columns["productPower"][0]))
+        self.assertEqual(1.25, columns["productPower"][1])
+
+    def test_invalid_output(self):
+        self.assertRaises(ValueError, history_to_columns, {"data": {}}, output="csv")
+
+    def test_client(self):
+        client = create_client()
+
+        response = create_response({"success": True, "data": {"30014": {"pmDataList": [
+            {"counterValue": 0.123456789, "startTime": 1700000000}
+        ]}}})
+        client._transport.get = MagicMock(return_value=response)
+
+        columns = client.get_historical_columns(["30014"], "NE=1")
+
+        self.assertEqual([0.123456789], columns["value"].tolist())
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from datetime import date
+import asyncio
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.async_client import AsyncFusionSolarClient
+from fusion_solar_py.history import HistoryRecord, iter_history_records
+from tests.helpers import create_client
+
+
+def _create_history_data(signal_ids, device_dn, date):
+    day_start = int(date.timestamp()) - 12 * 3600
+
+    return {"success": True, "data": {
+        signal_id: {"pmDataList": [
+            {"counterId": int(signal_id), "counterValue": float(index), "startTime": day_start + index * 300}
+            for index in range(3)
+        ]}
+        for signal_id in signal_ids
+    }}
+
+
+class HistoryTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client(max_concurrent_requests=2)
+        self.client.get_historical_data = MagicMock(side_effect=_create_history_data)
+
+    def test_records(self):
+        history_data = {"success": True, "data": {"30014": {"pmDataList": [
+            {"counterId": 30014, "counterValue": 1.5, "startTime": 1694988000},
+            {"counterId": 30014, "counterValue": "-", "startTime": 1694988300},
+        ]}}}
+
+        self.assertEqual(
+            [HistoryRecord("NE=1", "30014", 1694988000, 1.5), HistoryRecord("NE=1", "30014", 1694988300, None)],
+            list(iter_history_records("NE=1", history_data))
+        )
+
+    def test_iter_history(self):
+        records = list(self.client.iter_history(["NE=1", "NE=2"], ["30014", "30016"], date(2024, 3, 1), date(2024, 3, 5)))
+
+        # 2 devices * 5 days * 2 signals * 3 measurements
+        self.assertEqual(60, len(records))
+        self.assertEqual("NE=1", records[0].device_dn)
+        self.assertEqual("NE=2", records[-1].device_dn)
+        # ordered by time for each device
+        timestamps = [record.timestamp for record in records if record.device_dn == "NE=1" and record.signal_id == "30014"]
+        self.assertEqual(sorted(timestamps), timestamps)
+
+    def test_batches(self):
+        batches = list(self.client.iter_history("NE=1", ["30014"], date(2024, 3, 1), date(2024, 3, 3), batch_size=4))
+
+        self.assertEqual([4, 4, 1], [len(batch) for batch in batches])
+
+    def test_async_iter_history(self):
+        async def run():
+            async with AsyncFusionSolarClient(self.client) as async_client:
+                return [record async for record in async_client.iter_history("NE=1", ["30014"], date(2024, 3, 1))]
+
+        self.assertEqual(3, len(asyncio.run(run())))
@@ -0,0 +1,123 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
+import json
+import math
+import os
+import sys
+import tempfile
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.history_cache import HistoryCache
+from fusion_solar_py.json_decoder import _parse_float
+from tests.helpers import create_client, create_response
+
+
+def _create_history_response(*args, params=(), **kwargs) -> requests.Response:
+    signal_ids = [value for name, value in params if name == "signalIds"]
+    data = {
+        signal_id: {"pmDataList": [{"counterId": int(signal_id), "counterValue": 1.5, "startTime": 1694988000}]}
+        for signal_id in signal_ids
+    }
+
+    return create_response({"success": True, "data": data})
+
+
+class HistoryCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.client = create_client(history_cache=os.path.join(self.tmp_dir.name, "history.sqlite"))
+        self.client._transport.get = MagicMock(side_effect=_create_history_response)
+
+    def tearDown(self) -> None:
+        self.client.history_cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_completed_day(self):
+        cache = HistoryCache(":memory:")
+        now = datetime.now()
+
+        self.assertIsNone(cache.get_completed_day(int(now.timestamp() * 1000)))
+        self.assertEqual(
+            (now - timedelta(days=1)).date().isoformat(),
+            cache.get_completed_day(int((now - timedelta(days=1)).timestamp() * 1000))
+        )
+
+    def test_past_day_cached(self):
+        date = datetime.now() - timedelta(days=3)
+
+        data = self.client.get_historical_data(["30014", "30016"], "NE=1", date)
+        cached_data = self.client.get_historical_data(["30014", "30016"], "NE=1", date)
+
+        self.assertEqual(data, cached_data)
+        self.assertEqual(1, self.client._transport.get.call_count)
+
+        # only the missing signal is requested
+        data = self.client.get_historical_data(["30014", "30017"], "NE=1", date)
+
+        self.assertEqual({"30014", "30017"}, set(data["data"].keys()))
+        self.assertEqual((("signalIds", "30017"), ), self.client._transport.get.call_args.kwargs["params"][:1])
+
+        # the cache is shared with the battery and inverter stats
+        self.client.get_inverter_day_stats("NE=1", ["30016"], query_time=int(date.timestamp() * 1000))
+        self.assertEqual(2, self.client._transport.get.call_count)
+
+    def test_current_day_not_cached(self):
+        self.client.get_historical_data(["30014"], "NE=1")
+        self.client.get_historical_data(["30014"], "NE=1")
+
+        self.assertEqual(2, self.client._transport.get.call_count)
+        self.assertEqual(0, len(self.client.history_cache))
+
+    def test_raw_data_cached(self):
+        client = create_client(history_cache=HistoryCache(":memory:"))
+
+        response = create_response(
+            b'{"success": true, "data": {"30014": {"pmDataList": ['
+            b'{"counterId": 30014, "counterValue": 1.7976931348623157E308, "startTime": 1694988000}, '
+            b'{"counterId": 30014, "counterValue": 0.123456789, "startTime": 1694988300}]}}}'
+        )
+        client._transport.get = MagicMock(return_value=response)
+
+        date = datetime.now() - timedelta(days=3)
+        data = client.get_historical_data(["30014"], "NE=1", date)
+        self.assertEqual([0.0, 0.12345679], [point["counterValue"] for point in data["data"]["30014"]["pmDataList"]])
+
+        # MAX_JS_NUMBER is still a missing value when read from the cache
+        columns = client.get_historical_columns(["30014"], "NE=1", date)
+
+        client._transport.get.assert_called_once()
+        self.assertTrue(math.isnan(columns["value"][0]))
+        self.assertEqual(0.123456789, columns["value"][1])
+
+        # the floats are rounded again
+        self.assertEqual(data, client.get_historical_data(["30014"], "NE=1", date))
+
+    def test_decoded_once(self):
+        client = create_client(history_cache=HistoryCache(":memory:"))
+
+        response = MagicMock()
+        response.content = b'{"success": true, "data": {"30014": {"pmDataList": [' \
+                           b'{"counterId": 30014, "counterValue": 0.123456785, "startTime": 1694988000}]}, ' \
+                           b'"30016": {"pmDataList": [{"counterId": 30016, "counterValue": 2.5, "startTime": 1694988000}]}}}'
+        response.json.side_effect = AssertionError("decoded again")
+        client._transport.get = MagicMock(return_value=response)
+
+        date = datetime.now() - timedelta(days=3)
+        data = client.get_historical_data(["30014", "30016"], "NE=1", date)
+
+        self.assertEqual(0.12345678, data["data"]["30014"]["pmDataList"][0]["counterValue"])
+
+        # all cached signals are decoded at once
+        with patch("fusion_solar_py.history_cache.loads", side_effect=lambda content: json.loads(content)) as loads:
+            cached = client.history_cache.get("NE=1", ["30014", "30016"], date.date().isoformat(), parse_float=_parse_float)
+
+        loads.assert_called_once()
+        self.assertEqual(0.123456785, cached["30014"]["pmDataList"][0]["counterValue"])
+        self.assertEqual(data, client.get_historical_data(["30014", "30016"], "NE=1", date))
+        client._transport.get.assert_called_once()
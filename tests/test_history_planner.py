@@ -0,0 +1,66 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from datetime import date, datetime
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from fusion_solar_py.history_planner import HistoryQueryPlan
+from tests.helpers import create_client
+
+
+def history_response(signal_ids, device_dn, date):
+    if device_dn == "NE=3":
+        raise FusionSolarException("Failed")
+
+    return {"success": True, "data": {
+        signal_id: {"pmDataList": [{"startTime": 0, "counterValue": f"{device_dn}/{signal_id}/{date.day}"}]}
+        for signal_id in signal_ids
+    }}
+
+
+class HistoryPlannerTest(TestCase):
+    def test_plan(self):
+        plan = HistoryQueryPlan([
+            ("NE=1", "30014", date(2024, 1, 1)),
+            ("NE=1", 30007, datetime(2024, 1, 1, 8)),
+            ("NE=1", "30014", date(2024, 1, 1)),
+            ("NE=2", "30007", date(2024, 1, 1)),
+            ("NE=1", "30014", date(2024, 1, 2)),
+        ])
+
+        self.assertEqual(4, len(plan.wants))
+        self.assertEqual([
+            ("NE=1", date(2024, 1, 1), ("30014", "30007")),
+            ("NE=2", date(2024, 1, 1), ("30007", )),
+            ("NE=1", date(2024, 1, 2), ("30014", )),
+        ], plan.requests)
+        self.assertEqual(1, plan.requests_saved)
+
+    def test_max_signals(self):
+        plan = HistoryQueryPlan([("NE=1", signal_id, date(2024, 1, 1)) for signal_id in range(5)],
+                                max_signals_per_request=2)
+
+        self.assertEqual([2, 2, 1], [len(request.signal_ids) for request in plan.requests])
+        self.assertEqual(2, plan.requests_saved)
+
+    def test_query_history(self):
+        client = create_client()
+        client.get_historical_data = MagicMock(side_effect=history_response)
+
+        result = client.query_history([
+            ("NE=1", "30014", date(2024, 1, 1)),
+            ("NE=1", "30007", date(2024, 1, 1)),
+            ("NE=1", "30006", date(2024, 1, 1)),
+            ("NE=3", "30007", date(2024, 1, 1)),
+        ])
+
+        self.assertEqual(2, client.get_historical_data.call_count)
+        self.assertEqual(2, result.requests_saved)
+        self.assertEqual(2, client.history_requests_saved)
+        self.assertEqual("NE=1/30007/1", result.get("NE=1", "30007", date(2024, 1, 1))["pmDataList"][0]["counterValue"])
+        self.assertRaises(FusionSolarException, result.get, "NE=3", "30007", date(2024, 1, 1))
@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from datetime import datetime
+import os
+import sys
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from fusion_solar_py.history import HistoryRecord
+from fusion_solar_py.intraday import IntradayHistory
+from tests.helpers import create_client, create_response
+
+
+class IntradayHistoryTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client()
+        self.points = []
+        self.client._transport.get = MagicMock(side_effect=self._get)
+
+    def _get(self, url, params):
+        return create_response({"success": True, "data": {"30014": {"pmDataList": self.points}}})
+
+    def _add_points(self, start, end):
+        self.points += [
+            {"counterId": 30014, "counterValue": index + 0.123456789, "startTime": 1700000000 + index * 300}
+            for index in range(start, end)
+        ]
+
+    def test_refresh(self):
+        history = IntradayHistory(self.client, ["NE=1"], ["30014"])
+        now = datetime(2024, 3, 1, 12)
+
+        self._add_points(0, 3)
+        self.points.append({"counterId": 30014, "counterValue": "-", "startTime": 1700000000 + 3 * 300})
+        delta = history.refresh(now)
+
+        self.assertEqual(4, len(delta))
+        self.assertEqual(HistoryRecord("NE=1", "30014", 1700000000, 0.12345679), delta[0])
+        self.assertIsNone(delta[-1].value)
+
+        self._add_points(4, 6)
+        delta = history.refresh(now)
+
+        self.assertEqual([1700000000 + 4 * 300, 1700000000 + 5 * 300], [record.timestamp for record in delta])
+        self.assertEqual(4, history.points_skipped)
+        self.assertEqual(6, len(history.get_day_buffer("NE=1", "30014")))
+        self.assertEqual(1700000000 + 5 * 300, history.get_last_timestamp("NE=1", "30014"))
+
+        self.assertEqual([], history.refresh(now))
+
+    def test_new_day(self):
+        history = IntradayHistory(self.client, ["NE=1"], ["30014"])
+        self._add_points(0, 3)
+        history.refresh(datetime(2024, 3, 1, 12))
+
+        self.points = []
+        self._add_points(0, 1)
+
+        self.assertEqual(1, len(history.refresh(datetime(2024, 3, 2, 0, 5))))
+        self.assertEqual(1, len(history.get_day_buffer("NE=1", "30014")))
+
+    def test_failed_device(self):
+        history = IntradayHistory(self.client, ["NE=1"], ["30014"])
+        self.client._transport.get = MagicMock(side_effect=requests.exceptions.ConnectionError())
+
+        self.assertEqual([], history.refresh(datetime(2024, 3, 1, 12)))
+        self.assertIn("NE=1", history.errors)
@@ -0,0 +1,137 @@
+from unittest import TestCase
+from unittest.mock import patch
+import json
+import os
+import random
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py import json_decoder
+from fusion_solar_py.json_decoder import _parse_float, loads
+
+
+DOCUMENT = b"""{"success": true, "data": {"30014": {"pmDataList": [
+    {"counterId": 30014, "counterValue": 1.5, "startTime": 1700000000},
+    {"counterId": 30014, "counterValue": 0.123456789, "startTime": 1700000300},
+    {"counterId": 30014, "counterValue": 0.123456785, "startTime": 1700000600},
+    {"counterId": 30014, "counterValue": 1.7976931348623157E308, "startTime": 1700000900},
+    {"counterId": 30014, "counterValue": "-", "startTime": 1700001200},
+    {"counterId": 30014, "counterValue": 12, "startTime": 1700001500},
+    {"counterId": 30014, "counterValue": 1.23456789E-5, "startTime": 1700001800},
+    {"counterId": 30014, "counterValue": 123456789012345678901.5, "startTime": 1700002100},
+    {"counterId": 30014, "counterValue": -2.000000004, "startTime": 1700002400}
+], "values": [0.30000000000000004, 2.5, [1e-9]]}}}"""
+
+
+class JsonDecoderTest(TestCase):
+    def _assert_identical(self, content: bytes):
+        expected = json.loads(content, parse_float=_parse_float)
+        actual = loads(content)
+
+        self.assertEqual(json.dumps(expected), json.dumps(actual))
+
+    def test_identical(self):
+        self._assert_identical(DOCUMENT)
+
+    def test_identical_without_numpy(self):
+        with patch.object(json_decoder, "np", None):
+            self._assert_identical(DOCUMENT)
+
+    def test_identical_with_numpy(self):
+        if json_decoder.np is None:
+            self.skipTest("numpy is not installed")
+
+        with patch.object(json_decoder, "MIN_NUMPY_SIZE", 1):
+            self._assert_identical(DOCUMENT)
+
+    def test_identical_without_orjson(self):
+        with patch.object(json_decoder, "orjson", None):
+            self._assert_identical(DOCUMENT)
+
+    def test_values(self):
+        data = loads(DOCUMENT)
+        values = [point["counterValue"] for point in data["data"]["30014"]["pmDataList"]]
+
+        self.assertEqual([1.5, 0.12345679, 0.12345678, 0.0, "-", 12, 0.00001235, 0.0, -2.0], values)
+        self.assertIsInstance(values[5], int)
+
+    def test_scalar(self):
+        self.assertEqual(0.12345679, loads(b"0.123456789"))
+        self.assertEqual("a", loads(b'"a"'))
+
+    def test_large_integer(self):
+        # orjson returns integers beyond 64 bits as float
+        content = b'{"a": 123456789012345678901234, "b": 18446744073709551617, "c": -9223372036854775809}'
+
+        self._assert_identical(content)
+        self.assertEqual(123456789012345678901234, loads(content)["a"])
+        self.assertIsInstance(loads(content)["b"], int)
+
+    def test_out_of_range(self):
+        for content in (b'{"a": 1e400}', b'[-1e400, 1.5]', b'1e400'):
+            self._assert_identical(content)
+
+        self.assertEqual({"a": 0.0}, loads(b'{"a": 1e400}'))
+
+    def test_sentinel_only(self):
+        content = b'{"a": [1.7976931348623157E308, 1.25]}'
+
+        # the document is not decoded again
+        with patch.object(json_decoder, "_loads_exact") as loads_exact:
+            self.assertEqual({"a": [0.0, 1.25]}, loads(content))
+            loads_exact.assert_not_called()
+
+    def test_many_decimals(self):
+        # only the floats that need to be rounded are rounded, the document is not decoded again
+        with patch.object(json_decoder, "_loads_exact") as loads_exact:
+            self.assertEqual([0.12345679, 2.5], loads(b'[0.123456789, 2.5]'))
+            self.assertEqual([0.12345679], loads('[0.123456789]'))
+            # ties are rounded using the text
+            self.assertEqual([0.12345678, 0.12345680], loads(b'[0.123456785, 0.123456795]'))
+            self.assertEqual({"a": 0.12345678, "b": "0.123456789"}, loads(b'{"a": 0.1234567849999, "b": "0.123456789"}'))
+            loads_exact.assert_not_called()
+
+        # rounded floats without more than 8 decimal places
+        self._assert_identical(b'[1.23456789E-5, 1e-9, 2.5, 1.7976931348623157E307]')
+
+    def test_rounding_depends_on_text(self):
+        documents = (
+            # a tie without decimal places
+            b'[123456785e-9, 1.5]',
+            # large floats with many decimal places
+            b'[123456789.123456785, 2.5]',
+            # texts decoded to the same float with different results
+            b'[0.12345678500000000001, 0.123456785]',
+        )
+
+        for content in documents:
+            with patch.object(json_decoder, "_loads_exact", side_effect=json_decoder._loads_exact) as loads_exact:
+                self._assert_identical(content)
+                loads_exact.assert_called_once()
+
+    def test_random_documents(self):
+        rand = random.Random(42)
+        texts = (
+            lambda: f"{rand.uniform(-50, 5000):.{rand.randint(1, 14)}f}",
+            # ties at the 9th decimal place
+            lambda: f"{rand.uniform(-10, 10):.8f}5",
+            lambda: f"{rand.uniform(0, 10):.8f}5{rand.randint(0, 9) * '0'}{rand.choice(('', '1'))}",
+            lambda: f"{rand.randint(1, 10 ** 9)}e-{rand.randint(1, 12)}",
+            lambda: f"{rand.uniform(2 ** 24, 2 ** 40):.{rand.randint(1, 12)}f}",
+            lambda: str(rand.randint(-1000, 1000)),
+        )
+
+        for _ in range(200):
+            numbers = [rand.choice(texts)() for _ in range(rand.randint(1, 100))]
+            content = ("[" + ", ".join(numbers) + "]").encode()
+
+            with patch.object(json_decoder, "MIN_NUMPY_SIZE", 1):
+                self._assert_identical(content)
+
+            with patch.object(json_decoder, "np", None):
+                self._assert_identical(content)
+
+            self._assert_identical(('{"a": {"b": [' + ", ".join(numbers) + ']}, "c": ' + numbers[0] + '}').encode())
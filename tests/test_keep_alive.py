@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import asyncio
+import os
+import sys
+import time
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.async_client import AsyncFusionSolarClient
+from fusion_solar_py.interfaces import SessionStore
+from tests.helpers import create_client, create_response
+
+
+class KeepAliveTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client()
+        self.client.keep_alive = MagicMock(side_effect=self.client._mark_session_alive)
+
+    def test_keep_alive_thread(self):
+        self.client.start_keep_alive(interval=0.05)
+        time.sleep(0.3)
+        self.client.stop_keep_alive()
+
+        self.assertTrue(self.client.keep_alive.call_count > 1)
+
+    def test_skip_active_session(self):
+        self.client.start_keep_alive(interval=0.1)
+
+        # simulate constant traffic
+        for _ in range(10):
+            self.client._mark_session_alive()
+            time.sleep(0.03)
+
+        self.client.stop_keep_alive()
+
+        self.client.keep_alive.assert_not_called()
+
+    def test_keep_alive_task(self):
+        async def run():
+            async with AsyncFusionSolarClient(self.client) as async_client:
+                async_client.start_keep_alive(interval=0.05)
+                await asyncio.sleep(0.3)
+
+        asyncio.run(run())
+
+        self.assertTrue(self.client.keep_alive.call_count > 1)
+
+    def test_keep_alive_task_skip_active_session(self):
+        async def run():
+            async with AsyncFusionSolarClient(self.client) as async_client:
+                async_client.start_keep_alive(interval=0.1)
+
+                # simulate constant traffic
+                for _ in range(10):
+                    self.client._mark_session_alive()
+                    await asyncio.sleep(0.03)
+
+        asyncio.run(run())
+
+        self.client.keep_alive.assert_not_called()
+
+    def test_keep_alive_task_failure(self):
+        self.client.keep_alive = MagicMock(side_effect=Exception("Failed"))
+
+        async def run():
+            async with AsyncFusionSolarClient(self.client) as async_client:
+                async_client.start_keep_alive(interval=0.05)
+                await asyncio.sleep(0.3)
+
+        # failures do not stop the task
+        with self.assertLogs("fusion_solar_py.keep_alive", "WARNING"):
+            asyncio.run(run())
+
+        self.assertTrue(self.client.keep_alive.call_count > 1)
+
+    def test_save_refreshed_token(self):
+        session_store = MagicMock(spec=SessionStore)
+        session_store.load.return_value = None
+        client = create_client(session_store=session_store)
+        response = create_response({"code": 0, "payload": "token"})
+        client._transport.get = MagicMock(return_value=response)
+
+        self.assertEqual("token", client.keep_alive())
+        self.assertEqual("token", session_store.save.call_args[0][0]["roarand"])
+
+        # the unchanged token is not saved again
+        client.keep_alive()
+        session_store.save.assert_called_once()
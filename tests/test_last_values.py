@@ -0,0 +1,68 @@
+from unittest import TestCase
+import math
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from fusion_solar_py.last_values import find_last_index
+from tests.helpers import create_client
+
+
+PLANT_STATS = {
+    "NE=1": {
+        "xAxis": ["2024-03-07 00:00", "2024-03-07 00:05", "2024-03-07 00:10"],
+        "productPower": ["1.5", "2.5", "--"],
+        "chargePower": ["--", "--", "--"],
+        "stationTimezone": "+01:00",
+        "totalProductPower": "5.0",
+    },
+    "NE=2": {
+        "xAxis": ["2024-03-07 00:00", "2024-03-07 00:05", "2024-03-07 00:10"],
+        "productPower": ["--", "--", "3"],
+    },
+}
+
+
+class LastValuesTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client()
+
+    def test_find_last_index(self):
+        self.assertEqual(1, find_last_index(["1", "2", "--"]))
+        self.assertEqual(2, find_last_index(["1", "2", "3"]))
+        self.assertIsNone(find_last_index(["--", "--"]))
+        self.assertIsNone(find_last_index([]))
+
+    def test_last_plant_data(self):
+        last_data = self.client.get_last_plant_data(PLANT_STATS["NE=1"])
+
+        self.assertEqual({"time": "2024-03-07 00:05", "value": 2.5}, last_data["productPower"])
+        self.assertIsNone(last_data["chargePower"]["value"])
+        self.assertEqual(5.0, last_data["totalProductPower"])
+
+    def test_bulk(self):
+        table = self.client.get_last_plant_data_bulk(PLANT_STATS)
+
+        self.assertEqual(["NE=1", "NE=2"], table.plant_ids)
+        self.assertEqual(["productPower", "chargePower"], table.keys)
+        self.assertEqual({"time": "2024-03-07 00:05", "value": 2.5}, table.get("NE=1", "productPower"))
+        self.assertEqual({"time": "2024-03-07 00:10", "value": 3.0}, table.get("NE=2", "productPower"))
+        self.assertEqual({"time": None, "value": None}, table.get("NE=2", "chargePower"))
+        self.assertTrue(math.isnan(table.values[1]))
+
+        # identical to get_last_plant_data
+        for plant_id, stats in PLANT_STATS.items():
+            last_data = self.client.get_last_plant_data(stats)
+            self.assertEqual(last_data["productPower"], table.get(plant_id, "productPower"))
+
+    def test_keys(self):
+        table = self.client.get_last_plant_data_bulk(PLANT_STATS, keys=["productPower"])
+
+        self.assertEqual(2, len(table.values))
+
+    def test_invalid_stats(self):
+        self.assertRaises(FusionSolarException, self.client.get_last_plant_data_bulk, {"NE=1": {}})
@@ -0,0 +1,104 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import json
+import os
+import sys
+import threading
+import time
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.client import FusionSolarClient, logged_in
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client
+
+
+class _TestClient(FusionSolarClient):
+    """Client with a scripted data call that does not access the network"""
+
+    def __init__(self, responses, **kwargs):
+        # passing a session prevents the login
+        super().__init__("user", "password", session=requests.Session(), **kwargs)
+        self._responses = list(responses)
+        self.is_session_active = MagicMock(return_value=True)
+        self._relogin = MagicMock()
+
+    @logged_in
+    def get_data(self):
+        response = self._responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+
+class LivenessCacheTest(TestCase):
+    def test_liveness_check_skipped(self):
+        client = _TestClient([1, 2, 3])
+
+        self.assertEqual(1, client.get_data())
+        self.assertEqual(2, client.get_data())
+        self.assertEqual(3, client.get_data())
+
+        # only the first call has to test the session
+        self.assertEqual(1, client.is_session_active.call_count)
+        self.assertEqual(2, client.liveness_checks_saved)
+
+    def test_disabled_cache(self):
+        client = _TestClient([1, 2], liveness_ttl=0)
+
+        client.get_data()
+        client.get_data()
+
+        self.assertEqual(2, client.is_session_active.call_count)
+        self.assertEqual(0, client.liveness_checks_saved)
+
+    def test_relogin_on_failure(self):
+        client = _TestClient([1, json.JSONDecodeError("invalid", "<html>", 0), 2])
+
+        self.assertEqual(1, client.get_data())
+
+        # the session expired in the meantime
+        client.is_session_active.return_value = False
+
+        self.assertEqual(2, client.get_data())
+        client._relogin.assert_called_once()
+
+    def test_no_relogin_for_active_session(self):
+        client = _TestClient([1, FusionSolarException("Failed")])
+
+        client.get_data()
+
+        self.assertRaises(FusionSolarException, client.get_data)
+        client._relogin.assert_not_called()
+
+
+class SingleFlightLoginTest(TestCase):
+    def test_single_login(self):
+        client = create_client()
+        logged_in_event = threading.Event()
+
+        def configure_session():
+            time.sleep(0.1)
+            logged_in_event.set()
+
+        client.is_session_active = MagicMock(side_effect=lambda: logged_in_event.is_set())
+        client._configure_session = MagicMock(side_effect=configure_session)
+
+        @logged_in
+        def get_data(client):
+            return client._login_generation
+
+        threads = [threading.Thread(target=get_data, args=(client, )) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        client._configure_session.assert_called_once()
+        self.assertEqual(1, client._login_generation)
@@ -0,0 +1,86 @@
+from unittest import TestCase, skipIf
+from unittest.mock import MagicMock
+import math
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client
+
+try:
+    import numpy as np
+    from fusion_solar_py.optimizers import OptimizerIndex, create_optimizer_table
+except Exception:
+    np = None
+
+
+def _create_optimizers(inverter: int, count: int, power: float = 100.0) -> list:
+    return [
+        {"optName": f"{inverter}.{i}", "dn": f"NE={inverter}{i:03d}", "moStatus": 1, "runningStatus": "Running",
+         "outputPower": power + i, "inputVoltage": "35.5", "inputCurrent": "--", "temperature": 40}
+        for i in range(count)
+    ]
+
+
+@skipIf(np is None, "numpy is not installed")
+class OptimizerTableTest(TestCase):
+    def test_create_table(self):
+        index = OptimizerIndex()
+        table = create_optimizer_table({
+            "NE=1": _create_optimizers(1, 3),
+            "NE=2": FusionSolarException("no optimizers"),
+            "NE=3": _create_optimizers(3, 2),
+        }, index)
+
+        self.assertEqual(5, len(table))
+        self.assertEqual(["NE=1000", "NE=1001", "NE=1002", "NE=3000", "NE=3001"], table.optimizer_dns)
+        np.testing.assert_array_equal([100, 101, 102, 100, 101], table["outputPower"])
+        np.testing.assert_array_equal([35.5] * 5, table["inputVoltage"])
+        self.assertTrue(np.isnan(table["inputCurrent"]).all())
+        np.testing.assert_array_equal([0, 0, 0, 1, 1], table.inverter_codes)
+        self.assertEqual(2, int(table.get_inverter_mask("NE=3").sum()))
+        self.assertEqual(0, int(table.get_inverter_mask("NE=2").sum()))
+        self.assertIsInstance(table.errors["NE=2"], FusionSolarException)
+
+    def test_stable_positions(self):
+        index = OptimizerIndex()
+        create_optimizer_table({"NE=1": _create_optimizers(1, 2), "NE=3": _create_optimizers(3, 1)}, index)
+
+        # different order, NE=1 failed and a new optimizer was added to NE=3
+        table = create_optimizer_table({
+            "NE=3": _create_optimizers(3, 2, power=200),
+            "NE=1": ValueError("failed"),
+        }, index)
+
+        self.assertEqual(["NE=1000", "NE=1001", "NE=3000", "NE=3001"], table.optimizer_dns)
+        self.assertTrue(math.isnan(table["outputPower"][0]))
+        self.assertEqual(200.0, table["outputPower"][2])
+        self.assertEqual(201.0, table["outputPower"][table.get_position("NE=3001")])
+        self.assertIsNone(table.get_position("NE=9"))
+
+    def test_client(self):
+        client = create_client()
+        client.get_device_ids = MagicMock(return_value=[
+            {"type": "Inverter", "deviceDn": "NE=1"},
+            {"type": "Dongle", "deviceDn": "NE=5"},
+            {"type": "Inverter", "deviceDn": "NE=2"},
+        ])
+        client.get_optimizer_stats = MagicMock(side_effect=lambda inverter_dn: {
+            "NE=1": _create_optimizers(1, 2),
+            "NE=2": _create_optimizers(2, 2),
+        }[inverter_dn])
+
+        table = client.get_optimizer_stats_bulk("NE=100", metrics=["outputPower"])
+
+        client.get_device_ids.assert_called_once_with(parent_dn="NE=100")
+        self.assertEqual(2, client.get_optimizer_stats.call_count)
+        self.assertEqual(["outputPower"], list(table.columns.keys()))
+        self.assertEqual(4, len(table))
+
+        # the positions are kept between calls
+        table = client.get_optimizer_stats_bulk("NE=100")
+        self.assertEqual(2, table.get_position("NE=2000"))
@@ -0,0 +1,47 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from tests.helpers import create_client, create_response
+
+
+class PaginationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client()
+        self.stations = [{"dn": f"NE={i}"} for i in range(23)]
+        self.client._transport.post = MagicMock(side_effect=self._post)
+        self.include_total = True
+
+    def _post(self, url, **kwargs):
+        body = kwargs["json"]
+        page = body["pageNo"] if "pageNo" in body else body["curPage"]
+        page_size = body["pageSize"]
+
+        data = {"list": self.stations[(page - 1) * page_size:page * page_size]}
+        if self.include_total:
+            data["total"] = len(self.stations)
+
+        return create_response({"success": True, "data": data})
+
+    def test_all_stations(self):
+        self.assertEqual(self.stations, self.client.get_all_stations(page_size=5))
+        self.assertEqual(5, self.client._transport.post.call_count)
+        self.assertEqual([station["dn"] for station in self.stations], self.client.get_plant_ids())
+
+    def test_single_page(self):
+        self.assertEqual(self.stations[10:20], self.client.get_station_list(page=2))
+
+    def test_without_total(self):
+        self.include_total = False
+
+        self.assertEqual(self.stations, self.client.get_all_stations(page_size=5))
+
+    def test_all_alarms(self):
+        self.assertEqual(self.stations, self.client.get_all_alarm_data("NE=1", page_size=10))
+        self.assertEqual(3, self.client._transport.post.call_count)
+
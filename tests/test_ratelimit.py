@@ -0,0 +1,109 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import threading
+import time
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.ratelimit import AdaptiveRateLimiter, get_rate_limiter
+from fusion_solar_py.transport import Transport
+from tests.helpers import create_client, create_response
+
+
+class AdaptiveRateLimiterTest(TestCase):
+    def test_burst(self):
+        limiter = AdaptiveRateLimiter(rate=1, burst=3)
+
+        self.assertTrue(all(limiter.acquire(timeout=0) for _ in range(3)))
+        # the bucket is empty
+        self.assertFalse(limiter.acquire(timeout=0.01))
+
+    def test_rate(self):
+        limiter = AdaptiveRateLimiter(rate=100, burst=1)
+
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_backoff_and_recovery(self):
+        limiter = AdaptiveRateLimiter(rate=4, min_rate=1, recovery_step=0.5)
+
+        limiter.record_response(create_response(status_code=429))
+        self.assertEqual(2, limiter.rate)
+
+        # parallel failures only reduce the rate once
+        limiter.record_response(create_response(status_code=503))
+        self.assertEqual(2, limiter.rate)
+        self.assertEqual(2, limiter.throttled)
+
+        limiter._last_backoff = 0
+        limiter.record_response(create_response(b'{"success": false, "failCode": 407}'))
+        self.assertEqual(1, limiter.rate)
+
+        limiter._last_backoff = 0
+        limiter.backoff()
+        self.assertEqual(1, limiter.rate)
+
+        # other fail codes and successful responses increase the rate up to the initial rate
+        for _ in range(10):
+            limiter.record_response(create_response(b'{"success": false, "failCode": 20001}'))
+        self.assertEqual(4, limiter.rate)
+
+    def test_retry_after(self):
+        limiter = AdaptiveRateLimiter(rate=100, burst=5)
+        limiter.record_response(create_response(status_code=429, headers={"Retry-After": "1"}))
+
+        self.assertFalse(limiter.acquire(timeout=0.05))
+
+    def test_queue_depth(self):
+        limiter = AdaptiveRateLimiter(rate=20, burst=1)
+        limiter.acquire()
+
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.01)
+        self.assertGreater(limiter.queue_depth, 0)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(0, limiter.queue_depth)
+
+    def test_shared_per_account(self):
+        limiter = get_rate_limiter("user-a", "region01eu5", rate=2)
+
+        self.assertIs(limiter, get_rate_limiter("user-a", "region01eu5"))
+        self.assertIsNot(limiter, get_rate_limiter("user-a", "region02eu5"))
+        self.assertIsNot(limiter, get_rate_limiter("user-b", "region01eu5"))
+
+        client = create_client("user-a", rate_limiter=2)
+        self.assertIs(limiter, client.rate_limiter)
+
+    def test_transport(self):
+        limiter = AdaptiveRateLimiter(rate=4)
+        transport = Transport(rate_limiter=limiter)
+        transport._session.request = MagicMock(return_value=create_response(status_code=500))
+
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            transport.get("https://region01eu5.fusionsolar.huawei.com")
+
+        acquire.assert_called_once()
+        self.assertEqual(2, limiter.rate)
+
+        limiter._last_backoff = 0
+        transport._session.request = MagicMock(side_effect=requests.ConnectionError())
+
+        with self.assertRaises(requests.ConnectionError):
+            transport.get("https://region01eu5.fusionsolar.huawei.com")
+
+        self.assertEqual(1, limiter.rate)
@@ -0,0 +1,218 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import json
+import math
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from fusion_solar_py.realtime import RealtimeDecoder, RealtimeSchema
+from tests.helpers import create_client, create_response
+
+
+def _create_payload(power: str = "1.500", status: str = "2"):
+    return {"success": True, "data": [
+        {"name": "Device information", "signals": [
+            {"id": 10047, "name": "SN", "unit": "", "value": "HV2100123", "realValue": "HV2100123"},
+        ]},
+        {"name": "Battery", "signals": [
+            {"id": 10003, "name": "Battery operating status", "unit": "", "value": "Running", "realValue": status},
+            {"id": 10008, "name": "Power", "unit": "kW", "value": power, "realValue": power},
+            {"id": 10015, "name": "Backup time", "unit": "min", "value": "-", "realValue": "N/A"},
+        ]},
+    ]}
+
+
+def _create_content(**kwargs) -> bytes:
+    return json.dumps(_create_payload(**kwargs)).encode()
+
+
+class RealtimeDecoderTest(TestCase):
+    def test_schema(self):
+        schema = RealtimeSchema.from_payload(_create_payload())
+
+        self.assertEqual([10047, 10003, 10008, 10015], schema.signal_ids)
+        self.assertEqual([False, True, True, False], schema.numeric)
+        # text signals and signals without a value are not part of the arrays
+        self.assertEqual([10003, 10008], schema.array_signal_ids)
+        self.assertEqual(1, schema.get_index(10008))
+        self.assertIsNone(schema.get_index(10047))
+        self.assertIsNone(schema.get_index(10015))
+        self.assertIsNone(schema.get_index(1))
+
+    def test_unitless_numeric(self):
+        payload = _create_payload()
+        payload["data"][1]["signals"].append(
+            {"id": 10020, "name": "Power factor", "unit": "", "value": "0.98", "realValue": "0.98"}
+        )
+
+        values = RealtimeDecoder().decode(payload, "Battery")
+
+        self.assertEqual(0.98, values[10020])
+        self.assertEqual(0.98, values.values[values.schema.get_index(10020)])
+
+    def test_decode_array(self):
+        decoder = RealtimeDecoder()
+        values = decoder.decode_array(_create_payload(power="-0.25"), "Battery")
+
+        self.assertEqual([2.0, -0.25], list(values))
+
+    def test_decode(self):
+        values = RealtimeDecoder().decode(_create_payload(), "Battery")
+
+        self.assertEqual("HV2100123", values[10047])
+        self.assertEqual(2.0, values[10003])
+        self.assertEqual(1.5, values[10008])
+        self.assertIsNone(values[10015])
+        self.assertEqual({10047: "HV2100123", 10015: None}, values.text)
+        self.assertIn(10015, values)
+        self.assertNotIn(1, values)
+        self.assertIsNone(values.get(1))
+        self.assertRaises(KeyError, lambda: values[1])
+
+    def test_schema_grows(self):
+        decoder = RealtimeDecoder()
+        first = decoder.decode(_create_payload(), "Battery")
+
+        payload = _create_payload()
+        payload["data"][1]["signals"][2]["realValue"] = "30"
+        payload["data"][0]["signals"][0]["realValue"] = "-"
+        second = decoder.decode(payload, "Battery")
+
+        schema = decoder.get_schema("Battery")
+        self.assertEqual([10003, 10008, 10015], schema.array_signal_ids)
+        self.assertEqual(30.0, second[10015])
+        self.assertEqual([2.0, 1.5, 30.0], list(second.values))
+        self.assertIsNone(second[10047])
+
+        # values decoded before keep their length
+        self.assertEqual(2, len(first.values))
+        self.assertIsNone(first[10015])
+
+        # signals missing in a later response are NaN
+        self.assertTrue(math.isnan(decoder.decode_array(_create_payload(), "Battery")[2]))
+
+    def test_decode_changed_layout(self):
+        decoder = RealtimeDecoder()
+        decoder.decode_array(_create_payload(), "Battery")
+
+        payload = _create_payload(power="4", status="text")
+        payload["data"].reverse()
+
+        values = decoder.decode(payload, "Battery")
+
+        self.assertTrue(math.isnan(values.values[0]))
+        self.assertEqual(4.0, values.values[1])
+        # text reported by a numeric signal
+        self.assertEqual("text", values[10003])
+
+    def test_schema_reused(self):
+        decoder = RealtimeDecoder()
+        decoder.decode_array(_create_payload(), "Battery")
+        schema = decoder.get_schema("Battery")
+
+        # the schema is not created again, new signals are appended
+        payload = _create_payload(power="3")
+        payload["data"][1]["signals"].append({"id": 1, "name": "New", "unit": "V", "value": "5", "realValue": "5"})
+
+        self.assertEqual([2.0, 3.0, 5.0], list(decoder.decode_array(payload, "Battery")))
+        self.assertIs(schema, decoder.get_schema("Battery"))
+        self.assertEqual(1, schema.get_index(10008))
+        self.assertEqual(1, len(decoder))
+
+    def test_changed_text_signal(self):
+        decoder = RealtimeDecoder()
+        decoder.decode_array(_create_payload(), "Battery")
+
+        payload = _create_payload(power="2")
+        payload["data"][0]["signals"][0]["id"] = 10048
+
+        self.assertEqual([2.0, 2.0], list(decoder.decode_array(payload, "Battery")))
+        self.assertEqual("HV2100123", decoder.decode(payload, "Battery")[10048])
+
+    def test_identified_by_signals(self):
+        decoder = RealtimeDecoder()
+
+        self.assertEqual(1.5, decoder.decode_array(_create_payload())[1])
+        self.assertEqual(3.0, decoder.decode_array(_create_payload(power="3"))[1])
+        self.assertEqual(1, len(decoder))
+
+        payload = _create_payload()
+        payload["data"].reverse()
+        decoder.decode_array(payload)
+        self.assertEqual(2, len(decoder))
+
+    def test_content(self):
+        decoder = RealtimeDecoder()
+
+        with patch("fusion_solar_py.realtime.json.loads", side_effect=json.loads) as loads:
+            first = decoder.decode(_create_content(), "Battery")
+            second = decoder.decode(_create_content(power="-3.5"), "Battery")
+            decoder.decode(_create_content(power="2").decode(), "Battery")
+
+        # only the first response of the layout is parsed
+        self.assertEqual(1, loads.call_count)
+        self.assertEqual(1.5, first[10008])
+        self.assertEqual(-3.5, second[10008])
+        self.assertEqual({10047: "HV2100123", 10015: None}, second.text)
+
+        # the content of responses without device type identifies the schema
+        self.assertEqual([2.0, 1.5], list(decoder.decode_array(_create_content())))
+        self.assertEqual([2.0, 4.0], list(decoder.decode_array(_create_content(power="4"))))
+
+    def test_content_not_simple(self):
+        decoder = RealtimeDecoder()
+        decoder.decode(_create_content(), "Battery")
+
+        # escaped characters and values that are no strings are parsed
+        payload = _create_payload()
+        payload["data"][0]["signals"][0]["realValue"] = "SN \"1\""
+        payload["data"][1]["signals"][1]["realValue"] = 5
+        values = decoder.decode(json.dumps(payload).encode(), "Battery")
+
+        self.assertEqual('SN "1"', values[10047])
+        self.assertEqual(5.0, values[10008])
+
+        self.assertRaises(FusionSolarException, decoder.decode, b'{"success": false}', "Battery")
+
+    def test_batch(self):
+        decoder = RealtimeDecoder()
+        results = decoder.decode_batch({
+            "NE=1": _create_payload(power="1"),
+            "NE=2": {"success": False},
+            "NE=3": ValueError("failed"),
+        })
+
+        self.assertEqual(1.0, results["NE=1"][1])
+        self.assertIsInstance(results["NE=2"], FusionSolarException)
+        self.assertIsInstance(results["NE=3"], ValueError)
+
+    def test_client(self):
+        client = create_client()
+
+        def get(url, params):
+            return create_response(_create_content(power=dict(params)["deviceDn"][3:]))
+
+        client._transport.get = MagicMock(side_effect=get)
+
+        values = client.get_real_time_values("NE=7", "Battery")
+
+        self.assertEqual(7.0, values[10008])
+        self.assertEqual("HV2100123", values[10047])
+
+        results = client.get_real_time_values_bulk(["NE=1", "NE=2", "NE=x"], "Battery")
+
+        self.assertEqual([1.0, 2.0], [results["NE=1"][10008], results["NE=2"][10008]])
+        self.assertEqual("x", results["NE=x"][10008])
+
+    def test_battery_status_group(self):
+        client = create_client()
+
+        response = create_response(_create_payload())
+        client._transport.get = MagicMock(return_value=response)
+
+        self.assertEqual([10003, 10008, 10015], [signal["id"] for signal in client.get_battery_status("NE=1")])
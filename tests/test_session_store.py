@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.client import FusionSolarClient
+from fusion_solar_py.session_store import FileSessionStore
+
+
+class SessionStoreTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "session.json")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_file_store(self):
+        store = FileSessionStore(self.path)
+
+        self.assertIsNone(store.load())
+
+        store.save({"company_id": "NE=1234"})
+
+        self.assertEqual({"company_id": "NE=1234"}, store.load())
+
+        store.clear()
+
+        self.assertIsNone(store.load())
+
+    def _save_login(self):
+        """Simulates a successful login that is saved to the store"""
+        def login(client):
+            client._company_id = "NE=1234"
+            client._session.headers["roarand"] = "abcd"
+            client._session.cookies.set("JSESSIONID", "xyz", domain="region01eu5.fusionsolar.huawei.com", path="/")
+            client._save_session()
+
+        with patch.object(FusionSolarClient, "_configure_session", autospec=True, side_effect=login):
+            FusionSolarClient("user", "password", session_store=self.path)
+
+    def test_restore_session(self):
+        self._save_login()
+
+        with patch.object(FusionSolarClient, "is_session_active", return_value=True), \
+             patch.object(FusionSolarClient, "_configure_session") as configure_session:
+            client = FusionSolarClient("user", "password", session_store=self.path)
+
+        configure_session.assert_not_called()
+        self.assertEqual("NE=1234", client._company_id)
+        self.assertEqual("abcd", client._session.headers["roarand"])
+        self.assertEqual("xyz", client._session.cookies.get("JSESSIONID"))
+
+    def test_expired_session(self):
+        self._save_login()
+
+        with patch.object(FusionSolarClient, "is_session_active", return_value=False), \
+             patch.object(FusionSolarClient, "_configure_session") as configure_session:
+            client = FusionSolarClient("user", "password", session_store=self.path)
+
+        configure_session.assert_called_once()
+        self.assertNotIn("roarand", client._session.headers)
+
+    def test_other_account(self):
+        self._save_login()
+
+        with patch.object(FusionSolarClient, "is_session_active", return_value=True) as is_session_active, \
+             patch.object(FusionSolarClient, "_configure_session") as configure_session:
+            FusionSolarClient("other_user", "password", session_store=self.path)
+
+        is_session_active.assert_not_called()
+        configure_session.assert_called_once()
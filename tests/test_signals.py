@@ -0,0 +1,81 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.constants import MODULE_SIGNALS
+from fusion_solar_py.signals import MODULE_SIGNAL_REGISTRY
+from tests.helpers import create_client, create_response
+
+
+class SignalRegistryTest(TestCase):
+    def test_all_signals(self):
+        self.assertEqual(sum(len(signal_ids) for signal_ids in MODULE_SIGNALS.values()), len(MODULE_SIGNAL_REGISTRY))
+
+        for module_id, signal_ids in MODULE_SIGNALS.items():
+            self.assertEqual(signal_ids, MODULE_SIGNAL_REGISTRY.get_signal_ids(module_id))
+
+    def test_get(self):
+        definition = MODULE_SIGNAL_REGISTRY.get("230320586")
+
+        self.assertEqual("4", definition.module_id)
+        self.assertEqual("[DC/DC] SOC", definition.name)
+        self.assertEqual("%", definition.unit)
+        self.assertIn(230320586, MODULE_SIGNAL_REGISTRY)
+        self.assertNotIn("1", MODULE_SIGNAL_REGISTRY)
+        self.assertIsNone(MODULE_SIGNAL_REGISTRY.get("1"))
+
+    def test_find(self):
+        self.assertEqual("230320463", MODULE_SIGNAL_REGISTRY.find("[DC/DC] SOC", module_id="1"))
+        self.assertEqual(
+            {"1": "230320463", "2": "230320468", "3": "230320529", "4": "230320586"},
+            MODULE_SIGNAL_REGISTRY.find("[DC/DC] SOC"),
+        )
+        self.assertIsNone(MODULE_SIGNAL_REGISTRY.find("Unknown", module_id="1"))
+
+    def test_unknown_signals(self):
+        self.assertEqual([], MODULE_SIGNAL_REGISTRY.get_unknown_signals("1", ["230320463", "230320275"]))
+        # signal of module 2
+        self.assertEqual(["230320468"], MODULE_SIGNAL_REGISTRY.get_unknown_signals("1", ["230320463", "230320468"]))
+        self.assertTrue(MODULE_SIGNAL_REGISTRY.is_module_signal("2", "230320468"))
+
+    def test_decode(self):
+        decoded = MODULE_SIGNAL_REGISTRY.decode({
+            "230320459": "2",
+            "230320463": "87.5",
+            "230320275": "SN123",
+            "230320473": "-",
+            "230320514": "99",
+            "1": "raw",
+        })
+
+        self.assertEqual({
+            "230320459": "Running",
+            "230320463": 87.5,
+            "230320275": "SN123",
+            "230320473": None,
+            # unknown enum values are returned unchanged
+            "230320514": "99",
+            "1": "raw",
+        }, decoded)
+
+    def test_client(self):
+        client = create_client()
+
+        response = create_response({"success": True, "data": [
+            {"id": 230320463, "realValue": "55.0"},
+            {"id": 230320459, "realValue": "1"},
+        ]})
+        client._transport.get = MagicMock(return_value=response)
+
+        self.assertEqual(
+            {"230320463": 55.0, "230320459": "Standby"},
+            client.get_battery_module_values("NE=1", signal_ids=["230320463", "230320459"]),
+        )
+
+        with self.assertRaises(ValueError):
+            client.get_battery_module_stats("NE=1", signal_ids=["230320468"])
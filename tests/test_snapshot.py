@@ -0,0 +1,49 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from fusion_solar_py.snapshot import run_task_graph
+from tests.helpers import create_client
+
+
+class PlantSnapshotTest(TestCase):
+    def test_task_graph(self):
+        results, errors, timings = run_task_graph({
+            "a": ((), lambda _: 1),
+            "b": (("a", ), lambda r: r["a"] + 1),
+            "c": ((), lambda _: 1 / 0),
+            "d": (("b", "c"), lambda r: 0),
+        })
+
+        self.assertEqual({"a": 1, "b": 2}, results)
+        self.assertIsInstance(errors["c"], ZeroDivisionError)
+        self.assertIsInstance(errors["d"], FusionSolarException)
+        self.assertEqual({"a", "b", "c"}, set(timings.keys()))
+
+    def test_unresolvable_dependency(self):
+        self.assertRaises(ValueError, run_task_graph, {"a": (("b", ), lambda r: 0)})
+
+    def test_plant_snapshot(self):
+        client = create_client()
+        client.get_current_plant_data = MagicMock(return_value={"yearEnergy": 1})
+        client.get_plant_stats = MagicMock(return_value={"xAxis": []})
+        client.get_plant_flow = MagicMock(return_value={"data": {"flow": {"nodes": [
+            {"name": "neteco.pvms.energy.flow.energy_store", "devIds": ["NE=2"]},
+            {"name": "neteco.pvms.devTypeLangKey.inverter", "devIds": ["NE=3"]},
+        ]}}})
+        client.get_battery_status = MagicMock(return_value=[])
+
+        snapshot = client.get_plant_snapshot("NE=1")
+
+        self.assertEqual(["NE=2"], snapshot.battery_ids)
+        self.assertEqual({"NE=2": []}, snapshot.battery_status)
+        self.assertEqual({}, snapshot.errors)
+        # the energy flow is only requested once
+        client.get_plant_flow.assert_called_once()
+        self.assertIn("battery_status", snapshot.timings)
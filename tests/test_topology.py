@@ -0,0 +1,88 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.exceptions import *
+from tests.helpers import create_client
+
+
+class TopologyTest(TestCase):
+    def setUp(self) -> None:
+        self.client = create_client(topology_ttl=60)
+        self.client.get_all_stations = MagicMock(return_value=[
+            {"dn": "NE=1", "name": "Plant 1"}, {"dn": "NE=2", "name": "Plant 2"}
+        ])
+        self.client.get_device_ids = MagicMock(side_effect=lambda plant_dn: {
+            "NE=1": [{"type": "Inverter", "deviceDn": "NE=11"}, {"type": "Dongle", "deviceDn": "NE=12"}],
+            "NE=2": [{"type": "Inverter", "deviceDn": "NE=21"}],
+        }[plant_dn])
+        self.client.get_plant_flow = MagicMock(side_effect=lambda plant_dn: {"data": {"flow": {"nodes": [
+            {"name": "neteco.pvms.energy.flow.energy_store", "devIds": [plant_dn + "3"]},
+        ]}}})
+        self.client.get_optimizer_stats = MagicMock(side_effect=lambda inverter_dn: {
+            "NE=11": [{"optName": "1.1", "dn": "NE=111"}, {"optName": "1.2", "dn": "NE=112"}],
+        }[inverter_dn])
+
+    def test_crawl(self):
+        topology = self.client.get_topology()
+
+        self.assertEqual(["NE=1", "NE=2"], [plant.dn for plant in topology.plants])
+        self.assertEqual("Dongle", topology.get("NE=12").type)
+        self.assertEqual(["NE=11", "NE=21"], [node.dn for node in topology.get_by_type("Inverter")])
+        self.assertEqual(["NE=13"], [node.dn for node in topology.get_by_plant("NE=1", "Battery")])
+        self.assertEqual(["NE=111", "NE=112"], [node.dn for node in topology.get_children("NE=11")])
+        self.assertEqual("NE=1", topology.get("NE=112").plant_dn)
+        self.assertIsNone(topology.get("NE=99"))
+
+    def test_cached(self):
+        topology = self.client.get_topology()
+
+        self.assertIs(topology, self.client.get_topology())
+        self.assertEqual(2, self.client.get_device_ids.call_count)
+
+        # the energy flow is not requested again
+        self.assertEqual(["NE=23"], self.client.get_battery_ids("NE=2"))
+        self.assertEqual(2, self.client.get_plant_flow.call_count)
+
+        self.assertIsNot(topology, self.client.refresh_topology())
+        self.assertEqual(4, self.client.get_device_ids.call_count)
+
+    def test_expired(self):
+        topology = self.client.get_topology()
+        topology.created -= 61
+
+        self.assertIsNot(topology, self.client.get_topology())
+
+    def test_failed_plant(self):
+        self.client.get_plant_flow = MagicMock(side_effect=FusionSolarException("Failed"))
+
+        self.assertRaises(FusionSolarException, self.client.get_topology)
+
+    def test_active_power_control(self):
+        self.client._transport.post = MagicMock()
+        self.client.get_device_ids = MagicMock(return_value=[
+            {"type": "Inverter", "deviceDn": "NE=11"}, {"type": "Dongle", "deviceDn": "NE=12"}
+        ])
+
+        self.client.active_power_control("No limit")
+
+        # without a topology index only the devices are requested
+        self.client.get_device_ids.assert_called_once_with()
+        self.client.get_all_stations.assert_not_called()
+        self.client.get_optimizer_stats.assert_not_called()
+        self.assertEqual("NE=12", self.client._transport.post.call_args[1]["data"]["dn"])
+
+    def test_active_power_control_cached(self):
+        self.client._transport.post = MagicMock()
+        self.client.get_topology()
+        self.client.get_device_ids.reset_mock()
+
+        self.client.active_power_control("No limit")
+
+        self.client.get_device_ids.assert_not_called()
+        self.assertEqual("NE=12", self.client._transport.post.call_args[1]["data"]["dn"])
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import os
+import sys
+
+import requests
+
+currentdir = os.path.dirname(__file__)
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, os.path.join(parentdir, "src"))
+
+from fusion_solar_py.transport import Transport, TransportConfig
+
+
+class TransportTest(TestCase):
+    def test_pool_config(self):
+        transport = Transport(TransportConfig(pool_maxsize=25, keep_alive=False, compression=False))
+
+        adapter = transport.session.get_adapter("https://region01eu5.fusionsolar.huawei.com")
+
+        self.assertEqual(25, adapter._pool_maxsize)
+        self.assertEqual("close", transport.session.headers["Connection"])
+        self.assertEqual("identity", transport.session.headers["Accept-Encoding"])
+
+    def test_user_session_unchanged(self):
+        session = requests.Session()
+        adapter = session.get_adapter("https://region01eu5.fusionsolar.huawei.com")
+
+        transport = Transport(session=session)
+
+        self.assertIs(adapter, transport.session.get_adapter("https://region01eu5.fusionsolar.huawei.com"))
+
+    def test_reset_keeps_pool(self):
+        transport = Transport()
+        adapter = transport.session.get_adapter("https://region01eu5.fusionsolar.huawei.com")
+
+        transport.session.headers["roarand"] = "1234"
+        transport.session.cookies.set("JSESSIONID", "abcd")
+
+        transport.reset()
+
+        self.assertNotIn("roarand", transport.session.headers)
+        self.assertEqual(0, len(transport.session.cookies))
+        self.assertIs(adapter, transport.session.get_adapter("https://region01eu5.fusionsolar.huawei.com"))
+
+    def test_default_timeout(self):
+        transport = Transport(TransportConfig(timeout=5))
+        transport._session.request = MagicMock()
+
+        transport.get("https://region01eu5.fusionsolar.huawei.com")
+        transport.get("https://region01eu5.fusionsolar.huawei.com", timeout=1)
+
+        self.assertEqual(5, transport._session.request.call_args_list[0].kwargs["timeout"])
+        self.assertEqual(1, transport._session.request.call_args_list[1].kwargs["timeout"])